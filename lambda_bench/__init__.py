@@ -0,0 +1,23 @@
+"""
+Local invocation harness for the lambdas of every task.
+
+A handler is imported from <task>/src the way the task tests import it
+(see tests.ImportFromSourceContext), with the environment of its
+lambda_config.json, and invoked through lambda_handler with recorded or
+synthetic events at the chosen concurrency. AWS calls go to in-process
+stand-ins (moto, with the tables, buckets, queues, topics and user
+pools of deployment_resources.json) and outgoing HTTP calls made with
+requests get a canned Open-Meteo forecast.
+
+A run reports warm latency percentiles and throughput, the memory
+allocated per invocation (tracemalloc, in a separate sequential pass)
+and cold starts (import and first invocation, each in a new
+interpreter). Results are stored as JSON to compare between commits.
+Run it from the repository root:
+
+    python -m lambda_bench run task04 sqs_handler --concurrency 8
+    python -m lambda_bench run task05 api_handler --event-file events.json
+    python -m lambda_bench run task09 processor --env xray_enabled=false \\
+        --http-latency 50 --concurrency 4
+    python -m lambda_bench compare bench_results/base.json bench_results/head.json
+"""
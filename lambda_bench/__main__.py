@@ -0,0 +1,207 @@
+import argparse
+import sys
+
+from lambda_bench import results as bench_results
+from lambda_bench.events import EVENT_KINDS, load_events, synthetic_events
+from lambda_bench.runner import (allocation_run, cold_runs, invoker_for, prepared,
+                                 project_of, silence_logs, warm_run)
+
+RECORD_KINDS = ('sqs', 'sns', 'dynamodb')
+API_KINDS = ('api', 'api-v2')
+
+
+def _pairs(values, option):
+    pairs = {}
+    for value in values or []:
+        name, separator, setting = value.partition('=')
+        if not separator:
+            raise SystemExit(f'{option} expects NAME=VALUE, got "{value}"')
+        pairs[name] = setting
+    return pairs
+
+
+def _event_options(args) -> dict:
+    if args.event in RECORD_KINDS:
+        options = {'message': args.message} if args.event != 'dynamodb' else {}
+        if args.batch_size is not None:
+            options['batch_size'] = args.batch_size
+        return {name: value for name, value in options.items() if value is not None}
+    if args.event in API_KINDS:
+        return {'method': args.method, 'path': args.path, 'body': args.body}
+    return {}
+
+
+def run(args):
+    settings = {
+        'task': args.task,
+        'lambda': args.lambda_name,
+        'aliases': _pairs(args.alias, '--alias'),
+        'env': _pairs(args.env, '--env'),
+        'aws': args.aws,
+        'aws_latency_ms': args.aws_latency,
+        'http_latency_ms': args.http_latency,
+        'http_body': open(args.http_response).read() if args.http_response else None,
+        'show_logs': args.show_logs,
+    }
+    project = project_of(settings)
+    if args.event_file:
+        events, event_name = load_events(args.event_file), 'recorded'
+    else:
+        args.event = args.event or project.default_event_kind()
+        events = synthetic_events(args.event, args.events, **_event_options(args))
+        event_name = args.event
+    if not events:
+        raise SystemExit('No events to replay')
+
+    results = {
+        'schema': bench_results.SCHEMA_VERSION,
+        'task': project.task,
+        'lambda': project.lambda_name,
+        'event': event_name,
+        'event_file': args.event_file,
+        'distinct_events': len(events),
+        'settings': {name: value for name, value in settings.items()
+                     if name not in ('task', 'lambda', 'http_body')},
+        'git': bench_results.git_revision(),
+        **bench_results.environment_info(),
+    }
+    with prepared(settings) as (aws, http):
+        module = project.import_handler()
+        if not args.show_logs:
+            silence_logs()
+        invoke = invoker_for(project, module)
+        if aws:
+            aws.reset_calls()
+        http.requests = 0
+        warm = results['warm'] = warm_run(invoke, events, args.invocations,
+                                          concurrency=args.concurrency, warmup=args.warmup)
+        invocations = warm['invocations'] + warm['warmup']
+        if aws:
+            warm['aws_calls_per_invocation'] = round(sum(aws.calls.values()) / invocations, 3)
+            warm['aws_calls'] = dict(aws.calls.most_common())
+        warm['http_requests_per_invocation'] = round(http.requests / invocations, 3)
+        if args.alloc_invocations:
+            results['allocations'] = allocation_run(invoke, events, args.alloc_invocations)
+    if args.cold_starts:
+        results['cold'] = cold_runs(settings, events[0], args.cold_starts)
+
+    _print_summary(results)
+    if not args.no_save:
+        path = bench_results.save(results, args.output)
+        print(f'Results saved to {path}')
+    return 1 if results['warm']['errors'] else 0
+
+
+def _print_summary(results):
+    warm = results['warm']
+    latency = warm['latency_ms']
+    print(f"{results['task']}/{results['lambda']} | {results['event']} events | "
+          f"{warm['invocations']} invocations, concurrency {warm['concurrency']}")
+    print(f"  warm   p50 {latency['p50']:9.3f} ms | p95 {latency['p95']:9.3f} ms | "
+          f"p99 {latency['p99']:9.3f} ms | max {latency['max']:9.3f} ms | "
+          f"{warm['throughput_per_sec']:10.1f} inv/s")
+    print(f"  calls  {warm.get('aws_calls_per_invocation', '-')} AWS, "
+          f"{warm['http_requests_per_invocation']} HTTP per invocation")
+    if 'allocations' in results:
+        allocations = results['allocations']
+        print(f"  memory peak p50 {allocations['peak_kib']['p50']:9.1f} KiB | "
+              f"p95 {allocations['peak_kib']['p95']:9.1f} KiB | retained "
+              f"{allocations['retained_bytes']['mean']:10.1f} B per invocation")
+    if 'cold' in results:
+        cold = results['cold']
+        print(f"  cold   sdk import {cold['sdk_import_ms']['p50']:8.1f} ms | "
+              f"init {cold['init_ms']['p50']:8.1f} ms | "
+              f"first {cold['first_invocation_ms']['p50']:8.1f} ms | "
+              f"second {cold['second_invocation_ms']['p50']:8.1f} ms | "
+              f"total {cold['total_ms']['p50']:8.1f} ms (p50 of {cold['total_ms']['count']})")
+        for error in cold['errors']:
+            print(f'  cold start error: {error}')
+    if warm['errors']:
+        print(f"  {warm['errors']} failed invocations, e.g.:")
+        for error in warm['error_samples']:
+            print(f'    {error}')
+
+
+def compare(args):
+    base, head = bench_results.load(args.base), bench_results.load(args.head)
+    for name in ('task', 'lambda', 'event', 'settings'):
+        if base.get(name) != head.get(name):
+            print(f'Note: {name} differs: {base.get(name)} -> {head.get(name)}')
+    if base['warm']['concurrency'] != head['warm']['concurrency']:
+        print(f"Note: concurrency differs: {base['warm']['concurrency']} -> "
+              f"{head['warm']['concurrency']}")
+    rows = bench_results.compare(base, head, args.threshold)
+    print(f"{'metric':36} {'base':>12} {'head':>12} {'change':>9}")
+    for metric, before, after, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{metric:36} {before:12.3f} {after:12.3f} {change:+8.1f}%{flag}')
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m lambda_bench',
+                                     description='Local lambda invocation benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='benchmark one lambda')
+    run_parser.add_argument('task', help='task folder, e.g. task04')
+    run_parser.add_argument('lambda_name', help='lambda folder, e.g. sqs_handler')
+    events = run_parser.add_argument_group('events')
+    events.add_argument('--event', choices=list(EVENT_KINDS),
+                        help='synthetic event kind, by default from the event '
+                             'sources of lambda_config.json (api without any)')
+    events.add_argument('--event-file',
+                        help='recorded events: a JSON event, a JSON list or NDJSON')
+    events.add_argument('--events', type=int, default=50,
+                        help='distinct synthetic events (default 50)')
+    events.add_argument('--batch-size', type=int,
+                        help='records per sqs/sns/dynamodb event')
+    events.add_argument('--message', help='body of every sqs/sns record')
+    events.add_argument('--method', default='GET', help='api request method')
+    events.add_argument('--path', default='/', help='api request path')
+    events.add_argument('--body', help='api request body')
+    load = run_parser.add_argument_group('load')
+    load.add_argument('--invocations', type=int, default=200,
+                      help='measured warm invocations (default 200)')
+    load.add_argument('--concurrency', type=int, default=1,
+                      help='threads invoking the handler at once (default 1)')
+    load.add_argument('--warmup', type=int, default=5,
+                      help='invocations before measuring (default 5)')
+    load.add_argument('--alloc-invocations', type=int, default=50,
+                      help='invocations traced for allocations, 0 to skip (default 50)')
+    load.add_argument('--cold-starts', type=int, default=3,
+                      help='cold starts, each in a new interpreter, 0 to skip (default 3)')
+    stand_ins = run_parser.add_argument_group('stand-ins')
+    stand_ins.add_argument('--aws', choices=('moto', 'none'), default='moto',
+                           help='in-process AWS (moto) or none for lambdas without AWS calls')
+    stand_ins.add_argument('--aws-latency', type=float, default=0,
+                           help='milliseconds added to every AWS call')
+    stand_ins.add_argument('--http-latency', type=float, default=0,
+                           help='milliseconds added to every HTTP request')
+    stand_ins.add_argument('--http-response',
+                           help='file served as the body of every HTTP request '
+                                '(default: an Open-Meteo forecast)')
+    stand_ins.add_argument('--env', action='append', metavar='NAME=VALUE',
+                           help='lambda environment variable, overriding lambda_config.json')
+    stand_ins.add_argument('--alias', action='append', metavar='NAME=VALUE',
+                           help='value of a ${NAME} placeholder of the configuration')
+    output = run_parser.add_argument_group('output')
+    output.add_argument('--output', help='result file (default bench_results/<run>.json)')
+    output.add_argument('--no-save', action='store_true', help='do not store the results')
+    output.add_argument('--show-logs', action='store_true',
+                        help='keep the lambda log output on the console')
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+    compare_parser.add_argument('--threshold', type=float, default=10.0,
+                                help='change in %% counted as a regression (default 10)')
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+One cold start, run by lambda_bench.runner.cold_start in a new
+interpreter: reads {"settings": ..., "event": ...} from stdin and
+prints the timings in milliseconds as one JSON line.
+
+The SDK modules the stand-ins need (boto3, requests) are imported
+first and reported as sdk_import_ms. On Lambda that time is part of the
+init phase or, for lazily imported modules, of the first invocation;
+total_ms adds it to both.
+"""
+import importlib
+import json
+import sys
+import time
+
+from lambda_bench.runner import (SDK_MODULES, invoker_for, prepared, project_of,
+                                 silence_logs)
+
+
+def main():
+    request = json.load(sys.stdin)
+    settings, event = request['settings'], request['event']
+
+    start = time.perf_counter()
+    for name in SDK_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    sdk_import = time.perf_counter() - start
+
+    project = project_of(settings)
+    with prepared(settings):
+        start = time.perf_counter()
+        module = project.import_handler()
+        init = time.perf_counter() - start
+        if not settings.get('show_logs'):
+            silence_logs()
+        invoke = invoker_for(project, module)
+        first, error = invoke(event)
+        second, _ = invoke(event)
+
+    timings = {'sdk_import_ms': sdk_import, 'init_ms': init,
+               'first_invocation_ms': first, 'second_invocation_ms': second,
+               'total_ms': sdk_import + init + first}
+    result = {name: round(seconds * 1000, 3) for name, seconds in timings.items()}
+    result['error'] = error
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
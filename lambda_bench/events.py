@@ -0,0 +1,167 @@
+"""
+Synthetic events of the sources the lambdas are wired to, and loading
+of recorded ones. Synthetic events differ by index (message ids, keys,
+bodies), so caches and deduplication see distinct input.
+"""
+import json
+import uuid
+from datetime import datetime, timezone
+
+REGION = 'eu-central-1'
+ACCOUNT_ID = '123456789012'
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def api_gateway_event(index=0, method='GET', path='/', body=None, headers=None,
+                      query=None):
+    """REST API (payload 1.0) proxy integration request."""
+    return {
+        'resource': path,
+        'path': path,
+        'httpMethod': method,
+        'headers': {'Content-Type': 'application/json', **(headers or {})},
+        'queryStringParameters': query,
+        'pathParameters': None,
+        'requestContext': {'requestId': str(uuid.uuid4()), 'httpMethod': method,
+                           'resourcePath': path, 'stage': 'api',
+                           'requestTimeEpoch': int(_now().timestamp() * 1000)},
+        'body': body,
+        'isBase64Encoded': False,
+    }
+
+
+def api_gateway_v2_event(index=0, method='GET', path='/', body=None, headers=None,
+                         query=None):
+    """HTTP API (payload 2.0) request."""
+    return {
+        'version': '2.0',
+        'routeKey': '$default',
+        'rawPath': path,
+        'rawQueryString': '&'.join(f'{k}={v}' for k, v in (query or {}).items()),
+        'headers': {'content-type': 'application/json', **(headers or {})},
+        'queryStringParameters': query,
+        'requestContext': {'requestId': str(uuid.uuid4()),
+                           'http': {'method': method, 'path': path}},
+        'body': body,
+        'isBase64Encoded': False,
+    }
+
+
+def sqs_event(index=0, batch_size=10, message=None):
+    queue_arn = f'arn:aws:sqs:{REGION}:{ACCOUNT_ID}:async_queue'
+    timestamp = str(int(_now().timestamp() * 1000))
+    return {'Records': [{
+        'messageId': str(uuid.uuid4()),
+        'receiptHandle': uuid.uuid4().hex,
+        'body': message if message is not None else json.dumps({'index': index, 'record': n}),
+        'attributes': {'ApproximateReceiveCount': '1', 'SentTimestamp': timestamp},
+        'messageAttributes': {},
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': queue_arn,
+        'awsRegion': REGION,
+    } for n in range(batch_size)]}
+
+
+def sns_event(index=0, batch_size=1, message=None):
+    """SNS delivers one notification per invocation; batch_size allows more."""
+    topic_arn = f'arn:aws:sns:{REGION}:{ACCOUNT_ID}:lambda_topic'
+    return {'Records': [{
+        'EventSource': 'aws:sns',
+        'EventVersion': '1.0',
+        'Sns': {
+            'Type': 'Notification',
+            'MessageId': str(uuid.uuid4()),
+            'TopicArn': topic_arn,
+            'Subject': None,
+            'Message': message if message is not None else json.dumps({'index': index,
+                                                                       'record': n}),
+            'Timestamp': _now().isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'MessageAttributes': {},
+        },
+    } for n in range(batch_size)]}
+
+
+def dynamodb_stream_event(index=0, batch_size=10):
+    """
+    Stream records of a key/value table: an INSERT and a MODIFY per
+    pair of records.
+    """
+    records = []
+    for n in range(batch_size):
+        key = f'key-{index}-{n // 2}'
+        new_image = {'key': {'S': key}, 'value': {'N': str(index + n)}}
+        record = {
+            'eventID': uuid.uuid4().hex,
+            'eventName': 'INSERT' if n % 2 == 0 else 'MODIFY',
+            'eventSource': 'aws:dynamodb',
+            'awsRegion': REGION,
+            'dynamodb': {
+                'ApproximateCreationDateTime': int(_now().timestamp()),
+                'Keys': {'key': {'S': key}},
+                'NewImage': new_image,
+                'SequenceNumber': f'{index:012d}{n:08d}',
+                'SizeBytes': 64,
+                'StreamViewType': 'NEW_AND_OLD_IMAGES',
+            },
+            'eventSourceARN': (f'arn:aws:dynamodb:{REGION}:{ACCOUNT_ID}:'
+                               f'table/Configuration/stream/2024-01-01T00:00:00.000'),
+        }
+        if n % 2:
+            record['dynamodb']['OldImage'] = {'key': {'S': key},
+                                              'value': {'N': str(index + n - 1)}}
+        records.append(record)
+    return {'Records': records}
+
+
+def schedule_event(index=0):
+    """CloudWatch Events / EventBridge scheduled rule."""
+    return {
+        'version': '0',
+        'id': str(uuid.uuid4()),
+        'detail-type': 'Scheduled Event',
+        'source': 'aws.events',
+        'account': ACCOUNT_ID,
+        'time': _now().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'region': REGION,
+        'resources': [f'arn:aws:events:{REGION}:{ACCOUNT_ID}:rule/uuid_trigger'],
+        'detail': {},
+    }
+
+
+EVENT_KINDS = {
+    'api': api_gateway_event,
+    'api-v2': api_gateway_v2_event,
+    'sqs': sqs_event,
+    'sns': sns_event,
+    'dynamodb': dynamodb_stream_event,
+    'schedule': schedule_event,
+}
+
+
+def synthetic_events(kind, count, **options):
+    """
+    :param kind: one of EVENT_KINDS
+    :param count: distinct events
+    :param options: keyword arguments of the event builder, e.g.
+        batch_size for the record sources or method/path/body for api
+    """
+    if kind not in EVENT_KINDS:
+        raise ValueError(f'Unknown event kind "{kind}", expected one of '
+                         f'{", ".join(EVENT_KINDS)}')
+    build = EVENT_KINDS[kind]
+    return [build(index, **options) for index in range(count)]
+
+
+def load_events(path) -> list:
+    """
+    Recorded events: a JSON object (one event), a JSON list of events,
+    or one event per line (.ndjson / .jsonl).
+    """
+    with open(path) as source:
+        if str(path).endswith(('.ndjson', '.jsonl')):
+            return [json.loads(line) for line in source if line.strip()]
+        events = json.load(source)
+    return events if isinstance(events, list) else [events]
@@ -0,0 +1,147 @@
+"""Locating, configuring and importing the lambdas of a task."""
+import importlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+SOURCE_FOLDER = 'src'
+
+# Syndicate event source of a lambda -> synthetic event kind
+EVENT_SOURCE_KINDS = {
+    'sqs_trigger': 'sqs',
+    'sns_topic_trigger': 'sns',
+    'dynamodb_trigger': 'dynamodb',
+    'cloudwatch_rule_trigger': 'schedule',
+}
+_ALIAS = re.compile(r'\$\{([^}]+)\}')
+DEFAULT_ALIASES = {'region': 'eu-central-1'}
+# Word in an alias name -> resource type it refers to
+_ALIAS_RESOURCE_HINTS = (('table', 'dynamodb_table'), ('bucket', 's3_bucket'),
+                         ('queue', 'sqs_queue'), ('topic', 'sns_topic'),
+                         ('userpool', 'cognito_idp'))
+
+
+class LambdaProject:
+
+    def __init__(self, task, lambda_name, aliases=None):
+        """
+        :param task: task folder, e.g. "task04", or a path to one
+        :param lambda_name: folder under src/lambdas, e.g. "sqs_handler"
+        :param aliases: values of the ${alias} placeholders of the
+            syndicate configuration, see default_alias for the others
+        """
+        path = Path(task)
+        self.task_path = path if path.is_absolute() else REPOSITORY_ROOT / path
+        self.lambda_name = lambda_name
+        self.aliases = {**DEFAULT_ALIASES, **(aliases or {})}
+        if not self.lambda_path.is_dir():
+            raise ValueError(f'No lambda "{lambda_name}" in {self.source_path / "lambdas"}')
+
+    @property
+    def task(self) -> str:
+        return self.task_path.name
+
+    @property
+    def source_path(self) -> Path:
+        return self.task_path / SOURCE_FOLDER
+
+    @property
+    def lambda_path(self) -> Path:
+        return self.source_path / 'lambdas' / self.lambda_name
+
+    @property
+    def module_name(self) -> str:
+        return f'lambdas.{self.lambda_name}.handler'
+
+    def default_alias(self, name) -> str:
+        """
+        Value of an alias missing from the aliases: the only resource of
+        the type its name hints at, e.g. ${target_bucket} -> "uuid-storage"
+        when the task declares one bucket, else the alias name itself, as
+        for resources declared under an alias (${tables_table}).
+        """
+        resources = self._raw_resources()
+        if f'${{{name}}}' in resources:
+            return name
+        for word, resource_type in _ALIAS_RESOURCE_HINTS:
+            if word in name.lower():
+                matching = [resource_name for resource_name, resource in resources.items()
+                            if resource.get('resource_type') == resource_type]
+                if len(matching) == 1 and not _ALIAS.search(matching[0]):
+                    return matching[0]
+        return name
+
+    def resolve(self, value):
+        """Replaces the ${alias} placeholders of a configuration value."""
+        if not isinstance(value, str):
+            return value
+
+        def alias(match):
+            name = match.group(1)
+            return self.aliases[name] if name in self.aliases else self.default_alias(name)
+        return _ALIAS.sub(alias, value)
+
+    def lambda_config(self) -> dict:
+        with open(self.lambda_path / 'lambda_config.json') as config:
+            return json.load(config)
+
+    def _raw_resources(self) -> dict:
+        path = self.task_path / 'deployment_resources.json'
+        if not path.exists():
+            return {}
+        with open(path) as resources:
+            return json.load(resources)
+
+    def deployment_resources(self) -> dict:
+        """Resources of deployment_resources.json by resolved name."""
+        return {self.resolve(name): resource
+                for name, resource in self._raw_resources().items()}
+
+    def default_event_kind(self) -> str:
+        for source in self.lambda_config().get('event_sources') or []:
+            kind = EVENT_SOURCE_KINDS.get(source.get('resource_type'))
+            if kind:
+                return kind
+        return 'api'
+
+    def environment(self, outputs=None) -> dict:
+        """
+        env_variables of the lambda. References to other resources
+        ({"resource_name": ..., "parameter": ...}) are looked up in
+        outputs, the parameters of the created stand-in resources.
+        """
+        environment = {}
+        for name, value in (self.lambda_config().get('env_variables') or {}).items():
+            if isinstance(value, dict):
+                resource = self.resolve(value.get('resource_name'))
+                value = (outputs or {}).get(resource, {}).get(value.get('parameter'), '')
+            environment[name] = str(self.resolve(value))
+        return environment
+
+    def import_handler(self):
+        """
+        Imports the handler module with <task>/src on sys.path. The
+        path stays there: lambdas import commons lazily.
+        """
+        source_path = str(self.source_path)
+        if source_path not in sys.path:
+            sys.path.append(source_path)
+        return importlib.import_module(self.module_name)
+
+
+def apply_environment(environment):
+    """Sets environment variables; returns the previous values."""
+    previous = {name: os.environ.get(name) for name in environment}
+    os.environ.update(environment)
+    return previous
+
+
+def restore_environment(previous):
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
@@ -0,0 +1,109 @@
+"""Statistics, JSON result files and their comparison."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from lambda_bench.project import REPOSITORY_ROOT
+
+SCHEMA_VERSION = 1
+RESULTS_FOLDER = REPOSITORY_ROOT / 'bench_results'
+
+# Metric path in a result file -> True when higher is better
+COMPARED_METRICS = {
+    ('warm', 'latency_ms', 'p50'): False,
+    ('warm', 'latency_ms', 'p95'): False,
+    ('warm', 'latency_ms', 'p99'): False,
+    ('warm', 'throughput_per_sec'): True,
+    ('allocations', 'peak_kib', 'p50'): False,
+    ('allocations', 'retained_bytes', 'mean'): False,
+    ('cold', 'init_ms', 'p50'): False,
+    ('cold', 'first_invocation_ms', 'p50'): False,
+    ('cold', 'total_ms', 'p50'): False,
+}
+
+
+def summarize(values, scale=1.0) -> dict:
+    """count, min, mean, p50, p95, p99 and max of values times scale."""
+    values = sorted(value * scale for value in values)
+    if not values:
+        return {'count': 0}
+    if len(values) > 1:
+        cuts = statistics.quantiles(values, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = values[0]
+    return {'count': len(values), 'min': _round(values[0]),
+            'mean': _round(statistics.fmean(values)), 'p50': _round(p50),
+            'p95': _round(p95), 'p99': _round(p99), 'max': _round(values[-1])}
+
+
+def _round(value):
+    return round(value, 4)
+
+
+def git_revision() -> dict:
+    def git(*args):
+        return subprocess.run(('git', *args), cwd=REPOSITORY_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    try:
+        return {'commit': git('rev-parse', 'HEAD'),
+                'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))}
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+
+
+def environment_info() -> dict:
+    return {'python': platform.python_version(), 'implementation': sys.implementation.name,
+            'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+
+
+def default_path(results) -> Path:
+    commit = (results['git']['commit'] or 'unknown')[:10]
+    dirty = '-dirty' if results['git']['dirty'] else ''
+    return RESULTS_FOLDER / (f"{results['task']}-{results['lambda']}-{results['event']}-"
+                             f"c{results['warm']['concurrency']}-{commit}{dirty}.json")
+
+
+def save(results, path=None) -> Path:
+    path = Path(path) if path else default_path(results)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as output:
+        json.dump(results, output, indent=2)
+        output.write('\n')
+    return path
+
+
+def load(path) -> dict:
+    with open(path) as source:
+        return json.load(source)
+
+
+def _metric(results, path):
+    value = results
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(base, head, threshold_pct=10.0) -> list:
+    """
+    :return: (metric, base value, head value, change in %, regressed)
+        per metric present in both results
+    """
+    rows = []
+    for path, higher_is_better in COMPARED_METRICS.items():
+        before, after = _metric(base, path), _metric(head, path)
+        if before is None or after is None:
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        worse = -change if higher_is_better else change
+        rows.append(('.'.join(path), before, after, change, worse > threshold_pct))
+    return rows
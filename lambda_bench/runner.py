@@ -0,0 +1,213 @@
+"""
+Invoking a handler: the prepared environment, warm runs at a given
+concurrency, the allocation pass and cold starts in new interpreters.
+
+Concurrent warm invocations share one imported handler (one container
+serving several requests at once), so above a concurrency of 1 the
+latencies include contention for the GIL, the shared clients and
+caches. Lambda itself gives every concurrent request its own container;
+a concurrency of 1 matches one of them.
+"""
+import contextlib
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from lambda_bench.project import (REPOSITORY_ROOT, LambdaProject, apply_environment,
+                                  restore_environment)
+from lambda_bench.results import summarize
+from lambda_bench.stand_ins import AwsStandIns, HttpStandIn, LambdaContext
+
+# Different error messages kept as samples in the results
+MAX_ERROR_SAMPLES = 5
+# Modules the stand-ins import; loaded first in a cold start so their
+# import time is reported apart from the handler's
+SDK_MODULES = ('boto3', 'requests')
+
+
+def project_of(settings) -> LambdaProject:
+    return LambdaProject(settings['task'], settings['lambda'], settings.get('aliases'))
+
+
+@contextlib.contextmanager
+def prepared(settings):
+    """
+    Stand-ins started and the lambda environment set for the block.
+    :param settings: task, lambda, aliases, env (overrides), aws
+        ("moto" or "none"), aws_latency_ms, http_latency_ms, http_body
+    :return: (AwsStandIns or None without AWS stand-ins, HttpStandIn)
+    """
+    project = project_of(settings)
+    with contextlib.ExitStack() as stack:
+        aws = None
+        if settings.get('aws', 'moto') == 'moto':
+            aws = stack.enter_context(AwsStandIns(
+                project.deployment_resources(),
+                latency=settings.get('aws_latency_ms', 0) / 1000))
+        http_body = settings.get('http_body')
+        http = stack.enter_context(HttpStandIn(
+            body=http_body.encode() if http_body is not None else None,
+            latency=settings.get('http_latency_ms', 0) / 1000))
+        environment = {**project.environment(aws.outputs if aws else None),
+                       **(settings.get('env') or {})}
+        previous = apply_environment(environment)
+        stack.callback(restore_environment, previous)
+        yield aws, http
+
+
+def silence_logs():
+    """
+    Sends the console output of every logger to os.devnull. Records are
+    still formatted and written, so logging keeps its cost.
+    """
+    devnull = open(os.devnull, 'w')
+    loggers = [logging.getLogger()] + [logger for logger in
+                                       logging.Logger.manager.loggerDict.values()
+                                       if isinstance(logger, logging.Logger)]
+    for logger in loggers:
+        for handler in logger.handlers:
+            if (isinstance(handler, logging.StreamHandler)
+                    and handler.stream in (sys.stdout, sys.stderr)):
+                handler.setStream(devnull)
+
+
+class Invoker:
+    """Calls lambda_handler of a handler module and times the call."""
+
+    def __init__(self, module, function_name, memory_limit_in_mb=128, timeout_sec=100):
+        self.handler = module.lambda_handler
+        self.function_name = function_name
+        self.memory_limit_in_mb = memory_limit_in_mb
+        self.timeout_sec = timeout_sec
+
+    def __call__(self, event):
+        """:return: (seconds, error message or None)"""
+        context = LambdaContext(self.function_name, self.memory_limit_in_mb,
+                                self.timeout_sec)
+        start = time.perf_counter()
+        try:
+            response = self.handler(event, context)
+        except Exception as e:
+            return time.perf_counter() - start, f'{type(e).__name__}: {e}'
+        elapsed = time.perf_counter() - start
+        status = response.get('statusCode') if isinstance(response, dict) else None
+        if isinstance(status, int) and status >= 400:
+            return elapsed, f'statusCode {status}: {str(response.get("body"))[:200]}'
+        return elapsed, None
+
+
+def invoker_for(project, module) -> Invoker:
+    config = project.lambda_config()
+    return Invoker(module, config.get('name', project.lambda_name),
+                   memory_limit_in_mb=config.get('memory', 128),
+                   timeout_sec=config.get('timeout', 100))
+
+
+class _Errors:
+
+    def __init__(self):
+        self.count = 0
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def add(self, error):
+        with self._lock:
+            self.count += 1
+            if len(self.samples) < MAX_ERROR_SAMPLES and error not in self.samples:
+                self.samples.append(error)
+
+
+def warm_run(invoke, events, invocations, concurrency=1, warmup=5) -> dict:
+    """
+    warmup invocations one after the other, then invocations spread over
+    concurrency threads. Events are replayed in order, cycling.
+    """
+    replay = itertools.cycle(events)
+    for _ in range(warmup):
+        invoke(next(replay))
+
+    indexes = itertools.count()
+    errors = _Errors()
+
+    def worker():
+        latencies = []
+        while next(indexes) < invocations:
+            elapsed, error = invoke(next(replay))
+            latencies.append(elapsed)
+            if error:
+                errors.add(error)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='invoke') as pool:
+        futures = [pool.submit(worker) for _ in range(concurrency)]
+        latencies = [latency for future in futures for latency in future.result()]
+    wall = time.perf_counter() - start
+    return {
+        'invocations': len(latencies),
+        'concurrency': concurrency,
+        'warmup': warmup,
+        'wall_sec': round(wall, 4),
+        'throughput_per_sec': round(len(latencies) / wall, 2) if wall else None,
+        'latency_ms': summarize(latencies, 1000),
+        'errors': errors.count,
+        'error_samples': errors.samples,
+    }
+
+
+def allocation_run(invoke, events, invocations) -> dict:
+    """
+    Memory allocated per invocation, traced by tracemalloc: the peak
+    above what was allocated before the call, and what the call left
+    allocated (caches fill up, leaks keep growing).
+    """
+    replay = itertools.cycle(events)
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for _ in range(invocations):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            invoke(next(replay))
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return {
+        'invocations': invocations,
+        'peak_kib': summarize(peaks, 1 / 1024),
+        'retained_bytes': summarize(retained),
+        'retained_total_bytes': sum(retained),
+    }
+
+
+def cold_start(settings, event) -> dict:
+    """
+    Run in a new interpreter (lambda_bench.cold): import time of the
+    SDK modules and of the handler, first and second invocation.
+    """
+    completed = subprocess.run(
+        (sys.executable, '-m', 'lambda_bench.cold'),
+        input=json.dumps({'settings': settings, 'event': event}),
+        cwd=REPOSITORY_ROOT, capture_output=True, text=True)
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode or not lines:
+        raise RuntimeError(f'Cold start failed:\n{completed.stderr.strip()}')
+    return json.loads(lines[-1])
+
+
+def cold_runs(settings, event, count) -> dict:
+    samples = [cold_start(settings, event) for _ in range(count)]
+    summary = {name: summarize([sample[name] for sample in samples])
+               for name in ('sdk_import_ms', 'init_ms', 'first_invocation_ms',
+                            'second_invocation_ms', 'total_ms')}
+    summary['errors'] = sorted({sample['error'] for sample in samples if sample['error']})
+    return summary
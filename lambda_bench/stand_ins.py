@@ -0,0 +1,289 @@
+"""
+In-process stand-ins for what the lambdas call: AWS services (through
+moto, an optional dependency), HTTP APIs reached with requests, and the
+Lambda context object.
+"""
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from urllib.parse import parse_qsl, urlsplit
+
+from lambda_bench.project import apply_environment, restore_environment
+
+DEFAULT_REGION = 'eu-central-1'
+_CREDENTIALS = {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_SESSION_TOKEN': 'testing',
+}
+
+
+class LambdaContext:
+    """The attributes and methods of the context lambdas receive."""
+
+    def __init__(self, function_name, memory_limit_in_mb=128, timeout_sec=100):
+        self.function_name = function_name
+        self.function_version = '$LATEST'
+        self.memory_limit_in_mb = memory_limit_in_mb
+        self.invoked_function_arn = (f'arn:aws:lambda:{DEFAULT_REGION}:123456789012:'
+                                     f'function:{function_name}')
+        self.aws_request_id = str(uuid.uuid4())
+        self.log_group_name = f'/aws/lambda/{function_name}'
+        self.log_stream_name = uuid.uuid4().hex
+        self._deadline = time.monotonic() + timeout_sec
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(int((self._deadline - time.monotonic()) * 1000), 0)
+
+
+class AwsStandIns:
+    """
+    moto's in-process AWS with the resources of deployment_resources.json,
+    used as a context manager. Every API call is counted by operation
+    and can be delayed by `latency` seconds to model the network.
+    """
+
+    def __init__(self, resources, region=DEFAULT_REGION, latency=0.0):
+        """
+        :param resources: deployment resources by (resolved) name
+        :param region: region of the resources and the default client region
+        :param latency: seconds added to every API call
+        """
+        self.resources = resources
+        self.region = region
+        self.latency = latency
+        # Parameters of the created resources, e.g. {"pool": {"id": ...}}
+        self.outputs = {}
+        self.calls = Counter()
+        self._calls_lock = threading.Lock()
+        self._mock = None
+        self._patch = None
+        self._previous_environment = None
+
+    def __enter__(self):
+        try:
+            import moto
+        except ImportError as e:
+            raise RuntimeError('The AWS stand-ins need moto (pip install "moto[all]"); '
+                               'use --aws none for lambdas without AWS calls') from e
+        from botocore.client import BaseClient
+
+        self._previous_environment = apply_environment(
+            {**_CREDENTIALS, 'AWS_DEFAULT_REGION': self.region})
+        self._mock = moto.mock_aws()
+        self._mock.start()
+        for name, resource in self.resources.items():
+            create = _CREATORS.get(resource.get('resource_type'))
+            if create:
+                try:
+                    self.outputs[name] = create(self._client, name, resource) or {}
+                except ImportError as e:
+                    # moto loads the backend of a service with its first call;
+                    # some need extras ("moto[cognitoidp]")
+                    print(f'Stand-in for {resource["resource_type"]} "{name}" not '
+                          f'created, moto misses a dependency: {e}', file=sys.stderr)
+
+        original = BaseClient._make_api_call
+        stand_ins = self
+
+        def make_api_call(client, operation_name, api_params):
+            with stand_ins._calls_lock:
+                stand_ins.calls[f'{client.meta.service_model.service_name}.'
+                                f'{operation_name}'] += 1
+            if stand_ins.latency:
+                time.sleep(stand_ins.latency)
+            return original(client, operation_name, api_params)
+
+        self._patch = patch.object(BaseClient, '_make_api_call', make_api_call)
+        self._patch.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._patch.stop()
+        self._mock.stop()
+        restore_environment(self._previous_environment)
+
+    def _client(self, service_name):
+        import boto3
+        return boto3.client(service_name, region_name=self.region)
+
+    def reset_calls(self):
+        with self._calls_lock:
+            self.calls.clear()
+
+
+def _create_table(client, name, resource):
+    keys = [(resource['hash_key_name'], resource['hash_key_type'], 'HASH')]
+    if resource.get('sort_key_name'):
+        keys.append((resource['sort_key_name'], resource['sort_key_type'], 'RANGE'))
+    attributes = {key: key_type for key, key_type, _ in keys}
+    arguments = {
+        'TableName': name,
+        'KeySchema': [{'AttributeName': key, 'KeyType': role} for key, _, role in keys],
+        'BillingMode': 'PAY_PER_REQUEST',
+    }
+    indexes = []
+    for index in resource.get('global_indexes') or []:
+        schema = [{'AttributeName': index['index_key_name'], 'KeyType': 'HASH'}]
+        attributes[index['index_key_name']] = index['index_key_type']
+        if index.get('index_sort_key_name'):
+            schema.append({'AttributeName': index['index_sort_key_name'], 'KeyType': 'RANGE'})
+            attributes[index['index_sort_key_name']] = index['index_sort_key_type']
+        indexes.append({'IndexName': index['name'], 'KeySchema': schema,
+                        'Projection': {'ProjectionType': 'ALL'}})
+    if indexes:
+        arguments['GlobalSecondaryIndexes'] = indexes
+    if resource.get('stream_enabled'):
+        arguments['StreamSpecification'] = {
+            'StreamEnabled': True,
+            'StreamViewType': resource.get('stream_view_type', 'NEW_AND_OLD_IMAGES')}
+    arguments['AttributeDefinitions'] = [{'AttributeName': key, 'AttributeType': key_type}
+                                         for key, key_type in attributes.items()]
+    client('dynamodb').create_table(**arguments)
+    return {'name': name}
+
+
+def _create_bucket(client, name, resource):
+    s3 = client('s3')
+    region = s3.meta.region_name
+    if region == 'us-east-1':
+        s3.create_bucket(Bucket=name)
+    else:
+        s3.create_bucket(Bucket=name,
+                         CreateBucketConfiguration={'LocationConstraint': region})
+    return {'name': name}
+
+
+def _create_queue(client, name, resource):
+    attributes = {}
+    if resource.get('fifo_queue'):
+        name = name if name.endswith('.fifo') else f'{name}.fifo'
+        attributes['FifoQueue'] = 'true'
+        if resource.get('content_based_deduplication'):
+            attributes['ContentBasedDeduplication'] = 'true'
+    url = client('sqs').create_queue(QueueName=name, Attributes=attributes)['QueueUrl']
+    return {'url': url}
+
+
+def _create_topic(client, name, resource):
+    return {'arn': client('sns').create_topic(Name=name)['TopicArn']}
+
+
+def _create_user_pool(client, name, resource):
+    cognito = client('cognito-idp')
+    pool_id = cognito.create_user_pool(PoolName=name)['UserPool']['Id']
+    outputs = {'id': pool_id}
+    app_client = resource.get('client')
+    if app_client:
+        outputs['client_id'] = cognito.create_user_pool_client(
+            UserPoolId=pool_id, ClientName=app_client.get('client_name', name),
+            GenerateSecret=bool(app_client.get('generate_secret')),
+            ExplicitAuthFlows=app_client.get('explicit_auth_flows') or [],
+        )['UserPoolClient']['ClientId']
+    return outputs
+
+
+_CREATORS = {
+    'dynamodb_table': _create_table,
+    's3_bucket': _create_bucket,
+    'sqs_queue': _create_queue,
+    'sns_topic': _create_topic,
+    'cognito_idp': _create_user_pool,
+}
+
+
+def forecast_payload(query, hours=48):
+    """Open-Meteo shaped forecast for the requested coordinates."""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    times = [(start + timedelta(hours=hour)).strftime('%Y-%m-%dT%H:%M')
+             for hour in range(hours)]
+    return {
+        'latitude': float(query.get('latitude', 52.52)),
+        'longitude': float(query.get('longitude', 13.41)),
+        'generationtime_ms': 0.05,
+        'utc_offset_seconds': 0,
+        'timezone': 'GMT',
+        'timezone_abbreviation': 'GMT',
+        'elevation': 38.0,
+        'current_units': {'time': 'iso8601', 'temperature_2m': '°C',
+                          'wind_speed_10m': 'km/h'},
+        'current': {'time': times[0], 'interval': 900, 'temperature_2m': 1.5,
+                    'wind_speed_10m': 10.1},
+        'hourly_units': {'time': 'iso8601', 'temperature_2m': '°C',
+                         'relative_humidity_2m': '%', 'wind_speed_10m': 'km/h'},
+        'hourly': {
+            'time': times,
+            'temperature_2m': [round(1.5 + (hour % 24) * 0.3, 1) for hour in range(hours)],
+            'relative_humidity_2m': [80 - hour % 24 for hour in range(hours)],
+            'wind_speed_10m': [round(10.1 + (hour % 12) * 0.4, 1) for hour in range(hours)],
+        },
+    }
+
+
+class HttpStandIn:
+    """
+    Answers every request sent with requests (any session) in process,
+    used as a context manager. The body is `body` when given, else an
+    Open-Meteo forecast for the latitude/longitude of the query.
+    """
+
+    def __init__(self, body=None, latency=0.0, status=200):
+        """
+        :param body: response body (bytes), None for the forecast
+        :param latency: seconds added to every request
+        :param status: status code of the responses
+        """
+        self.body = body
+        self.latency = latency
+        self.status = status
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._patch = None
+
+    def __enter__(self):
+        try:
+            from requests.adapters import HTTPAdapter
+        except ImportError:
+            # Nothing can send requests then
+            return self
+        stand_in = self
+
+        def send(adapter, request, **kwargs):
+            return stand_in.respond(adapter, request)
+
+        self._patch = patch.object(HTTPAdapter, 'send', send)
+        self._patch.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._patch is not None:
+            self._patch.stop()
+
+    def respond(self, adapter, request):
+        from requests.models import Response
+        from requests.structures import CaseInsensitiveDict
+
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        body = self.body
+        if body is None:
+            body = json.dumps(forecast_payload(dict(parse_qsl(urlsplit(request.url).query))))
+            body = body.encode()
+        response = Response()
+        response.status_code = self.status
+        response.reason = 'OK' if self.status < 400 else 'Error'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json',
+                                                'Content-Length': str(len(body))})
+        response._content = body
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        return response
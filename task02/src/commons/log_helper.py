@@ -1,5 +1,7 @@
+import json
 import logging
 import os
+import random
 from sys import stdout
 
 _name_to_level = {
@@ -24,9 +26,98 @@ if not log_level:
     log_level = logging.INFO
 logging.captureWarnings(True)
 
+# Longest rendering of a single payload before it is cut
+max_payload_chars = int(os.environ.get('log_max_payload_chars', 2048))
+# Share of records below WARNING kept by sampled loggers, 1.0 keeps all
+log_sample_rate = float(os.environ.get('log_sample_rate', 1.0))
 
-def get_logger(log_name, level=log_level):
+
+def _truncate(text, limit):
+    if limit and len(text) > limit:
+        return f'{text[:limit]}...[{len(text) - limit} chars truncated]'
+    return text
+
+
+def _render(payload):
+    if isinstance(payload, str):
+        return payload
+    try:
+        return json.dumps(payload, default=str, separators=(',', ':'))
+    except (TypeError, ValueError):
+        return repr(payload)
+
+
+class LazyPayload:
+    """
+    Wraps a log argument so it is rendered (as JSON when possible) and
+    truncated only if the record is actually emitted:
+        _LOG.debug('Request: %s', lazy(event))
+    """
+
+    __slots__ = ('payload', 'limit')
+
+    def __init__(self, payload, limit=None):
+        self.payload = payload
+        self.limit = max_payload_chars if limit is None else limit
+
+    def __str__(self):
+        return _truncate(_render(self.payload), self.limit)
+
+
+class StructuredMessage:
+    """
+    Log message with key=value fields, rendered only when emitted:
+        _LOG.info(structured('Processing record', event=name, data=image))
+    """
+
+    __slots__ = ('message', 'fields', 'limit')
+
+    def __init__(self, message, limit=None, **fields):
+        self.message = message
+        self.fields = fields
+        self.limit = max_payload_chars if limit is None else limit
+
+    def __str__(self):
+        rendered = ' '.join(
+            f'{key}={_truncate(_render(value), self.limit)}'
+            for key, value in self.fields.items())
+        return f'{self.message} {rendered}' if rendered else self.message
+
+
+def lazy(payload, limit=None) -> LazyPayload:
+    return LazyPayload(payload, limit)
+
+
+def structured(message, limit=None, **fields) -> StructuredMessage:
+    return StructuredMessage(message, limit, **fields)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a `rate` share of the records below WARNING."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+def get_logger(log_name, level=log_level, sample_rate=None):
+    """
+    :param log_name: child logger name
+    :param level: logger level, `log_level` env variable by default
+    :param sample_rate: share of records below WARNING to keep,
+        `log_sample_rate` env variable by default
+    """
     module_logger = logger.getChild(log_name)
     if level:
         module_logger.setLevel(level)
+    if sample_rate is None:
+        sample_rate = log_sample_rate
+    for log_filter in list(module_logger.filters):
+        if isinstance(log_filter, SamplingFilter):
+            module_logger.removeFilter(log_filter)
+    if sample_rate < 1.0:
+        module_logger.addFilter(SamplingFilter(sample_rate))
     return module_logger
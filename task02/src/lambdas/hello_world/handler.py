@@ -1,5 +1,6 @@
-from commons.log_helper import get_logger
+from commons.log_helper import get_logger, lazy
 from commons.abstract_lambda import AbstractLambda
+from commons.event_sources import ApiGatewayRequest
 from commons.exception import ApplicationException
 
 _LOG = get_logger('HelloWorld-handler')
@@ -7,12 +8,11 @@ _LOG = get_logger('HelloWorld-handler')
 class HelloWorld(AbstractLambda):
 
     def validate_request(self, event) -> None:
-        method = event.get('httpMethod') or \
-                 event.get('requestContext', {}).get('http', {}).get('method', 'UNKNOWN')
-        path = event.get('rawPath') or \
-               event.get('requestContext', {}).get('http', {}).get('path', 'UNKNOWN')
+        request = ApiGatewayRequest(event)
+        method = request.method or 'UNKNOWN'
+        path = request.path or 'UNKNOWN'
 
-        _LOG.info(f"Validating request with method: {method}, path: {path}")
+        _LOG.info("Validating request with method: %s, path: %s", method, path)
 
         if method == 'GET' and path == '/hello':
             return
@@ -35,10 +35,10 @@ HANDLER = HelloWorld()
 def lambda_handler(event, context):
     try:
         response = HANDLER.handle_request(event, context)
-        _LOG.info(f"Valid request - response to return: {response}")
+        _LOG.info("Valid request - response to return: %s", lazy(response))
         return response
     except ApplicationException as e:
-        _LOG.error(f"Invalid request - statusCode: {e.code}, message: {e.content}")
+        _LOG.error("Invalid request - statusCode: %s, message: %s", e.code, e.content)
         return {
             "statusCode": e.code,
             "body": f'{{"statusCode": {e.code}, "message": "{e.content}"}}'
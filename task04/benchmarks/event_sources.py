@@ -0,0 +1,64 @@
+"""
+Cost of turning an SQS event of 100 records with 4 KB JSON bodies into
+records, when the handler only needs the message ids (e.g. to
+acknowledge or route them): eagerly parsing every body into a dict per
+record, against commons.event_sources records that parse on access.
+Memory is what tracemalloc sees held by the records of one batch.
+
+    python -m benchmarks.event_sources
+"""
+import json
+import tracemalloc
+
+from benchmarks import best_of, load_handler
+
+RECORDS = 100
+
+
+def eager(event):
+    return [{'message_id': record['messageId'], 'body': json.loads(record['body']),
+             'attributes': dict(record.get('attributes', {}))}
+            for record in event['Records']]
+
+
+def allocated_kib(func):
+    tracemalloc.start()
+    try:
+        result = func()
+        return tracemalloc.get_traced_memory()[0] / 1024, result
+    finally:
+        tracemalloc.stop()
+
+
+def run():
+    load_handler()
+    from commons.event_sources import parse_records
+
+    body = json.dumps({'items': [{'id': index, 'name': f'item-{index}', 'price': 1.5}
+                                 for index in range(100)]})
+    event = {'Records': [{'eventSource': 'aws:sqs', 'messageId': f'id-{index}',
+                          'body': body, 'attributes': {'ApproximateReceiveCount': '1'}}
+                         for index in range(RECORDS)]}
+    def lazy_ids():
+        records = list(parse_records(event))
+        [record.message_id for record in records]
+        return records
+
+    def lazy_bodies():
+        records = list(parse_records(event))
+        [record.json for record in records]
+        return records
+
+    cases = (
+        ('eager dicts, bodies parsed', lambda: eager(event)),
+        ('event_sources, ids only', lazy_ids),
+        ('event_sources, bodies parsed', lazy_bodies),
+    )
+    print(f'{RECORDS} SQS records, {len(body)} byte bodies')
+    for name, func in cases:
+        elapsed = best_of(func, number=20)
+        memory, _ = allocated_kib(func)
+        print(f'  {name:<30} | {elapsed * 1e6:9.1f} us | {memory:8.1f} KiB held')
+
+if __name__ == '__main__':
+    run()
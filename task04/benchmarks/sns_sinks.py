@@ -0,0 +1,55 @@
+"""
+Wall time of an SnsHandler invocation of 100 notifications fanned out
+to DynamoDB, S3 and SQS stand-ins that wait 20 ms per request, written
+one sink after the other (and one request per notification, as a loop
+of put_item / put_object / send_message would) versus the sink pipeline.
+
+    python -m benchmarks.sns_sinks
+"""
+import json
+import time
+
+from benchmarks import best_of, load_handler
+
+NOTIFICATIONS = 100
+REQUEST_LATENCY_SEC = 0.02
+
+
+class LatentClient:
+    """Accepts any API call and answers after REQUEST_LATENCY_SEC."""
+
+    def __getattr__(self, name):
+        def call(**kwargs):
+            time.sleep(REQUEST_LATENCY_SEC)
+            return {}
+        return call
+
+
+def run():
+    module = load_handler('sns_handler')
+    from commons.sinks import DynamoDBSink, Notification, S3Sink, SqsSink
+
+    event = {'Records': [{'Sns': {'MessageId': f'id-{index}',
+                                  'Message': json.dumps({'index': index})}}
+                         for index in range(NOTIFICATIONS)]}
+    client = LatentClient()
+    sinks = [DynamoDBSink('table', dynamodb=client), S3Sink('bucket', s3=client),
+             SqsSink('https://queue', sqs=client)]
+
+    def per_message():
+        for record in event['Records']:
+            message = record['Sns']['Message']
+            for sink in sinks:
+                # Each sink decoding the message and writing it on its own
+                sink.write([Notification(record['Sns']['MessageId'], message)])
+
+    handler = module.SnsHandler(sinks=sinks)
+    sequential = best_of(per_message, repeat=1)
+    pipeline = best_of(lambda: handler.handle_request(event, None), repeat=3)
+    print(f'one request per message and sink | {sequential * 1e3:8.1f} ms')
+    print(f'batched, sinks concurrent         | {pipeline * 1e3:8.1f} ms | '
+          f'{sequential / pipeline:5.1f}x')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,33 @@
+"""
+Records per second through the SqsHandler batch processor for a batch
+of 100 messages whose handler waits on I/O (a 10 ms sleep standing in
+for a downstream call), by number of worker threads.
+
+    python -m benchmarks.sqs_batch
+"""
+import time
+
+from benchmarks import best_of, load_handler
+
+BATCH_SIZE = 100
+IO_LATENCY_SEC = 0.01
+
+
+def run():
+    load_handler()
+    from commons.sqs_batch import SqsBatchProcessor
+
+    event = {'Records': [{'messageId': f'id-{index}', 'body': 'message', 'attributes': {}}
+                         for index in range(BATCH_SIZE)]}
+    baseline = None
+    for workers in (1, 2, 4, 8, 16, 32):
+        processor = SqsBatchProcessor(lambda record: time.sleep(IO_LATENCY_SEC),
+                                      max_workers=workers)
+        elapsed = best_of(lambda: processor.process(event), repeat=3)
+        baseline = baseline or elapsed
+        print(f'{workers:3d} workers | {elapsed * 1e3:7.1f} ms per batch | '
+              f'{BATCH_SIZE / elapsed:8.0f} records/s | {baseline / elapsed:5.1f}x')
+
+
+if __name__ == '__main__':
+    run()
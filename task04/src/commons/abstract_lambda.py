@@ -1,7 +1,8 @@
 from abc import abstractmethod
 
 from commons import ApplicationException, build_response
-from commons.log_helper import get_logger
+from commons.event_sources import parse_records
+from commons.log_helper import get_logger, lazy
 
 _LOG = get_logger('abstract-lambda')
 
@@ -27,9 +28,18 @@ class AbstractLambda:
         """
         pass
 
+    @staticmethod
+    def records(event):
+        """
+        Typed views of the records of an event, see commons.event_sources
+        :param event: lambda incoming event
+        :return: iterator of EventRecord
+        """
+        return parse_records(event)
+
     def lambda_handler(self, event, context):
         try:
-            _LOG.debug(f'Request: {event}')
+            _LOG.debug('Request: %s', lazy(event))
             if event.get('warm_up'):
                 return
             errors = self.validate_request(event=event)
@@ -38,14 +48,14 @@ class AbstractLambda:
                                       content=errors)
             execution_result = self.handle_request(event=event,
                                                    context=context)
-            _LOG.debug(f'Response: {execution_result}')
+            _LOG.debug('Response: %s', lazy(execution_result))
             return execution_result
         except ApplicationException as e:
-            _LOG.error(f'Error occurred; Event: {event}; Error: {e}')
+            _LOG.error('Error occurred; Event: %s; Error: %s', lazy(event), e)
             return build_response(code=e.code,
                                   content=e.content)
         except Exception as e:
-            _LOG.error(
-                f'Unexpected error occurred; Event: {event}; Error: {e}')
+            _LOG.error('Unexpected error occurred; Event: %s; Error: %s',
+                       lazy(event), e)
             return build_response(code=500,
                                   content='Internal server error')
@@ -0,0 +1,255 @@
+"""
+Fan-out of notifications to downstream sinks (DynamoDB, S3, SQS).
+
+Each notification is decoded once into a Notification shared by every
+sink. A SinkPipeline hands the notifications of an invocation to all
+its sinks at the same time, one thread per sink, and every sink batches
+its writes across the notifications (BatchWriteItem, one S3 object,
+SendMessageBatch). The pipeline reports how long each sink took and
+whether it failed; one failing sink does not stop the others.
+
+Delivery is at least once: when any sink fails the invocation raises
+and SNS retries it with the same messages, so the sinks that succeeded
+see them again. The writes are made idempotent where the target allows
+it: DynamoDB items and S3 keys are derived from the message ids, and
+FIFO queues get the message id as MessageDeduplicationId (duplicates
+within SQS's five minute window are dropped). Standard queues receive
+a retried message again, their consumers have to tolerate duplicates.
+"""
+import hashlib
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from commons.aws_clients import get_client, get_resource
+from commons.batch_writer import batch_write_items
+from commons.log_helper import get_logger
+
+_LOG = get_logger('sinks')
+
+
+class SinkError(Exception):
+    """One or more sinks failed; `results` holds every SinkResult."""
+
+    def __init__(self, results):
+        self.results = results
+        failed = ', '.join(f'{r.name}: {r.error!r}' for r in results if r.error)
+        super().__init__(f'Sinks failed: {failed}')
+
+
+class Notification:
+    __slots__ = ('message_id', 'subject', 'topic_arn', 'timestamp', 'message', 'payload')
+
+    def __init__(self, message_id, message, subject=None, topic_arn=None, timestamp=None):
+        self.message_id = message_id
+        self.message = message
+        self.subject = subject
+        self.topic_arn = topic_arn
+        self.timestamp = timestamp
+        self.payload = decode_payload(message)
+
+    @classmethod
+    def from_sns(cls, record):
+        """:param record: commons.event_sources.SnsRecord"""
+        return cls(record.message_id, record.message, subject=record.subject,
+                   topic_arn=record.topic_arn, timestamp=record.sns.get('Timestamp'))
+
+    def to_item(self) -> dict:
+        """The notification as a DynamoDB item / JSON document."""
+        item = {'id': self.message_id or str(uuid.uuid4()), 'payload': self.payload}
+        for name in ('subject', 'topic_arn', 'timestamp'):
+            value = getattr(self, name)
+            if value is not None:
+                item[name] = value
+        return item
+
+
+def decode_payload(message):
+    """
+    JSON messages decoded (numbers with a fraction as Decimal, so they
+    can be stored in DynamoDB), other messages kept as the string.
+    """
+    try:
+        return json.loads(message, parse_float=Decimal)
+    except (TypeError, ValueError):
+        return message
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class Sink:
+    """
+    Base of the sinks. Subclasses implement write_batch; `predicate`
+    selects the notifications a sink receives.
+    """
+
+    # Notifications per write_batch call, None for all at once
+    batch_size = None
+
+    def __init__(self, name=None, predicate=None):
+        self.name = name or type(self).__name__
+        self.predicate = predicate
+
+    def select(self, notifications) -> list:
+        if self.predicate is None:
+            return list(notifications)
+        return [n for n in notifications if self.predicate(n)]
+
+    def write(self, notifications):
+        size = self.batch_size or max(len(notifications), 1)
+        for start in range(0, len(notifications), size):
+            self.write_batch(notifications[start:start + size])
+
+    def write_batch(self, notifications):
+        raise NotImplementedError
+
+
+class DynamoDBSink(Sink):
+    """Puts one item per notification with BatchWriteItem."""
+
+    def __init__(self, table_name, dynamodb=None, **kwargs):
+        """
+        :param table_name: target table, keyed by "id"
+        :param dynamodb: boto3 DynamoDB resource, the shared one by default
+        """
+        super().__init__(**kwargs)
+        self.table_name = table_name
+        self.dynamodb = dynamodb
+
+    def write(self, notifications):
+        # batch_write_items chunks by 25 and retries unprocessed items
+        dynamodb = self.dynamodb or get_resource('dynamodb')
+        items = [notification.to_item() for notification in notifications]
+        unprocessed = batch_write_items(dynamodb, self.table_name, items)
+        if unprocessed:
+            raise RuntimeError(f'{len(unprocessed)} of {len(items)} items unprocessed')
+
+
+class S3Sink(Sink):
+    """
+    Writes the notifications of an invocation as one NDJSON object. The
+    key is a digest of the message ids, so a retried invocation
+    overwrites its object instead of adding a second one.
+    """
+
+    def __init__(self, bucket, prefix='', s3=None, **kwargs):
+        """
+        :param bucket: target bucket
+        :param prefix: key prefix, e.g. "notifications/"
+        :param s3: boto3 S3 client, the shared one by default
+        """
+        super().__init__(**kwargs)
+        self.bucket = bucket
+        self.prefix = prefix
+        self.s3 = s3
+
+    def write_batch(self, notifications):
+        body = ''.join(json.dumps(n.to_item(), default=_json_default) + '\n'
+                       for n in notifications)
+        (self.s3 or get_client('s3')).put_object(
+            Bucket=self.bucket, Key=f'{self.prefix}{self.digest(notifications)}.ndjson',
+            Body=body.encode(), ContentType='application/x-ndjson')
+
+    @staticmethod
+    def digest(notifications) -> str:
+        ids = hashlib.sha256()
+        for n in notifications:
+            ids.update((n.message_id or n.message or '').encode())
+            ids.update(b'\n')
+        return ids.hexdigest()
+
+
+class SqsSink(Sink):
+    """
+    Forwards the raw messages with SendMessageBatch. FIFO queues (URL
+    ending in ".fifo") get the message id as MessageDeduplicationId.
+    """
+
+    batch_size = 10
+
+    def __init__(self, queue_url, sqs=None, message_group_id='notifications', **kwargs):
+        """
+        :param queue_url: target queue
+        :param sqs: boto3 SQS client, the shared one by default
+        :param message_group_id: MessageGroupId of the messages sent to a
+            FIFO queue
+        """
+        super().__init__(**kwargs)
+        self.queue_url = queue_url
+        self.sqs = sqs
+        self.fifo = queue_url.endswith('.fifo')
+        self.message_group_id = message_group_id
+
+    def write_batch(self, notifications):
+        entries = [{'Id': str(index), 'MessageBody': n.message}
+                   for index, n in enumerate(notifications)]
+        if self.fifo:
+            for entry, n in zip(entries, notifications):
+                entry['MessageGroupId'] = self.message_group_id
+                entry['MessageDeduplicationId'] = (
+                    n.message_id or hashlib.sha256(n.message.encode()).hexdigest())
+        response = (self.sqs or get_client('sqs')).send_message_batch(
+            QueueUrl=self.queue_url, Entries=entries)
+        failed = response.get('Failed') or []
+        if failed:
+            raise RuntimeError(f'{len(failed)} of {len(entries)} messages not sent: '
+                               f'{failed[0].get("Code")}')
+
+
+class SinkResult:
+    __slots__ = ('name', 'records', 'seconds', 'error')
+
+    def __init__(self, name, records, seconds, error=None):
+        self.name = name
+        self.records = records
+        self.seconds = seconds
+        self.error = error
+
+    def __repr__(self):
+        status = f'failed: {self.error!r}' if self.error else 'ok'
+        return f'{self.name}: {self.records} records in {self.seconds * 1000:.1f} ms, {status}'
+
+
+class SinkPipeline:
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+
+    def register(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def dispatch(self, notifications) -> list:
+        """
+        Writes the notifications to every sink concurrently.
+        :return: SinkResult per sink, in registration order
+        """
+        notifications = list(notifications)
+        if not self.sinks:
+            return []
+        if len(self.sinks) == 1:
+            return [self._write(self.sinks[0], notifications)]
+        with ThreadPoolExecutor(max_workers=len(self.sinks),
+                                thread_name_prefix='sink') as executor:
+            futures = [executor.submit(self._write, sink, notifications)
+                       for sink in self.sinks]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def _write(sink, notifications):
+        selected = sink.select(notifications)
+        start = time.perf_counter()
+        error = None
+        try:
+            if selected:
+                sink.write(selected)
+        except Exception as e:
+            _LOG.error('Sink %s failed: %r', sink.name, e)
+            error = e
+        return SinkResult(sink.name, len(selected), time.perf_counter() - start, error)
@@ -0,0 +1,195 @@
+"""
+Batch processing of SQS event records with partial failure reporting.
+
+Records of a batch are handed to a record handler on a bounded thread
+pool. A record fails when its handler raises or runs past the record
+timeout; the failed messageIds are returned as batchItemFailures, so
+with ReportBatchItemFailures on the event source mapping only those
+messages become visible on the queue again.
+
+Threads cannot be killed: a timed out handler keeps running in the
+background until it returns, its message is reported as failed anyway.
+Records of FIFO queues (with a MessageGroupId) are processed in order,
+one at a time, and every record after the first failure is reported as
+failed too, as SQS requires to keep the group order.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from commons.event_sources import parse_records
+from commons.log_helper import get_logger
+
+_LOG = get_logger('sqs-batch')
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RECORD_TIMEOUT_SEC = 30
+# Time kept free before the lambda timeout to build the response
+DEFAULT_DEADLINE_MARGIN_SEC = 1
+
+
+class RecordTimeoutError(Exception):
+    pass
+
+
+class BatchResult:
+    """Outcome of a batch: succeeded messageIds and failures by messageId."""
+
+    def __init__(self):
+        self.succeeded = []
+        self.failed = {}
+
+    def success(self, message_id):
+        self.succeeded.append(message_id)
+
+    def failure(self, message_id, error):
+        self.failed[message_id] = error
+
+    def response(self) -> dict:
+        """Lambda response for an event source with ReportBatchItemFailures."""
+        return {'batchItemFailures': [{'itemIdentifier': message_id}
+                                      for message_id in self.failed]}
+
+
+class _Task:
+    __slots__ = ('record', 'started_at')
+
+    def __init__(self, record):
+        self.record = record
+        self.started_at = None
+
+
+class SqsBatchProcessor:
+
+    def __init__(self, record_handler, max_workers=DEFAULT_MAX_WORKERS,
+                 record_timeout=DEFAULT_RECORD_TIMEOUT_SEC,
+                 deadline_margin=DEFAULT_DEADLINE_MARGIN_SEC):
+        """
+        :param record_handler: callable taking one SqsRecord; raising
+            fails the record
+        :param max_workers: records processed at the same time
+        :param record_timeout: seconds a record may take once started
+        :param deadline_margin: seconds before the lambda timeout at
+            which unfinished records are given up as failed
+        """
+        self.record_handler = record_handler
+        self.max_workers = max_workers
+        self.record_timeout = record_timeout
+        self.deadline_margin = deadline_margin
+
+    def process(self, event, context=None) -> BatchResult:
+        """
+        :param event: SQS event
+        :param context: lambda context, for the remaining execution time
+        """
+        records = list(parse_records(event))
+        result = BatchResult()
+        if not records:
+            return result
+        deadline = self._deadline(context)
+        is_fifo = any(record.message_group_id for record in records)
+        workers = 1 if is_fifo else min(self.max_workers, len(records))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sqs-record')
+        try:
+            if is_fifo:
+                self._process_in_order(executor, records, deadline, result)
+            else:
+                self._process_concurrently(executor, workers, records, deadline, result)
+        finally:
+            # Timed out handlers are left running instead of blocking the batch
+            executor.shutdown(wait=False, cancel_futures=True)
+        _LOG.info('Processed %s SQS records: %s succeeded, %s failed',
+                  len(records), len(result.succeeded), len(result.failed))
+        return result
+
+    def _deadline(self, context):
+        get_remaining_time = getattr(context, 'get_remaining_time_in_millis', None)
+        if get_remaining_time is None:
+            return None
+        return time.monotonic() + get_remaining_time() / 1000 - self.deadline_margin
+
+    def _run(self, task):
+        task.started_at = time.monotonic()
+        return self.record_handler(task.record)
+
+    def _process_concurrently(self, executor, workers, records, deadline, result):
+        pending = {}
+        for record in records:
+            task = _Task(record)
+            pending[executor.submit(self._run, task)] = task
+        # Given up handlers still holding their thread; once they return
+        # the thread takes queued records again
+        lost = set()
+        while pending:
+            done, _ = wait(pending, timeout=self._wait_timeout(pending.values(), deadline),
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                self._record_outcome(future, pending.pop(future), result)
+            lost.update(self._expire(pending, deadline, result))
+            lost = {future for future in lost if not future.done()}
+            if pending and len(lost) >= workers:
+                # Every thread is stuck in a timed out handler
+                self._give_up(pending, 'no worker left', result)
+
+    def _process_in_order(self, executor, records, deadline, result):
+        for index, record in enumerate(records):
+            task = _Task(record)
+            pending = {executor.submit(self._run, task): task}
+            while pending:
+                done, _ = wait(pending, timeout=self._wait_timeout([task], deadline))
+                for future in done:
+                    self._record_outcome(future, pending.pop(future), result)
+                self._expire(pending, deadline, result)
+            if record.message_id in result.failed:
+                for skipped in records[index + 1:]:
+                    result.failure(skipped.message_id,
+                                   RuntimeError('An earlier message of the batch failed'))
+                return
+
+    def _wait_timeout(self, tasks, deadline):
+        now = time.monotonic()
+        # A record not started yet cannot time out before now + record_timeout
+        until = min((task.started_at or now) + self.record_timeout for task in tasks)
+        if deadline is not None:
+            until = min(until, deadline)
+        return max(until - now, 0)
+
+    def _expire(self, pending, deadline, result) -> list:
+        """
+        Fails the records past their timeout, or all of them past the
+        deadline.
+        :return: futures of the records given up while their handler was
+            running
+        """
+        now = time.monotonic()
+        if deadline is not None and now >= deadline:
+            running = [future for future, task in pending.items()
+                       if task.started_at is not None]
+            self._give_up(pending, 'lambda deadline', result)
+            return running
+        expired = {future: task for future, task in pending.items()
+                   if task.started_at is not None and not future.done()
+                   and now - task.started_at >= self.record_timeout}
+        for future in expired:
+            del pending[future]
+        timed_out = list(expired)
+        self._give_up(expired, 'record timeout', result)
+        return timed_out
+
+    @staticmethod
+    def _give_up(pending, reason, result):
+        for future, task in pending.items():
+            future.cancel()
+            message_id = task.record.message_id
+            result.failure(message_id, RecordTimeoutError(f'Gave up on the record: {reason}'))
+            _LOG.error('SQS message %s not processed (%s)', message_id, reason)
+        pending.clear()
+
+    @staticmethod
+    def _record_outcome(future, task, result):
+        message_id = task.record.message_id
+        error = future.exception()
+        if error is None:
+            result.success(message_id)
+        else:
+            _LOG.error('SQS message %s failed: %r', message_id, error)
+            result.failure(message_id, error)
@@ -1,23 +1,61 @@
-from commons.log_helper import get_logger
+import os
+
+from commons.log_helper import get_logger, lazy
 from commons.abstract_lambda import AbstractLambda
+from commons.sinks import (DynamoDBSink, Notification, S3Sink, SinkError, SinkPipeline,
+                           SqsSink)
 
 _LOG = get_logger('SnsHandler-handler')
 
+# Downstream sinks, each one enabled by setting its target
+SINK_TABLE = os.environ.get('sink_table')
+SINK_BUCKET = os.environ.get('sink_bucket')
+SINK_PREFIX = os.environ.get('sink_prefix', 'notifications/')
+SINK_QUEUE_URL = os.environ.get('sink_queue_url')
+
+
+def default_sinks() -> list:
+    sinks = []
+    if SINK_TABLE:
+        sinks.append(DynamoDBSink(SINK_TABLE, name='dynamodb'))
+    if SINK_BUCKET:
+        sinks.append(S3Sink(SINK_BUCKET, SINK_PREFIX, name='s3'))
+    if SINK_QUEUE_URL:
+        sinks.append(SqsSink(SINK_QUEUE_URL, name='sqs'))
+    return sinks
+
 
 class SnsHandler(AbstractLambda):
 
+    def __init__(self, sinks=None):
+        """:param sinks: commons.sinks.Sink list, from the environment by default"""
+        self.pipeline = SinkPipeline(default_sinks() if sinks is None else sinks)
+
     def validate_request(self, event) -> dict:
         pass
-        
+
+    def register_sink(self, sink):
+        return self.pipeline.register(sink)
+
     def handle_request(self, event, context):
-        for record in event.get('Records', []):
+        notifications = []
+        for record in self.records(event):
             try:
-                message = record['Sns']['Message']
-                _LOG.info(f"Received SNS message: {message}")
+                message = record.message
+                _LOG.info("Received SNS message: %s", lazy(message))
             except KeyError as e:
-                _LOG.error(f"Missing expected key in the record: {e}")
+                _LOG.error("Missing expected key in the record: %s", e)
+                continue
+            notifications.append(Notification.from_sns(record))
+
+        results = self.pipeline.dispatch(notifications)
+        for result in results:
+            _LOG.info("Sink %r", result)
+        if any(result.error for result in results):
+            # Raising makes SNS retry the invocation
+            raise SinkError(results)
         return 200
-    
+
 
 HANDLER = SnsHandler()
 
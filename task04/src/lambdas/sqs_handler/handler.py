@@ -1,18 +1,36 @@
-from commons.log_helper import get_logger
+import os
+
+from commons.log_helper import get_logger, lazy
 from commons.abstract_lambda import AbstractLambda
+from commons.sqs_batch import SqsBatchProcessor
 
 _LOG = get_logger('SqsHandler-handler')
 
+# Records of a batch processed at the same time
+MAX_WORKERS = int(os.environ.get('sqs_max_workers', 8))
+# Seconds a record may take before its message is returned to the queue
+RECORD_TIMEOUT_SEC = float(os.environ.get('sqs_record_timeout', 30))
+
+
 class SqsHandler(AbstractLambda):
 
+    def __init__(self):
+        self.processor = SqsBatchProcessor(self.process_record, max_workers=MAX_WORKERS,
+                                           record_timeout=RECORD_TIMEOUT_SEC)
+
     def validate_request(self, event) -> dict:
         pass
-        
+
+    def process_record(self, record):
+        """:param record: commons.event_sources.SqsRecord"""
+        message_body = record.body if record.body is not None else 'No body'
+        _LOG.info("Received SQS message: %s", lazy(message_body))
+
     def handle_request(self, event, context):
-        for record in event.get('Records', []):
-            message_body = record.get('body', 'No body')
-            _LOG.info(f"Received SQS message: {message_body}")
-        return 200
+        """
+        :return: batchItemFailures with the messageIds to be retried
+        """
+        return self.processor.process(event, context).response()
 
 HANDLER = SqsHandler()
 
@@ -0,0 +1,191 @@
+import json
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+from tests.test_sns_handler import LAMBDA_HANDLER, SnsHandlerLambdaTestCase
+from commons import ApplicationException
+from commons.sinks import (DynamoDBSink, Notification, S3Sink, Sink, SinkError,
+                           SinkPipeline, SqsSink)
+
+
+def sns_event(count):
+    return {'Records': [{'EventSource': 'aws:sns', 'Sns': {
+        'MessageId': f'id-{index}', 'Subject': 'forecast',
+        'TopicArn': 'arn:aws:sns:eu-central-1:123456789012:lambda_topic',
+        'Message': json.dumps({'index': index, 'value': 1.5})}}
+        for index in range(count)]}
+
+
+class FakeDynamoDB:
+    """Stand-in for the boto3 DynamoDB resource."""
+
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.calls = []
+
+    def batch_write_item(self, RequestItems):
+        time.sleep(self.latency)
+        self.calls.append(RequestItems)
+        return {'UnprocessedItems': {}}
+
+
+class FakeS3:
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        time.sleep(self.latency)
+        self.objects[(Bucket, Key)] = Body
+
+
+class FakeSqs:
+    def __init__(self, latency=0, fail=False):
+        self.latency = latency
+        self.fail = fail
+        self.calls = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        time.sleep(self.latency)
+        self.calls.append(Entries)
+        if self.fail:
+            return {'Successful': [], 'Failed': [
+                {'Id': entry['Id'], 'Code': 'InternalError'} for entry in Entries]}
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries]}
+
+
+class TestSinks(SnsHandlerLambdaTestCase):
+
+    def setUp(self) -> None:
+        self.dynamodb, self.s3, self.sqs = FakeDynamoDB(), FakeS3(), FakeSqs()
+        self.HANDLER = LAMBDA_HANDLER.SnsHandler(sinks=[
+            DynamoDBSink('notifications', dynamodb=self.dynamodb, name='dynamodb'),
+            S3Sink('bucket', 'notifications/', s3=self.s3, name='s3'),
+            SqsSink('https://queue', sqs=self.sqs, name='sqs'),
+        ])
+
+    def test_writes_are_batched_per_sink(self):
+        self.assertEqual(self.HANDLER.handle_request(sns_event(30), {}), 200)
+
+        self.assertEqual([len(call['notifications']) for call in self.dynamodb.calls], [25, 5])
+        self.assertEqual([len(entries) for entries in self.sqs.calls], [10, 10, 10])
+        self.assertEqual(len(self.s3.objects), 1)
+        (bucket, key), body = next(iter(self.s3.objects.items()))
+        self.assertTrue(key.startswith('notifications/'))
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(len(lines), 30)
+        self.assertEqual(lines[0]['payload'], {'index': 0, 'value': 1.5})
+
+        item = self.dynamodb.calls[0]['notifications'][0]['PutRequest']['Item']
+        self.assertEqual(item['id'], 'id-0')
+        self.assertEqual(item['payload'], {'index': 0, 'value': Decimal('1.5')})
+        self.assertEqual(self.sqs.calls[0][0]['MessageBody'], '{"index": 0, "value": 1.5}')
+
+    def test_sinks_are_written_concurrently(self):
+        pipeline = SinkPipeline([
+            DynamoDBSink('notifications', dynamodb=FakeDynamoDB(latency=0.1)),
+            S3Sink('bucket', s3=FakeS3(latency=0.1)),
+            SqsSink('https://queue', sqs=FakeSqs(latency=0.1)),
+        ])
+        start = time.monotonic()
+        results = pipeline.dispatch([Notification('id', 'message')])
+
+        self.assertLess(time.monotonic() - start, 0.25)
+        self.assertEqual([result.name for result in results],
+                         ['DynamoDBSink', 'S3Sink', 'SqsSink'])
+        for result in results:
+            self.assertEqual(result.records, 1)
+            self.assertGreaterEqual(result.seconds, 0.1)
+            self.assertIsNone(result.error)
+
+    def test_failing_sink_does_not_stop_the_others(self):
+        self.sqs.fail = True
+
+        with self.assertRaises(SinkError) as raised:
+            self.HANDLER.handle_request(sns_event(3), {})
+
+        errors = {result.name: result.error for result in raised.exception.results}
+        self.assertIsNone(errors['dynamodb'])
+        self.assertIsNone(errors['s3'])
+        self.assertIsInstance(errors['sqs'], RuntimeError)
+        self.assertEqual(len(self.dynamodb.calls), 1)
+        self.assertEqual(len(self.s3.objects), 1)
+
+    def test_failing_sink_fails_the_invocation(self):
+        self.sqs.fail = True
+
+        # SNS retries an invocation that raises
+        with self.assertRaises(ApplicationException) as raised:
+            self.HANDLER.lambda_handler(sns_event(3), {})
+
+        self.assertEqual(raised.exception.code, 500)
+
+    def test_retried_invocation_overwrites_its_s3_object(self):
+        self.sqs.fail = True
+        for _ in range(2):
+            with self.assertRaises(ApplicationException):
+                self.HANDLER.lambda_handler(sns_event(3), {})
+
+        self.assertEqual(len(self.s3.objects), 1)
+        self.sqs.fail = False
+        self.HANDLER.handle_request(sns_event(4), {})
+        self.assertEqual(len(self.s3.objects), 2)
+
+    def test_fifo_queue_deduplicates_by_message_id(self):
+        notifications = [Notification.from_sns(record)
+                         for record in self.HANDLER.records(sns_event(2))]
+        fifo, standard = FakeSqs(), FakeSqs()
+        SqsSink('https://queue.fifo', sqs=fifo).write(notifications)
+        SqsSink('https://queue', sqs=standard).write(notifications)
+
+        self.assertEqual([entry['MessageDeduplicationId'] for entry in fifo.calls[0]],
+                         ['id-0', 'id-1'])
+        self.assertEqual(fifo.calls[0][0]['MessageGroupId'], 'notifications')
+        self.assertNotIn('MessageDeduplicationId', standard.calls[0][0])
+
+    def test_messages_are_decoded_once(self):
+        decoded = []
+
+        class Recorder(Sink):
+            def write_batch(self, notifications):
+                decoded.extend(n.payload for n in notifications)
+
+        self.HANDLER.register_sink(Recorder())
+        self.HANDLER.register_sink(Recorder())
+        with patch('commons.sinks.json.loads', wraps=json.loads) as loads:
+            self.HANDLER.handle_request(sns_event(4), {})
+
+        self.assertEqual(loads.call_count, 4)
+        self.assertEqual(len(decoded), 8)
+        self.assertIs(decoded[0], decoded[4])
+
+    def test_predicate_selects_notifications(self):
+        seen = []
+
+        class Recorder(Sink):
+            def write_batch(self, notifications):
+                seen.extend(n.message_id for n in notifications)
+
+        pipeline = SinkPipeline([Recorder(predicate=lambda n: n.payload['index'] % 2)])
+        notifications = [Notification.from_sns(record)
+                         for record in self.HANDLER.records(sns_event(4))]
+        results = pipeline.dispatch(notifications)
+
+        self.assertEqual(seen, ['id-1', 'id-3'])
+        self.assertEqual(results[0].records, 2)
+
+    def test_plain_text_and_missing_messages(self):
+        event = {'Records': [{'Sns': {'Message': 'Message1'}}, {'Sns': {}}]}
+
+        self.assertEqual(self.HANDLER.handle_request(event, {}), 200)
+
+        item = self.dynamodb.calls[0]['notifications'][0]['PutRequest']['Item']
+        self.assertEqual(item['payload'], 'Message1')
+        self.assertEqual(len(self.dynamodb.calls[0]['notifications']), 1)
+
+    def test_without_sinks_nothing_is_dispatched(self):
+        handler = LAMBDA_HANDLER.SnsHandler(sinks=[])
+
+        self.assertEqual(handler.handle_request(sns_event(2), {}), 200)
+        self.assertEqual(handler.pipeline.dispatch([Notification('id', 'message')]), [])
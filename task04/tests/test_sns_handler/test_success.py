@@ -1,11 +1,9 @@
-from unittest.mock import patch
 from unittest import TestCase
-from src.lambdas.sns_handler.handler import HANDLER
+from src.lambdas.sns_handler.handler import HANDLER, _LOG
 
 class TestSuccess(TestCase):
 
-    @patch('src.lambdas.sns_handler.handler._LOG')
-    def test_success(self, mock_logger):
+    def test_success(self):
         event = {
             "Records": [
                 {
@@ -21,9 +19,11 @@ class TestSuccess(TestCase):
             ]
         }
 
-        result = HANDLER.handle_request(event, {})
+        with self.assertLogs(_LOG, 'INFO') as logs:
+            result = HANDLER.handle_request(event, {})
         self.assertEqual(result, 200)
         
-        mock_logger.info.assert_any_call("Received SNS message: Message1")
-        mock_logger.info.assert_any_call("Received SNS message: Message2")
+        messages = [record.getMessage() for record in logs.records]
+        self.assertIn("Received SNS message: Message1", messages)
+        self.assertIn("Received SNS message: Message2", messages)
         
\ No newline at end of file
@@ -0,0 +1,128 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+from tests.test_sqs_handler import SqsHandlerLambdaTestCase
+from commons.sqs_batch import RecordTimeoutError, SqsBatchProcessor
+
+
+def sqs_event(count, group_id=None):
+    records = []
+    for index in range(count):
+        record = {'messageId': f'id-{index}', 'body': f'Message{index}', 'attributes': {}}
+        if group_id:
+            record['attributes']['MessageGroupId'] = group_id
+        records.append(record)
+    return {'Records': records}
+
+
+def failure_ids(response):
+    return [failure['itemIdentifier'] for failure in response['batchItemFailures']]
+
+
+class TestBatchProcessing(SqsHandlerLambdaTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.release = threading.Event()
+        # Lets handlers blocked by a test finish
+        self.addCleanup(self.release.set)
+
+    def test_only_failed_messages_are_reported(self):
+        def handler(record):
+            if record.body in ('Message1', 'Message3'):
+                raise ValueError('bad message')
+
+        result = SqsBatchProcessor(handler).process(sqs_event(5))
+
+        self.assertEqual(result.response(), {'batchItemFailures': [
+            {'itemIdentifier': 'id-1'}, {'itemIdentifier': 'id-3'}]})
+        self.assertCountEqual(result.succeeded, ['id-0', 'id-2', 'id-4'])
+        self.assertIsInstance(result.failed['id-1'], ValueError)
+
+    def test_records_are_processed_concurrently(self):
+        processor = SqsBatchProcessor(lambda record: time.sleep(0.1), max_workers=10)
+        start = time.monotonic()
+        result = processor.process(sqs_event(20))
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(len(result.succeeded), 20)
+
+    def test_slow_record_times_out(self):
+        def handler(record):
+            if record.body == 'Message0':
+                self.release.wait(5)
+
+        start = time.monotonic()
+        result = SqsBatchProcessor(handler, max_workers=2,
+                                   record_timeout=0.1).process(sqs_event(4))
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(failure_ids(result.response()), ['id-0'])
+        self.assertIsInstance(result.failed['id-0'], RecordTimeoutError)
+        self.assertEqual(len(result.succeeded), 3)
+
+    def test_stuck_workers_fail_the_rest(self):
+        processor = SqsBatchProcessor(lambda record: self.release.wait(5),
+                                      max_workers=2, record_timeout=0.1)
+        start = time.monotonic()
+        result = processor.process(sqs_event(6))
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(sorted(result.failed), [f'id-{index}' for index in range(6)])
+
+    def test_workers_are_reused_once_timed_out_handlers_return(self):
+        slow = {'Message0'}
+        slow_returned = threading.Event()
+        lock = threading.Lock()
+
+        def handler(record):
+            # The first record started after Message0 returned is slow too
+            with lock:
+                if slow_returned.is_set() and len(slow) == 1:
+                    slow.add(record.body)
+            if record.body in slow:
+                time.sleep(0.2)
+                slow_returned.set()
+            else:
+                time.sleep(0.02)
+
+        result = SqsBatchProcessor(handler, max_workers=2,
+                                   record_timeout=0.1).process(sqs_event(30))
+
+        self.assertEqual(len(result.failed), 2)
+        self.assertIn('id-0', result.failed)
+        self.assertEqual(len(result.succeeded), 28)
+
+    def test_lambda_deadline(self):
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 1200
+        processor = SqsBatchProcessor(lambda record: self.release.wait(5),
+                                      record_timeout=30, deadline_margin=1)
+        start = time.monotonic()
+        result = processor.process(sqs_event(3), context)
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(len(result.failed), 3)
+
+    def test_fifo_stops_at_the_first_failure(self):
+        processed = []
+
+        def handler(record):
+            processed.append(record.body)
+            if record.body == 'Message2':
+                raise ValueError('bad message')
+
+        result = SqsBatchProcessor(handler).process(sqs_event(5, group_id='group'))
+
+        self.assertEqual(processed, ['Message0', 'Message1', 'Message2'])
+        self.assertEqual(failure_ids(result.response()), ['id-2', 'id-3', 'id-4'])
+
+    def test_handler_response(self):
+        event = sqs_event(3)
+        self.HANDLER.processor.record_handler = MagicMock(
+            side_effect=[None, RuntimeError('failed'), None])
+        self.HANDLER.processor.max_workers = 1
+
+        self.assertEqual(self.HANDLER.handle_request(event, None),
+                         {'batchItemFailures': [{'itemIdentifier': 'id-1'}]})
@@ -0,0 +1,72 @@
+import base64
+import json
+from unittest.mock import patch
+
+from tests.test_sqs_handler import SqsHandlerLambdaTestCase
+from commons.event_sources import (ApiGatewayRequest, DynamoDBStreamRecord, SnsRecord,
+                                   SqsRecord, parse_records)
+
+
+class TestEventSources(SqsHandlerLambdaTestCase):
+
+    def test_sqs_body_is_parsed_on_access_only(self):
+        event = {'Records': [{'eventSource': 'aws:sqs', 'messageId': 'id-1',
+                              'body': '{"a": 1}',
+                              'attributes': {'MessageGroupId': 'group'}}]}
+        with patch('commons.event_sources.json.loads', wraps=json.loads) as loads:
+            record, = self.HANDLER.records(event)
+            self.assertIsInstance(record, SqsRecord)
+            self.assertEqual(record.message_id, 'id-1')
+            self.assertEqual(record.message_group_id, 'group')
+            loads.assert_not_called()
+            self.assertEqual(record.json, {'a': 1})
+            self.assertIs(record.json, record.json)
+            loads.assert_called_once()
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    def test_sns(self):
+        event = {'Records': [{'EventSource': 'aws:sns', 'Sns': {
+            'MessageId': 'm-1', 'Message': '[1, 2]', 'Subject': 'subject',
+            'TopicArn': 'arn:aws:sns:eu-central-1:1:topic'}}]}
+        record, = parse_records(event)
+        self.assertIsInstance(record, SnsRecord)
+        self.assertEqual((record.message_id, record.subject, record.json),
+                         ('m-1', 'subject', [1, 2]))
+
+    def test_dynamodb_stream(self):
+        event = {'Records': [{'eventSource': 'aws:dynamodb', 'eventName': 'MODIFY',
+                              'dynamodb': {'SequenceNumber': '7',
+                                           'Keys': {'key': {'S': 'k'}},
+                                           'NewImage': {'value': {'N': '2'}}}}]}
+        record, = parse_records(event)
+        self.assertIsInstance(record, DynamoDBStreamRecord)
+        self.assertEqual(record.event_name, 'MODIFY')
+        self.assertEqual(record.sequence_number, '7')
+        self.assertEqual(record.keys, {'key': {'S': 'k'}})
+        self.assertEqual(record.old_image, {})
+
+    def test_api_gateway_payload_versions(self):
+        rest = {'httpMethod': 'POST', 'path': '/items', 'isBase64Encoded': True,
+                'body': base64.b64encode(b'{"name": "x"}').decode()}
+        http = {'rawPath': '/items', 'requestContext': {'http': {'method': 'GET'}},
+                'queryStringParameters': {'limit': '5'}}
+
+        request, = parse_records(rest)
+        self.assertIsInstance(request, ApiGatewayRequest)
+        self.assertEqual((request.method, request.path), ('POST', '/items'))
+        self.assertEqual(request.json, {'name': 'x'})
+
+        request = ApiGatewayRequest(http)
+        self.assertEqual((request.method, request.path), ('GET', '/items'))
+        self.assertEqual(request.query, {'limit': '5'})
+        self.assertIsNone(request.json)
+
+    def test_source_detection(self):
+        self.assertEqual(list(parse_records({'Records': []})), [])
+        # Test events often come without eventSource
+        self.assertIsInstance(next(parse_records({'Records': [{'body': 'x'}]})), SqsRecord)
+        self.assertIsInstance(next(parse_records({'Records': [{'Sns': {}}]})), SnsRecord)
+        with self.assertRaises(ValueError):
+            parse_records({'Records': [{'eventSource': 'aws:kafka'}]})
+        with self.assertRaises(ValueError):
+            parse_records({'key': 'value'})
@@ -1,19 +1,19 @@
-from unittest.mock import patch
 from unittest import TestCase
-from src.lambdas.sqs_handler.handler import HANDLER
+from src.lambdas.sqs_handler.handler import HANDLER, _LOG
 
 class TestSuccess(TestCase):
 
-    @patch('src.lambdas.sqs_handler.handler._LOG')
-    def test_success(self, mock_logger):
+    def test_success(self):
         event = {
             "Records": [
                 {"body": "Message1"},
                 {"body": "Message2"}
             ]
         }
-        result = HANDLER.handle_request(event, {})
-        self.assertEqual(result, 200)
+        with self.assertLogs(_LOG, 'INFO') as logs:
+            result = HANDLER.handle_request(event, {})
+        self.assertEqual(result, {"batchItemFailures": []})
         
-        mock_logger.info.assert_any_call("Received SQS message: Message1")
-        mock_logger.info.assert_any_call("Received SQS message: Message2")
+        messages = [record.getMessage() for record in logs.records]
+        self.assertIn("Received SQS message: Message1", messages)
+        self.assertIn("Received SQS message: Message2", messages)
@@ -0,0 +1,50 @@
+"""
+Per-invocation overhead of getting a DynamoDB Table on warm starts:
+building boto3.resource('dynamodb') and its Table on every call (the
+previous ApiHandler code) against the commons.aws_clients registry, and
+the whole ApiHandler invocation with the DynamoDB API call stubbed out.
+
+    python -m benchmarks.warm_clients
+"""
+import os
+from unittest.mock import patch
+
+import boto3
+
+from benchmarks import best_of, load_handler
+
+TABLE_NAME = 'Events'
+REGION = 'eu-central-1'
+
+
+def run():
+    os.environ.setdefault('target_table', TABLE_NAME)
+    handler = load_handler()
+    handler._LOG.disabled = True
+    event = {'principalId': 1, 'content': {'name': 'John'}}
+
+    def per_call():
+        return boto3.resource('dynamodb', region_name=REGION).Table(TABLE_NAME)
+
+    def registry():
+        return handler.get_table(TABLE_NAME, region_name=REGION)
+
+    registry()
+    built = best_of(per_call, number=20)
+    cached = best_of(registry, number=1000)
+    print(f'resource + Table per call | {built * 1e3:8.3f} ms')
+    print(f'aws_clients.get_table     | {cached * 1e6:8.3f} us | '
+          f'{built / cached:8.0f}x')
+
+    producer = handler.ApiHandler()
+    with patch('botocore.client.BaseClient._make_api_call', return_value={}):
+        warm = best_of(lambda: producer.handle_request(event, None), number=50)
+        with patch.object(handler, 'get_table',
+                          lambda name, region_name=None: boto3.resource(
+                              'dynamodb', region_name=region_name).Table(name)):
+            before = best_of(lambda: producer.handle_request(event, None), number=20)
+    print(f'ApiHandler invocation     | {before * 1e3:8.3f} -> {warm * 1e3:.3f} ms')
+
+
+if __name__ == '__main__':
+    run()
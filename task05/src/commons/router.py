@@ -0,0 +1,168 @@
+import json
+import logging
+
+from commons import RESPONSE_BAD_REQUEST_CODE
+from commons.exception import ApplicationException
+from commons.log_helper import get_logger
+
+_LOG = get_logger('router')
+
+
+class Request:
+    """API Gateway / function URL event with lazily parsed parts."""
+
+    __slots__ = ('event', 'method', 'path', 'path_params', '_body')
+
+    _NOT_PARSED = object()
+
+    def __init__(self, event, method, path, path_params):
+        self.event = event
+        self.method = method
+        self.path = path
+        self.path_params = path_params
+        self._body = self._NOT_PARSED
+
+    @property
+    def body(self) -> dict:
+        """JSON body, parsed on first access; {} when the event has none."""
+        if self._body is self._NOT_PARSED:
+            raw = self.event.get('body')
+            try:
+                self._body = json.loads(raw) if raw else {}
+            except ValueError as e:
+                _LOG.error("Error parsing request body: %s", str(e))
+                raise ApplicationException(code=RESPONSE_BAD_REQUEST_CODE,
+                                           content='Invalid JSON input.')
+        return self._body
+
+    @property
+    def query_params(self) -> dict:
+        return self.event.get('queryStringParameters') or {}
+
+
+class Route:
+    """
+    One entry of a route table.
+    :param method: HTTP method
+    :param path: resource path, may contain parameters: /tables/{tableId}
+    :param handler: callable(target, request) invoked on match
+    :param validators: callables(request) run in order before the handler;
+        each returns a dict with attribute_name in key and error_message in
+        value (empty when valid) or raises ApplicationException. The
+        errors reach the client as one message, see validation_message
+    """
+
+    __slots__ = ('method', 'path', 'handler', 'validators', 'segments')
+
+    def __init__(self, method, path, handler, validators=()):
+        self.method = method.upper()
+        self.path = path
+        self.handler = handler
+        self.validators = tuple(validators)
+        self.segments = tuple(path.strip('/').split('/'))
+
+    @property
+    def is_templated(self) -> bool:
+        return '{' in self.path
+
+    def match_segments(self, segments):
+        """:return: path parameters if the concrete segments match, else None"""
+        params = {}
+        for expected, actual in zip(self.segments, segments):
+            if expected[:1] == '{' and expected[-1:] == '}':
+                params[expected[1:-1]] = actual
+            elif expected != actual:
+                return None
+        return params
+
+
+def validation_message(errors) -> str:
+    """
+    Client message of validator errors: "attribute: error" pairs joined
+    with "; ", so the response body stays {"message": "<string>"}.
+    """
+    if isinstance(errors, dict):
+        return '; '.join(f'{name}: {message}' for name, message in errors.items())
+    return str(errors)
+
+
+def get_method_and_path(event) -> tuple:
+    """
+    Reads the HTTP method and path from REST API (v1), HTTP API (v2) and
+    function URL events. REST events carry the resource template, so their
+    lookup never has to parse path parameters.
+    """
+    http = (event.get('requestContext') or {}).get('http') or {}
+    method = event.get('httpMethod') or http.get('method')
+    path = event.get('resource') or event.get('rawPath') or \
+        http.get('path') or event.get('path')
+    return method, path
+
+
+class Router:
+    """
+    Table-driven dispatcher. Routes are compiled once into a dict keyed by
+    (method, path template); concrete paths with parameters fall back to
+    the templated routes with the same number of segments.
+    """
+
+    def __init__(self, routes=()):
+        self._routes = {}
+        self._templated = {}
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: Route):
+        self._routes[(route.method, route.path)] = route
+        if route.is_templated:
+            key = (route.method, len(route.segments))
+            self._templated.setdefault(key, []).append(route)
+
+    def route(self, method, path, validators=()):
+        """Decorator registering a function as a route handler."""
+        def decorator(handler):
+            self.add(Route(method, path, handler, validators))
+            return handler
+        return decorator
+
+    def resolve(self, method, path) -> tuple:
+        """:return: (route, path_params) or (None, None)"""
+        if method is None or path is None:
+            return None, None
+        route = self._routes.get((method.upper(), path))
+        if route is not None:
+            return route, None
+        segments = path.strip('/').split('/')
+        for route in self._templated.get((method.upper(), len(segments)), ()):
+            params = route.match_segments(segments)
+            if params is not None:
+                return route, params
+        return None, None
+
+    def dispatch(self, event, target=None):
+        """
+        Finds the route for the event, runs its validators and calls its
+        handler with (target, request).
+        :raises ApplicationException: 400 for unknown routes, invalid
+            requests and unparsable bodies
+        """
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("Lambda event: %s", json.dumps(event, default=str))
+        method, path = get_method_and_path(event)
+        route, path_params = self.resolve(method, path)
+        if route is None:
+            _LOG.warning("No matching route found for path: %s, method: %s",
+                         path, method)
+            raise ApplicationException(
+                code=RESPONSE_BAD_REQUEST_CODE,
+                content=f"Unsupported path {path} or method {method}")
+        if path_params is None:
+            path_params = event.get('pathParameters') or {}
+        request = Request(event, method, path, path_params)
+        for validator in route.validators:
+            errors = validator(request)
+            if errors:
+                raise ApplicationException(code=RESPONSE_BAD_REQUEST_CODE,
+                                           content=validation_message(errors))
+        _LOG.info("Received request. Path: %s, Method: %s", path, method)
+        return route.handler(target, request)
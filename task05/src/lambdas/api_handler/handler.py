@@ -3,10 +3,9 @@ import os
 import uuid
 from datetime import datetime
 
-import boto3
-
 from commons.abstract_lambda import AbstractLambda
-from commons.log_helper import get_logger
+from commons.aws_clients import get_table
+from commons.log_helper import get_logger, lazy
 
 _LOG = get_logger('ApiHandler-handler')
 
@@ -20,7 +19,7 @@ class ApiHandler(AbstractLambda):
         pass
 
     def handle_request(self, event, context):
-        _LOG.info(msg=f'event:{event}, context:{context}')
+        _LOG.info('event:%s, context:%s', lazy(event), context)
         
         # Extract needed fields from event
         principal_id = event.get("principalId")
@@ -34,11 +33,10 @@ class ApiHandler(AbstractLambda):
             "body": body_content
         }
 
-        dynamodb = boto3.resource('dynamodb', region_name=os.environ.get('region', 'eu-central-1'))
         table_name = os.environ.get('target_table')
-        _LOG.info(msg=f"trying to get table: {table_name}")
+        _LOG.info("trying to get table: %s", table_name)
 
-        table = dynamodb.Table(table_name)
+        table = get_table(table_name, region_name=os.environ.get('region', 'eu-central-1'))
         table.put_item(Item=obj)
 
         return {
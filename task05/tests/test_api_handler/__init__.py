@@ -5,6 +5,7 @@ from tests import ImportFromSourceContext
 
 with ImportFromSourceContext():
     LAMBDA_HANDLER = importlib.import_module('lambdas.api_handler.handler')
+    aws_clients = importlib.import_module('commons.aws_clients')
 
 
 class ApiHandlerLambdaTestCase(unittest.TestCase):
@@ -12,4 +13,6 @@ class ApiHandlerLambdaTestCase(unittest.TestCase):
 
     def setUp(self) -> None:
         self.HANDLER = LAMBDA_HANDLER.ApiHandler()
-
+        # Handlers memoize boto3 resources, which tests replace with mocks
+        aws_clients.clear()
+        self.addCleanup(aws_clients.clear)
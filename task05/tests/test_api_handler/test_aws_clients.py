@@ -0,0 +1,53 @@
+import threading
+from unittest.mock import patch
+
+from tests.test_api_handler import ApiHandlerLambdaTestCase, aws_clients
+
+
+class TestAwsClients(ApiHandlerLambdaTestCase):
+
+    def test_client_is_built_once(self):
+        with patch('boto3.client') as client:
+            first = aws_clients.get_client('s3', region_name='eu-central-1')
+            second = aws_clients.get_client('s3', region_name='eu-central-1')
+        self.assertIs(first, second)
+        client.assert_called_once()
+        config = client.call_args.kwargs['config']
+        self.assertEqual(config.max_pool_connections,
+                         aws_clients.MAX_POOL_CONNECTIONS)
+        self.assertTrue(config.tcp_keepalive)
+
+    def test_keyed_by_region_and_config(self):
+        with patch('boto3.client', side_effect=lambda *a, **kw: object()):
+            base = aws_clients.get_client('s3', region_name='eu-central-1')
+            self.assertIsNot(base, aws_clients.get_client('s3', region_name='eu-west-1'))
+            tuned = aws_clients.get_client('s3', region_name='eu-central-1',
+                                           max_pool_connections=4)
+            self.assertIsNot(base, tuned)
+            self.assertIs(tuned, aws_clients.get_client(
+                's3', region_name='eu-central-1', max_pool_connections=4))
+
+    def test_table_is_memoized(self):
+        with patch('boto3.resource') as resource:
+            table = aws_clients.get_table('Events', region_name='eu-central-1')
+            self.assertIs(table, aws_clients.get_table('Events', region_name='eu-central-1'))
+        resource.assert_called_once()
+        resource.return_value.Table.assert_called_once_with('Events')
+
+    def test_per_thread_resources(self):
+        tables = []
+
+        def worker():
+            tables.append(aws_clients.get_table('Events', region_name='eu-central-1',
+                                                per_thread=True))
+            tables.append(aws_clients.get_table('Events', region_name='eu-central-1',
+                                                per_thread=True))
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertIs(tables[0], tables[1])
+        self.assertIs(tables[2], tables[3])
+        self.assertIsNot(tables[0], tables[2])
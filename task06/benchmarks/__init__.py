@@ -0,0 +1,50 @@
+"""
+Benchmarks for the task06 lambdas. Run them from the project root, e.g.:
+    python -m benchmarks.logging_overhead
+"""
+import importlib
+import os
+import time
+
+from tests import ImportFromSourceContext
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
+
+def load_handler(name='audit_producer'):
+    """Import a lambda handler module the same way the tests do."""
+    with ImportFromSourceContext():
+        return importlib.import_module(f'lambdas.{name}.handler')
+
+
+def best_of(func, repeat=5, number=1):
+    """Return the best per-call wall time (seconds) of func over repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def stream_record(index, attributes=50, event_name='MODIFY'):
+    """DynamoDB stream record of a configuration item with wide images."""
+    new_image = {'key': {'S': f'key-{index}'}}
+    old_image = {'key': {'S': f'key-{index}'}}
+    for a in range(attributes):
+        new_image[f'attr{a}'] = {'M': {'value': {'N': str(a)},
+                                       'tags': {'L': [{'S': 'x' * 20}] * 5}}}
+        old_image[f'attr{a}'] = new_image[f'attr{a}']
+    new_image['value'] = {'N': str(index + 1)}
+    old_image['value'] = {'N': str(index)}
+    dynamodb = {
+        'Keys': {'key': {'S': f'key-{index}'}},
+        'NewImage': new_image,
+        'SequenceNumber': str(1500000000000000000000 + index),
+        'StreamViewType': 'NEW_AND_OLD_IMAGES',
+    }
+    if event_name == 'MODIFY':
+        dynamodb['OldImage'] = old_image
+    return {'eventID': str(index), 'eventName': event_name,
+            'eventSource': 'aws:dynamodb', 'dynamodb': dynamodb}
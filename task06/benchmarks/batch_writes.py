@@ -0,0 +1,55 @@
+"""
+Per-batch latency of AuditProducer against the local DynamoDB stand-in:
+one put_item per audit item (the previous write path) against batched
+BatchWriteItem calls, with and without throttling.
+
+    python -m benchmarks.batch_writes [latency_ms]
+"""
+import logging
+import sys
+from unittest.mock import patch
+
+from benchmarks import best_of, load_handler, stream_record
+from benchmarks.local_dynamodb import LocalDynamoDB
+
+
+def put_one_by_one(dynamodb, table_name, items, **kwargs):
+    table = dynamodb.Table(table_name)
+    for item in items:
+        table.put_item(Item=item)
+    return []
+
+
+def run(latency_ms=5.0, records=10, changed_attributes=5):
+    handler = load_handler()
+    handler._LOG.disabled = True
+    logging.getLogger('commons.log_helper.batch-writer').disabled = True
+    producer = handler.AuditProducer()
+    event = {'Records': [stream_record(i, attributes=changed_attributes)
+                         for i in range(records)]}
+    # Every attribute of the benchmark images differs between old and new
+    for record in event['Records']:
+        for name, value in record['dynamodb']['OldImage'].items():
+            if name != 'key':
+                record['dynamodb']['OldImage'][name] = {'S': 'old'}
+
+    scenarios = (
+        ('put_item per audit item', put_one_by_one, 0.0),
+        ('batch_write_item', handler.batch_write_items, 0.0),
+        ('batch_write_item, 10% throttled', handler.batch_write_items, 0.1),
+    )
+    for name, writer, throttle_rate in scenarios:
+        dynamodb = LocalDynamoDB(latency=latency_ms / 1000,
+                                 throttle_rate=throttle_rate, seed=1)
+        with patch.object(handler, 'dynamodb', dynamodb), \
+                patch.object(handler, 'batch_write_items', writer):
+            producer.handle_request(event, None)
+            requests = dynamodb.requests
+            audit_items = sum(len(items) for items in dynamodb.items.values())
+            elapsed = best_of(lambda: producer.handle_request(event, None),
+                              repeat=3)
+        print(f'{name:<34} | {elapsed * 1e3:8.1f} ms per batch | '
+              f'{requests:3d} requests for {audit_items} audit items')
+
+if __name__ == '__main__':
+    run(*[float(a) for a in sys.argv[1:]])
@@ -0,0 +1,83 @@
+"""
+Decoding speed of stream images on deeply nested and on wide images:
+the former recursive dynamodb_json_to_dict of the AuditProducer, which
+skips BOOL/NULL/B/sets and leaves list elements typed, against
+commons.dynamodb_json.loads. The two run in alternating rounds, so load
+on the machine affects both alike, and the best round counts.
+
+    python -m benchmarks.dynamodb_json
+"""
+from benchmarks import best_of, load_handler
+
+
+def recursive_dynamodb_json_to_dict(dynamodb_json):
+    """The helper AuditProducer used before, kept as the baseline."""
+    if isinstance(dynamodb_json, dict):
+        result = {}
+        for key, value in dynamodb_json.items():
+            if isinstance(value, dict):
+                if "S" in value:  # String
+                    result[key] = value["S"]
+                elif "N" in value:  # Number
+                    result[key] = int(value["N"]) if "." not in value["N"] else float(value["N"])
+                elif "M" in value:  # Map
+                    result[key] = recursive_dynamodb_json_to_dict(value["M"])
+                elif "L" in value:  # List
+                    result[key] = [recursive_dynamodb_json_to_dict(item) for item in value["L"]]
+            else:
+                result[key] = value
+        return result
+    elif isinstance(dynamodb_json, list):
+        return [recursive_dynamodb_json_to_dict(item) for item in dynamodb_json]
+    else:
+        return dynamodb_json
+
+
+def nested_image(depth=200, width=5):
+    """Chain of maps `depth` levels deep, each with a few scalars."""
+    inner = {'leaf': {'S': 'end'}}
+    for level in range(depth):
+        inner = {f'name{i}': {'S': f'value-{level}-{i}'} for i in range(width)} | {
+            'count': {'N': str(level)},
+            'child': {'M': inner},
+        }
+    return inner
+
+
+def wide_image(attributes=400):
+    """Flat image of string, number and small map/list attributes."""
+    image = {}
+    for a in range(attributes):
+        kind = a % 4
+        if kind == 0:
+            image[f'attr{a}'] = {'S': 'x' * 20}
+        elif kind == 1:
+            image[f'attr{a}'] = {'N': str(a)}
+        elif kind == 2:
+            image[f'attr{a}'] = {'M': {'value': {'N': str(a)}, 'unit': {'S': 'ms'}}}
+        else:
+            image[f'attr{a}'] = {'L': [{'S': 'tag'}, {'N': '1'}, {'S': 'other'}]}
+    return image
+
+
+def run(rounds=30, number=50):
+    loads = load_handler().dynamodb_json_to_dict
+    images = (
+        ('nested, depth 200', nested_image()),
+        ('wide, 400 attributes', wide_image()),
+    )
+    # Without lists the former helper decodes the same values
+    nested = images[0][1]
+    assert loads(nested) == recursive_dynamodb_json_to_dict(nested)
+    for name, image in images:
+        former = after = float('inf')
+        for _ in range(rounds):
+            former = min(former, best_of(lambda: recursive_dynamodb_json_to_dict(image),
+                                         repeat=1, number=number))
+            after = min(after, best_of(lambda: loads(image), repeat=1, number=number))
+        print(f'{name:<22} | former {former * 1e6:7.1f} us | '
+              f'loads {after * 1e6:7.1f} us | {former / after:4.1f}x')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,54 @@
+"""
+In-process stand-in for the boto3 DynamoDB resource calls made by the
+task06 lambdas: Table(...).put_item and batch_write_item. Every request is
+charged a fixed ``latency`` to model the network round-trip, and
+``throttle_rate`` leaves that share of each batch in UnprocessedItems.
+"""
+import random
+import threading
+import time
+
+
+class LocalTable:
+
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+
+    def put_item(self, Item, **kwargs):
+        self.db.charge()
+        self.db.items.setdefault(self.name, []).append(Item)
+        return {}
+
+
+class LocalDynamoDB:
+
+    def __init__(self, latency=0.0, throttle_rate=0.0, seed=None):
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.requests = 0
+        self.items = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def charge(self):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def Table(self, name):
+        return LocalTable(self, name)
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        if sum(len(r) for r in RequestItems.values()) > 25:
+            raise ValueError('Too many items requested for the BatchWriteItem call')
+        self.charge()
+        unprocessed = {}
+        for name, requests in RequestItems.items():
+            for request in requests:
+                if self._random.random() < self.throttle_rate:
+                    unprocessed.setdefault(name, []).append(request)
+                else:
+                    self.items.setdefault(name, []).append(request['PutRequest']['Item'])
+        return {'UnprocessedItems': unprocessed}
@@ -0,0 +1,37 @@
+"""
+AuditProducer.handle_request latency for a batch of wide stream records
+with log_level at INFO and at DEBUG. Payloads are only rendered at DEBUG;
+the last line shows what eagerly formatting them costs per batch.
+
+    python -m benchmarks.logging_overhead
+"""
+import io
+import logging
+
+from benchmarks import best_of, load_handler, stream_record
+from benchmarks.local_dynamodb import LocalDynamoDB
+
+
+def run(records=10):
+    handler = load_handler()
+    from commons import log_helper
+
+    log_helper.console_handler.setStream(io.StringIO())
+    handler.dynamodb = LocalDynamoDB()
+    event = {'Records': [stream_record(i) for i in range(records)]}
+    producer = handler.AuditProducer()
+    logger = logging.getLogger('commons.log_helper.AuditProducer-handler')
+
+    for level in (logging.INFO, logging.DEBUG):
+        logger.setLevel(level)
+        elapsed = best_of(lambda: producer.handle_request(event, None), number=20)
+        print(f'{logging.getLevelName(level):<5} | {elapsed * 1e3:7.3f} ms per '
+              f'{records}-record batch')
+
+    eager = best_of(lambda: [f'{r["dynamodb"]}' for r in event['Records']],
+                    number=20)
+    print(f'eager f-string formatting of the records: {eager * 1e3:7.3f} ms')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,59 @@
+"""
+MODIFY processing of wide configuration items where one attribute
+changed: decoding both images and comparing every attribute (the
+previous approach) against commons.dynamodb_json.diff_images, both on
+its own and as AuditProducer batch throughput.
+
+    python -m benchmarks.stream_diff [attributes] [records]
+"""
+import logging
+import sys
+from unittest.mock import patch
+
+from benchmarks import best_of, load_handler, stream_record
+
+
+def decode_and_compare(new_image, old_image, loads):
+    new_image, old_image = loads(new_image), loads(old_image)
+    return [(name, old_image.get(name), value)
+            for name, value in new_image.items() if old_image.get(name) != value]
+
+
+def run(attributes=200, records=100):
+    handler = load_handler()
+    handler._LOG.disabled = True
+    loads = handler.dynamodb_json_to_dict
+    event = {'Records': [stream_record(i, attributes=attributes)
+                         for i in range(records)]}
+    images = [(r['dynamodb']['NewImage'], r['dynamodb']['OldImage'])
+              for r in event['Records']]
+
+    def full():
+        for new_image, old_image in images:
+            decode_and_compare(new_image, old_image, loads)
+
+    def lazy():
+        for new_image, old_image in images:
+            handler.diff_images(new_image, old_image)
+
+    assert all(decode_and_compare(n, o, loads) == handler.diff_images(n, o)
+               for n, o in images)
+    full_time, lazy_time = best_of(full), best_of(lazy)
+    print(f'{records} records x {attributes} attributes, 1 changed')
+    print(f'decode both images | {full_time * 1e3:8.2f} ms per batch')
+    print(f'diff_images        | {lazy_time * 1e3:8.2f} ms per batch | '
+          f'{full_time / lazy_time:5.1f}x')
+
+    producer = handler.AuditProducer()
+    logging.getLogger('commons.log_helper.batch-writer').disabled = True
+    with patch.object(handler, 'batch_write_items', lambda *args: []):
+        batch_time = best_of(lambda: producer.handle_request(event, None))
+        with patch.object(handler, 'diff_images',
+                          lambda n, o: decode_and_compare(n, o, loads)):
+            before = best_of(lambda: producer.handle_request(event, None))
+    print(f'AuditProducer      | {records / before:8.0f} -> '
+          f'{records / batch_time:.0f} records/s')
+
+
+if __name__ == '__main__':
+    run(*[int(a) for a in sys.argv[1:]])
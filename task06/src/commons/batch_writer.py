@@ -0,0 +1,59 @@
+import random
+import time
+
+from commons.log_helper import get_logger
+
+_LOG = get_logger('batch-writer')
+
+MAX_BATCH_SIZE = 25
+DEFAULT_MAX_RETRIES = 8
+DEFAULT_BASE_DELAY_SEC = 0.05
+DEFAULT_MAX_DELAY_SEC = 2.0
+
+
+def backoff_delay(attempt, base_delay=DEFAULT_BASE_DELAY_SEC,
+                  max_delay=DEFAULT_MAX_DELAY_SEC) -> float:
+    """Exponential backoff with full jitter for the given retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def batch_write_items(dynamodb, table_name, items,
+                      max_retries=DEFAULT_MAX_RETRIES,
+                      base_delay=DEFAULT_BASE_DELAY_SEC,
+                      max_delay=DEFAULT_MAX_DELAY_SEC,
+                      sleep=time.sleep) -> list:
+    """
+    Writes items with BatchWriteItem in chunks of 25, retrying
+    UnprocessedItems with exponential backoff.
+    :param dynamodb: boto3 DynamoDB resource (or the client of one, so
+        items are serialized from plain Python types)
+    :param table_name: target table
+    :param items: items to put
+    :param max_retries: retries per chunk before giving up on its leftovers
+    :param base_delay: first backoff ceiling in seconds
+    :param max_delay: largest backoff ceiling in seconds
+    :param sleep: sleep function, replaceable in tests
+    :return: items that are still unprocessed after all retries
+    """
+    failed = []
+    for start in range(0, len(items), MAX_BATCH_SIZE):
+        requests = [{'PutRequest': {'Item': item}}
+                    for item in items[start:start + MAX_BATCH_SIZE]]
+        attempt = 0
+        while requests:
+            response = dynamodb.batch_write_item(
+                RequestItems={table_name: requests})
+            requests = (response.get('UnprocessedItems') or {}).get(table_name, [])
+            if not requests:
+                break
+            if attempt >= max_retries:
+                _LOG.error("Giving up on %d unprocessed items for %s after "
+                           "%d retries.", len(requests), table_name, attempt)
+                failed.extend(r['PutRequest']['Item'] for r in requests)
+                break
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            _LOG.warning("%d unprocessed items for %s, retry %d in %.3fs.",
+                         len(requests), table_name, attempt + 1, delay)
+            sleep(delay)
+            attempt += 1
+    return failed
@@ -0,0 +1,160 @@
+"""
+Decoding of DynamoDB JSON (stream images, low-level client responses)
+into plain Python values.
+
+Numbers become int when they are integral and Decimal otherwise, so a
+decoded item can be written back through a boto3 resource unchanged.
+Binary values arrive base64 encoded in stream events and become bytes.
+"""
+import base64
+from decimal import Decimal
+
+
+def _number(raw):
+    try:
+        return int(raw)
+    except ValueError:
+        # Fractions and exponents ("1.5", "1E+3")
+        value = Decimal(raw)
+        if value == value.to_integral_value():
+            return int(value)
+        return value
+
+
+def _binary(raw):
+    if isinstance(raw, str):
+        return base64.b64decode(raw)
+    return bytes(raw)
+
+
+def _null(raw):
+    return None
+
+
+# Decoders of the remaining type tags, looked up by tag. S, N, M and L
+# are matched first in the decoder loop as they make up most images.
+SCALAR_DECODERS = {
+    'BOOL': bool,
+    'NULL': _null,
+    'B': _binary,
+    'SS': set,
+    'NS': lambda raw: {_number(n) for n in raw},
+    'BS': lambda raw: {_binary(b) for b in raw},
+}
+
+
+def loads(image):
+    """
+    Converts a DynamoDB JSON image into a standard Python dict.
+    Nested maps and lists are decoded with an explicit stack, so the
+    nesting depth is not limited by the recursion limit.
+    :param image: attribute name to typed value mapping, e.g. a stream
+        record NewImage; a list of such images is decoded element-wise
+    :return: decoded dict (or list of dicts)
+    :raises ValueError: on an unknown type tag
+    """
+    if isinstance(image, list):
+        return [loads(item) for item in image]
+    if not isinstance(image, dict):
+        return image
+
+    scalars = SCALAR_DECODERS
+    result = {}
+    # (typed map or list, target) work items; targets are already linked
+    # into their parents and are filled in place
+    stack = [(image, result)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        typed, target = pop()
+        entries = typed.items() if type(target) is dict else enumerate(typed)
+        mark = len(stack)
+        try:
+            # Every value is taken to be typed: the plain values the former
+            # helper allowed raise here and send the level to _loads_checked
+            for key, value in entries:
+                if 'S' in value:
+                    target[key] = value['S']
+                elif 'N' in value:
+                    raw = value['N']
+                    try:
+                        target[key] = int(raw)
+                    except ValueError:
+                        target[key] = _number(raw)
+                elif 'M' in value:
+                    target[key] = decoded = {}
+                    push((value['M'], decoded))
+                elif 'L' in value:
+                    raw = value['L']
+                    target[key] = decoded = [None] * len(raw)
+                    push((raw, decoded))
+                else:
+                    (tag, raw), = value.items()
+                    decoder = scalars.get(tag)
+                    if decoder is None:
+                        raise ValueError(f'Unsupported DynamoDB type tag: {tag!r}')
+                    target[key] = decoder(raw)
+        except (TypeError, AttributeError):
+            del stack[mark:]
+            _loads_checked(typed, target, push)
+    return result
+
+
+def _loads_checked(typed, target, push):
+    """One level of loads that keeps values which are not typed as they are."""
+    entries = typed.items() if type(target) is dict else enumerate(typed)
+    for key, value in entries:
+        if type(value) is not dict:
+            target[key] = value
+        elif 'S' in value:
+            target[key] = value['S']
+        elif 'N' in value:
+            target[key] = _number(value['N'])
+        elif 'M' in value:
+            target[key] = decoded = {}
+            push((value['M'], decoded))
+        elif 'L' in value:
+            raw = value['L']
+            target[key] = decoded = [None] * len(raw)
+            push((raw, decoded))
+        else:
+            (tag, raw), = value.items()
+            decoder = SCALAR_DECODERS.get(tag)
+            if decoder is None:
+                raise ValueError(f'Unsupported DynamoDB type tag: {tag!r}')
+            target[key] = decoder(raw)
+
+
+def loads_value(value):
+    """
+    Decodes a single typed value such as {"N": "42"}.
+    :param value: typed value
+    :return: decoded value
+    """
+    return loads({'value': value})['value']
+
+
+def diff_images(new_image, old_image):
+    """
+    Changed, added and removed attributes between two DynamoDB JSON
+    images. Typed values are compared as they are, and only the
+    attributes that differ get decoded; values that are equal once
+    decoded (e.g. string sets listed in another order) are not changes.
+    :param new_image: typed image after the change
+    :param old_image: typed image before the change
+    :return: (attribute, old value, new value) tuples, with None for the
+        missing side, in new image order followed by removed attributes
+    """
+    changes = []
+    get_old = old_image.get
+    for name, new_value in new_image.items():
+        old_value = get_old(name)
+        if new_value != old_value:
+            old_decoded = None if old_value is None else loads_value(old_value)
+            new_decoded = loads_value(new_value)
+            if old_value is None or old_decoded != new_decoded:
+                changes.append((name, old_decoded, new_decoded))
+    removed = old_image.keys() - new_image.keys()
+    if removed:
+        changes.extend((name, loads_value(old_value), None)
+                       for name, old_value in old_image.items() if name in removed)
+    return changes
@@ -0,0 +1,243 @@
+"""
+Typed views of the events lambdas receive from SQS, SNS, DynamoDB
+Streams and API Gateway.
+
+Records are thin __slots__ objects over the original event dicts:
+nothing is copied, and payloads (JSON bodies, base64 request bodies)
+are decoded only when first accessed, then cached. Handlers iterate
+parse_records(event) instead of probing the event shape themselves.
+"""
+import base64
+import json
+
+_UNSET = object()
+
+
+class EventRecord:
+    """Base of the record views; `raw` is the original record dict."""
+
+    __slots__ = ('raw',)
+    source = None
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.raw!r})'
+
+
+class SqsRecord(EventRecord):
+    __slots__ = ('_json',)
+    source = 'aws:sqs'
+
+    def __init__(self, raw):
+        super().__init__(raw)
+        self._json = _UNSET
+
+    @property
+    def message_id(self):
+        return self.raw.get('messageId')
+
+    @property
+    def body(self):
+        return self.raw.get('body')
+
+    @property
+    def json(self):
+        """The body parsed as JSON, on first access."""
+        if self._json is _UNSET:
+            self._json = json.loads(self.body)
+        return self._json
+
+    @property
+    def attributes(self) -> dict:
+        return self.raw.get('attributes') or {}
+
+    @property
+    def message_attributes(self) -> dict:
+        return self.raw.get('messageAttributes') or {}
+
+    @property
+    def message_group_id(self):
+        """Set for records of FIFO queues."""
+        return self.attributes.get('MessageGroupId')
+
+
+class SnsRecord(EventRecord):
+    __slots__ = ('_json',)
+    source = 'aws:sns'
+
+    def __init__(self, raw):
+        super().__init__(raw)
+        self._json = _UNSET
+
+    @property
+    def sns(self) -> dict:
+        """:raises KeyError: for a record without the Sns notification"""
+        return self.raw['Sns']
+
+    @property
+    def message_id(self):
+        return self.sns.get('MessageId')
+
+    @property
+    def message(self):
+        """:raises KeyError: for a notification without a Message"""
+        return self.sns['Message']
+
+    @property
+    def json(self):
+        """The message parsed as JSON, on first access."""
+        if self._json is _UNSET:
+            self._json = json.loads(self.message)
+        return self._json
+
+    @property
+    def subject(self):
+        return self.sns.get('Subject')
+
+    @property
+    def topic_arn(self):
+        return self.sns.get('TopicArn')
+
+    @property
+    def message_attributes(self) -> dict:
+        return self.sns.get('MessageAttributes') or {}
+
+
+class DynamoDBStreamRecord(EventRecord):
+    """
+    Images stay in DynamoDB JSON: decoding them (or only the attributes
+    that changed) is up to the handler.
+    """
+
+    __slots__ = ()
+    source = 'aws:dynamodb'
+
+    @property
+    def event_name(self):
+        """INSERT, MODIFY or REMOVE."""
+        return self.raw.get('eventName')
+
+    @property
+    def event_id(self):
+        """Unique id of the stream record, the same when it is replayed."""
+        return self.raw.get('eventID')
+
+    @property
+    def dynamodb(self) -> dict:
+        return self.raw.get('dynamodb') or {}
+
+    @property
+    def sequence_number(self):
+        return self.dynamodb.get('SequenceNumber')
+
+    @property
+    def keys(self) -> dict:
+        return self.dynamodb.get('Keys') or {}
+
+    @property
+    def new_image(self) -> dict:
+        return self.dynamodb.get('NewImage') or {}
+
+    @property
+    def old_image(self) -> dict:
+        return self.dynamodb.get('OldImage') or {}
+
+
+class ApiGatewayRequest(EventRecord):
+    """
+    Request of an API Gateway REST API (payload 1.0) or HTTP API
+    (payload 2.0) proxy integration.
+    """
+
+    __slots__ = ('_body', '_json')
+    source = 'aws:apigateway'
+
+    def __init__(self, raw):
+        super().__init__(raw)
+        self._body = _UNSET
+        self._json = _UNSET
+
+    @property
+    def _http(self) -> dict:
+        return (self.raw.get('requestContext') or {}).get('http') or {}
+
+    @property
+    def method(self):
+        return self.raw.get('httpMethod') or self._http.get('method')
+
+    @property
+    def path(self):
+        return self.raw.get('rawPath') or self._http.get('path') or self.raw.get('path')
+
+    @property
+    def headers(self) -> dict:
+        return self.raw.get('headers') or {}
+
+    @property
+    def query(self) -> dict:
+        return self.raw.get('queryStringParameters') or {}
+
+    @property
+    def path_parameters(self) -> dict:
+        return self.raw.get('pathParameters') or {}
+
+    @property
+    def body(self):
+        """The body as str, base64 decoded on first access when encoded."""
+        if self._body is _UNSET:
+            body = self.raw.get('body')
+            if body is not None and self.raw.get('isBase64Encoded'):
+                body = base64.b64decode(body).decode()
+            self._body = body
+        return self._body
+
+    @property
+    def json(self):
+        """The body parsed as JSON on first access, None without a body."""
+        if self._json is _UNSET:
+            self._json = json.loads(self.body) if self.body else None
+        return self._json
+
+
+RECORD_TYPES = {record_type.source: record_type
+                for record_type in (SqsRecord, SnsRecord, DynamoDBStreamRecord)}
+# Keys telling the record type apart when eventSource is missing
+_RECORD_KEYS = (('Sns', SnsRecord), ('dynamodb', DynamoDBStreamRecord),
+                ('body', SqsRecord), ('messageId', SqsRecord))
+
+
+def record_type(record):
+    """
+    EventRecord subclass of a raw record.
+    :raises ValueError: for records of an unknown source
+    """
+    source = record.get('eventSource') or record.get('EventSource')
+    if source in RECORD_TYPES:
+        return RECORD_TYPES[source]
+    for key, matching_type in _RECORD_KEYS:
+        if key in record:
+            return matching_type
+    raise ValueError(f'Unknown event source of record: {source!r}')
+
+
+def is_api_gateway_event(event) -> bool:
+    return 'httpMethod' in event or 'http' in (event.get('requestContext') or {})
+
+
+def parse_records(event):
+    """
+    Iterator of record views of an event: one per record of an SQS, SNS
+    or DynamoDB Streams event (all records of an event come from the
+    same source), or a single ApiGatewayRequest.
+    :raises ValueError: for events of an unknown source
+    """
+    if 'Records' not in event:
+        if is_api_gateway_event(event):
+            return iter((ApiGatewayRequest(event),))
+        raise ValueError('Event has neither Records nor an API Gateway request')
+    records = event['Records']
+    if not records:
+        return iter(())
+    return map(record_type(records[0]), records)
@@ -0,0 +1,104 @@
+"""
+Deferred imports and objects for shorter cold starts.
+
+Heavy modules (boto3, botocore, the X-Ray SDK) and the clients built on
+them cost hundreds of milliseconds at import time. Handlers bind them
+through these placeholders at module level, and only the invocations
+that actually touch them pay for loading.
+"""
+import importlib
+import sys
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+    Attributes are looked up on the real module every time, so patches
+    applied to it (e.g. in tests) are honoured.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] else 'not loaded'
+        return f'<lazy module {self.__name__!r} ({state})>'
+
+
+def lazy_import(name):
+    """
+    Module `name`, imported on first use.
+    :param name: dotted module name, e.g. 'boto3.dynamodb.conditions'
+    :return: the module itself if it is already imported, a LazyModule
+        otherwise
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+class LazyObject:
+    """
+    Proxy building its target with `factory` on first attribute access,
+    e.g. a boto3 client that most invocations never use.
+    """
+    __slots__ = ('_factory', '_target', '_lock')
+
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_target', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _resolve(self):
+        target = object.__getattribute__(self, '_target')
+        if target is None:
+            with object.__getattribute__(self, '_lock'):
+                target = object.__getattribute__(self, '_target')
+                if target is None:
+                    target = object.__getattribute__(self, '_factory')()
+                    object.__setattr__(self, '_target', target)
+        return target
+
+    @property
+    def is_resolved(self) -> bool:
+        return object.__getattribute__(self, '_target') is not None
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self):
+        if self.is_resolved:
+            return repr(self._resolve())
+        return '<lazy object (not built)>'
+
+
+def lazy_object(factory):
+    """
+    :param factory: zero-argument callable building the object
+    :return: LazyObject proxy for it
+    """
+    return LazyObject(factory)
@@ -1,15 +1,35 @@
 import os
 import uuid
 from datetime import datetime
-import boto3
-
-from commons.log_helper import get_logger
+from commons.log_helper import get_logger, lazy, structured
 from commons.abstract_lambda import AbstractLambda
+from commons.aws_clients import get_resource
+from commons.batch_writer import batch_write_items
+from commons.dynamodb_json import diff_images, loads as dynamodb_json_to_dict
+from commons.lazy_import import lazy_object
 
 _LOG = get_logger('AuditProducer-handler')
 
-dynamodb = boto3.resource('dynamodb')
+dynamodb = lazy_object(lambda: get_resource('dynamodb'))
 AUDIT_TABLE_NAME = os.environ.get('target_table', 'Audit')
+# Namespace of the audit item ids derived from the stream records
+AUDIT_ID_NAMESPACE = uuid.UUID('5c1b8f52-0f9e-4d8a-9a46-3e0c7d2b6a91')
+
+
+def audit_id(record, attribute=None) -> str:
+    """
+    Audit item id derived from the stream record (and the changed
+    attribute), so a replayed record overwrites its audit items instead
+    of adding copies. Records without eventID fall back to their
+    SequenceNumber.
+    :param record: commons.event_sources.DynamoDBStreamRecord
+    :param attribute: updated attribute of a MODIFY audit item
+    """
+    source = record.event_id or record.sequence_number
+    if source is None:
+        return str(uuid.uuid4())
+    name = source if attribute is None else f'{source}/{attribute}'
+    return str(uuid.uuid5(AUDIT_ID_NAMESPACE, name))
 
 
 class AuditProducer(AbstractLambda):
@@ -20,35 +40,43 @@ class AuditProducer(AbstractLambda):
     def handle_request(self, event, context):
         """
         Processes DynamoDB stream events to log changes into an 'Audit' table.
+        Returns the partial batch response of ReportBatchItemFailures: the
+        SequenceNumber of every record that has to be retried.
         """
-        audit_table = dynamodb.Table(AUDIT_TABLE_NAME)
-        _LOG.info(f"Starting handling: event: {event}, context: {context}")
         records = event.get('Records', [])
+        _LOG.info("Starting handling of %d records.", len(records))
+        _LOG.debug("Starting handling: event: %s, context: %s", lazy(event), context)
         if not records:
             _LOG.debug("No records to process.")
-            return 200
-        
-        for record in records:
+            return batch_item_failures([])
+
+        # Audit items of the whole batch, flushed with BatchWriteItem at the end
+        audit_items = []
+        # SequenceNumber of the record each audit item comes from
+        item_sequence_numbers = {}
+        failed = []
+        for record in self.records(event):
+            sequence_number = record.sequence_number
             try:
-                event_name = record.get('eventName')
-                dynamodb_data = record.get('dynamodb', {})
-                _LOG.info(f"Processing event: {event_name}, DynamoDB data: {dynamodb_data}")
+                event_name = record.event_name
+                _LOG.debug(structured("Processing event", event_name=event_name,
+                                      dynamodb_data=record.dynamodb))
                 
                 # Convert the key
-                keys = dynamodb_json_to_dict(dynamodb_data.get('Keys', {}))
+                keys = dynamodb_json_to_dict(record.keys)
                 item_key = keys.get('key')  # Configuration item key
                 if not item_key:
-                    _LOG.error(f"Missing 'key' attribute in record keys: {keys}")
+                    _LOG.error("Missing 'key' attribute in record keys: %s", lazy(keys))
                     continue
 
                 current_time = datetime.now().isoformat()
 
                 # Handle INSERT event
                 if event_name == 'INSERT':
-                    new_image = dynamodb_json_to_dict(dynamodb_data.get('NewImage', {}))
-                    _LOG.info(f"NewImage: {new_image}")
+                    new_image = dynamodb_json_to_dict(record.new_image)
+                    _LOG.debug("NewImage: %s", lazy(new_image))
                     audit_item = {
-                        "id": str(uuid.uuid4()),
+                        "id": audit_id(record),
                         "itemKey": item_key,
                         "modificationTime": current_time,
                         "newValue": {
@@ -56,67 +84,68 @@ class AuditProducer(AbstractLambda):
                             "value": new_image.get('value')
                         }
                     }
-                    audit_table.put_item(Item=audit_item)
-                    _LOG.info(f"INSERT event processed for key={item_key}, audit_item={audit_item}")
+                    audit_items.append(audit_item)
+                    item_sequence_numbers[audit_item['id']] = sequence_number
+                    _LOG.info(structured("INSERT event processed", key=item_key,
+                                         audit_item=audit_item))
 
                 # Handle MODIFY event
                 elif event_name == 'MODIFY':
-                    new_image = dynamodb_json_to_dict(dynamodb_data.get('NewImage', {}))
-                    old_image = dynamodb_json_to_dict(dynamodb_data.get('OldImage', {}))
-
-                    for attr, new_val in new_image.items():
-                        old_val = old_image.get(attr)
-                        if old_val != new_val:
-                            audit_item = {
-                                "id": str(uuid.uuid4()),
-                                "itemKey": item_key,
-                                "modificationTime": current_time,
-                                "updatedAttribute": attr,
-                                "oldValue": old_val,
-                                "newValue": new_val
-                            }
-                            audit_table.put_item(Item=audit_item)
-                            _LOG.info(f"MODIFY event processed for key={item_key}, attribute={attr}, audit_item={audit_item}")
+                    changes = diff_images(record.new_image, record.old_image)
+                    for attr, old_val, new_val in changes:
+                        audit_item = {
+                            "id": audit_id(record, attr),
+                            "itemKey": item_key,
+                            "modificationTime": current_time,
+                            "updatedAttribute": attr,
+                            "oldValue": old_val,
+                            "newValue": new_val
+                        }
+                        audit_items.append(audit_item)
+                        item_sequence_numbers[audit_item['id']] = sequence_number
+                        _LOG.info(structured("MODIFY event processed", key=item_key,
+                                             attribute=attr, audit_item=audit_item))
 
             except Exception as e:
-                _LOG.error(f"Failed to process record: {record}. Error: {e}")
-                continue
-
-        return 200
+                _LOG.error("Failed to process record: %s. Error: %s", lazy(record.raw), e)
+                failed.append(sequence_number)
+                # A stream shard is retried from its first failed record, so
+                # the records behind it will be replayed anyway
+                break
+
+        unprocessed = batch_write_items(dynamodb, AUDIT_TABLE_NAME, audit_items)
+        if unprocessed:
+            _LOG.error("Failed to write %d of %d audit items.",
+                       len(unprocessed), len(audit_items))
+            failed.extend(item_sequence_numbers[item['id']] for item in unprocessed)
+        _LOG.info("Wrote %d audit items.", len(audit_items) - len(unprocessed))
+        return batch_item_failures(failed)
+
+
+def batch_item_failures(sequence_numbers):
+    """
+    Partial batch response for ReportBatchItemFailures, in record order
+    and without duplicates.
+    """
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": sequence_number}
+            for sequence_number in dict.fromkeys(sequence_numbers)
+        ]
+    }
 
 
 HANDLER = AuditProducer()
 
 
 def lambda_handler(event, context):
-    _LOG.info(f"Lambda invocation started. event:{event}, context:{context}")
+    _LOG.debug("Lambda invocation started. event: %s, context: %s", lazy(event), context)
     try:
         return HANDLER.handle_request(event=event, context=context)
     except Exception as e:
-        _LOG.error(msg=f"error happened: {e}")
-
-
-def dynamodb_json_to_dict(dynamodb_json):
-    """
-    Converts DynamoDB JSON structure into a standard Python dict.
-    Handles data types such as String (S), Number (N), Map (M), and List (L).
-    """
-    if isinstance(dynamodb_json, dict):
-        result = {}
-        for key, value in dynamodb_json.items():
-            if isinstance(value, dict):
-                if "S" in value:  # String
-                    result[key] = value["S"]
-                elif "N" in value:  # Number
-                    result[key] = int(value["N"]) if "." not in value["N"] else float(value["N"])
-                elif "M" in value:  # Map
-                    result[key] = dynamodb_json_to_dict(value["M"])
-                elif "L" in value:  # List
-                    result[key] = [dynamodb_json_to_dict(item) for item in value["L"]]
-            else:
-                result[key] = value
-        return result
-    elif isinstance(dynamodb_json, list):
-        return [dynamodb_json_to_dict(item) for item in dynamodb_json]
-    else:
-        return dynamodb_json
+        _LOG.error("error happened: %s", e)
+        # Retry the whole batch rather than dropping it
+        return batch_item_failures(
+            record.get('dynamodb', {}).get('SequenceNumber')
+            for record in event.get('Records', [])
+        )
@@ -1,7 +1,11 @@
 import unittest
 import importlib
+import os
+
 from tests import ImportFromSourceContext
 
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
 with ImportFromSourceContext():
     LAMBDA_HANDLER = importlib.import_module('lambdas.audit_producer.handler')
 
@@ -11,4 +15,3 @@ class AuditProducerLambdaTestCase(unittest.TestCase):
 
     def setUp(self) -> None:
         self.HANDLER = LAMBDA_HANDLER.AuditProducer()
-
@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+from tests.test_audit_producer import AuditProducerLambdaTestCase, LAMBDA_HANDLER
+from tests.test_audit_producer.test_batch_writes import FakeDynamoDB
+
+
+def insert_record(key, sequence_number):
+    return {'eventName': 'INSERT',
+            'dynamodb': {'Keys': {'key': {'S': key}},
+                         'NewImage': {'key': {'S': key}, 'value': {'N': '1'}},
+                         'SequenceNumber': sequence_number}}
+
+
+class TestBatchItemFailures(AuditProducerLambdaTestCase):
+
+    def test_no_failures(self):
+        dynamodb = FakeDynamoDB()
+        event = {'Records': [insert_record(f'key-{i}', str(i)) for i in range(3)]}
+        with patch.object(LAMBDA_HANDLER, 'dynamodb', dynamodb):
+            response = self.HANDLER.handle_request(event, None)
+        self.assertEqual(response, {'batchItemFailures': []})
+        self.assertEqual(len(dynamodb.written), 3)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.HANDLER.handle_request({'Records': []}, None),
+                         {'batchItemFailures': []})
+
+    def test_broken_record_stops_the_batch(self):
+        dynamodb = FakeDynamoDB()
+        broken = {'eventName': 'INSERT',
+                  'dynamodb': {'Keys': {'key': {'S': 'key-1'}},
+                               'NewImage': 'not an image',
+                               'SequenceNumber': '1'}}
+        event = {'Records': [insert_record('key-0', '0'), broken,
+                             insert_record('key-2', '2')]}
+        with patch.object(LAMBDA_HANDLER, 'dynamodb', dynamodb):
+            response = self.HANDLER.handle_request(event, None)
+        self.assertEqual(response, {'batchItemFailures': [{'itemIdentifier': '1'}]})
+        self.assertEqual([i['itemKey'] for i in dynamodb.written], ['key-0'])
+
+    def test_unprocessed_items_are_reported(self):
+        dynamodb = FakeDynamoDB()
+        event = {'Records': [insert_record(f'key-{i}', str(i)) for i in range(4)]}
+        with patch.object(LAMBDA_HANDLER, 'dynamodb', dynamodb), \
+                patch.object(LAMBDA_HANDLER, 'batch_write_items',
+                             side_effect=lambda db, table, items: items[2:]):
+            response = self.HANDLER.handle_request(event, None)
+        self.assertEqual(response, {'batchItemFailures': [{'itemIdentifier': '2'},
+                                                          {'itemIdentifier': '3'}]})
+
+    def test_unexpected_error_retries_everything(self):
+        event = {'Records': [insert_record(f'key-{i}', str(i)) for i in range(2)]}
+        with patch.object(LAMBDA_HANDLER, 'batch_write_items',
+                          side_effect=RuntimeError('boom')):
+            response = LAMBDA_HANDLER.lambda_handler(event, None)
+        self.assertEqual(response, {'batchItemFailures': [{'itemIdentifier': '0'},
+                                                          {'itemIdentifier': '1'}]})
+
+    def test_replayed_records_keep_their_audit_ids(self):
+        modify = {'eventID': 'event-1', 'eventName': 'MODIFY',
+                  'dynamodb': {'Keys': {'key': {'S': 'key-1'}},
+                               'NewImage': {'key': {'S': 'key-1'}, 'value': {'N': '2'},
+                                            'unit': {'S': 'ms'}},
+                               'OldImage': {'key': {'S': 'key-1'}, 'value': {'N': '1'},
+                                            'unit': {'S': 's'}},
+                               'SequenceNumber': '1'}}
+        event = {'Records': [insert_record('key-0', '0'), modify]}
+        ids = []
+        for _ in range(2):
+            dynamodb = FakeDynamoDB()
+            with patch.object(LAMBDA_HANDLER, 'dynamodb', dynamodb):
+                self.HANDLER.handle_request(event, None)
+            ids.append([item['id'] for item in dynamodb.written])
+        self.assertEqual(ids[0], ids[1])
+        self.assertEqual(len(set(ids[0])), 3)
@@ -0,0 +1,79 @@
+from unittest.mock import patch
+
+from tests.test_audit_producer import AuditProducerLambdaTestCase, LAMBDA_HANDLER
+from commons.batch_writer import batch_write_items
+
+
+class FakeDynamoDB:
+    """Records BatchWriteItem calls, leaving the last `throttle` requests
+    of the first `throttled_calls` calls unprocessed."""
+
+    def __init__(self, throttle=0, throttled_calls=0):
+        self.throttle = throttle
+        self.throttled_calls = throttled_calls
+        self.calls = []
+        self.written = []
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        self.calls.append(len(requests))
+        unprocessed = []
+        if len(self.calls) <= self.throttled_calls:
+            requests, unprocessed = requests[:-self.throttle], requests[-self.throttle:]
+        self.written.extend(r['PutRequest']['Item'] for r in requests)
+        return {'UnprocessedItems': {table_name: unprocessed} if unprocessed else {}}
+
+
+def modify_record(key, changes):
+    new_image = {'key': {'S': key}}
+    old_image = {'key': {'S': key}}
+    for attr in range(changes):
+        new_image[f'attr{attr}'] = {'S': 'new'}
+        old_image[f'attr{attr}'] = {'S': 'old'}
+    return {'eventName': 'MODIFY',
+            'dynamodb': {'Keys': {'key': {'S': key}},
+                         'NewImage': new_image, 'OldImage': old_image}}
+
+
+class TestBatchWriteItems(AuditProducerLambdaTestCase):
+
+    def test_chunks_of_25(self):
+        dynamodb = FakeDynamoDB()
+        items = [{'id': str(i)} for i in range(60)]
+        self.assertEqual(batch_write_items(dynamodb, 'Audit', items), [])
+        self.assertEqual(dynamodb.calls, [25, 25, 10])
+        self.assertEqual(dynamodb.written, items)
+
+    def test_retries_unprocessed_items_with_backoff(self):
+        dynamodb = FakeDynamoDB(throttle=5, throttled_calls=2)
+        delays = []
+        items = [{'id': str(i)} for i in range(20)]
+        self.assertEqual(batch_write_items(dynamodb, 'Audit', items,
+                                           sleep=delays.append), [])
+        self.assertEqual(dynamodb.calls, [20, 5, 5])
+        self.assertEqual(sorted(i['id'] for i in dynamodb.written),
+                         sorted(i['id'] for i in items))
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(0 <= delays[0] <= 0.05 and 0 <= delays[1] <= 0.1)
+
+    def test_returns_items_left_after_max_retries(self):
+        dynamodb = FakeDynamoDB(throttle=3, throttled_calls=10)
+        items = [{'id': str(i)} for i in range(10)]
+        failed = batch_write_items(dynamodb, 'Audit', items, max_retries=2,
+                                   sleep=lambda delay: None)
+        self.assertEqual(len(failed), 3)
+        self.assertEqual(len(dynamodb.calls), 3)
+
+
+class TestAuditProducerBatching(AuditProducerLambdaTestCase):
+
+    def test_whole_batch_is_written_together(self):
+        dynamodb = FakeDynamoDB()
+        event = {'Records': [modify_record(f'key-{i}', 4) for i in range(10)]}
+        with patch.object(LAMBDA_HANDLER, 'dynamodb', dynamodb):
+            self.assertEqual(self.HANDLER.handle_request(event, None),
+                             {'batchItemFailures': []})
+
+        self.assertEqual(dynamodb.calls, [25, 15])
+        self.assertEqual({i['itemKey'] for i in dynamodb.written},
+                         {f'key-{i}' for i in range(10)})
@@ -0,0 +1,10 @@
+from tests.import_profile import HEAVY_MODULES, IMPORT_TIME_BUDGET_MS, profile_lambda
+from tests.test_audit_producer import AuditProducerLambdaTestCase
+
+
+class TestColdStart(AuditProducerLambdaTestCase):
+
+    def test_handler_import(self):
+        profile = profile_lambda('audit_producer')
+        self.assertEqual(profile.loaded(*HEAVY_MODULES), [], profile.report())
+        self.assertLess(profile.total_ms, IMPORT_TIME_BUDGET_MS, profile.report())
@@ -0,0 +1,93 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from tests.test_audit_producer import AuditProducerLambdaTestCase, LAMBDA_HANDLER
+from tests.test_audit_producer.test_batch_writes import FakeDynamoDB
+from commons.dynamodb_json import diff_images, loads, loads_value
+
+
+class TestDynamoDBJson(AuditProducerLambdaTestCase):
+
+    def test_all_type_tags(self):
+        image = {
+            'string': {'S': 'text'},
+            'integer': {'N': '-42'},
+            'fraction': {'N': '1.25'},
+            'exponent': {'N': '1E+3'},
+            'flag': {'BOOL': False},
+            'nothing': {'NULL': True},
+            'binary': {'B': 'aGk='},
+            'strings': {'SS': ['a', 'b']},
+            'numbers': {'NS': ['1', '2.5']},
+            'binaries': {'BS': ['aGk=']},
+            'map': {'M': {'inner': {'L': [{'S': 'x'}, {'N': '1'}, {'M': {}}]}}},
+        }
+        self.assertEqual(loads(image), {
+            'string': 'text',
+            'integer': -42,
+            'fraction': Decimal('1.25'),
+            'exponent': 1000,
+            'flag': False,
+            'nothing': None,
+            'binary': b'hi',
+            'strings': {'a', 'b'},
+            'numbers': {1, Decimal('2.5')},
+            'binaries': {b'hi'},
+            'map': {'inner': ['x', 1, {}]},
+        })
+
+    def test_nesting_deeper_than_the_recursion_limit(self):
+        image = {'leaf': {'S': 'end'}}
+        for _ in range(5000):
+            image = {'child': {'L': [{'M': image}]}}
+        decoded = loads(image)
+        for _ in range(5000):
+            decoded = decoded['child'][0]
+        self.assertEqual(decoded, {'leaf': 'end'})
+
+    def test_plain_values_are_kept(self):
+        image = {'typed': {'M': {'n': {'N': '7'}}}, 'name': 'Sam', 'count': 3,
+                 'tags': ['a'], 'after': {'L': [{'S': 'x'}, None]}}
+        self.assertEqual(loads(image), {'typed': {'n': 7}, 'name': 'Sam', 'count': 3,
+                                        'tags': ['a'], 'after': ['x', None]})
+
+    def test_unknown_tag(self):
+        with self.assertRaises(ValueError):
+            loads({'value': {'X': '1'}})
+
+    def test_single_value(self):
+        self.assertEqual(loads_value({'NS': ['3']}), {3})
+
+
+class TestDiffImages(AuditProducerLambdaTestCase):
+
+    def test_changed_added_and_removed(self):
+        old_image = {'key': {'S': 'k'}, 'value': {'N': '1'},
+                     'gone': {'S': 'x'}, 'same': {'M': {'a': {'L': [{'S': 'b'}]}}}}
+        new_image = {'key': {'S': 'k'}, 'value': {'N': '2.5'},
+                     'added': {'BOOL': True}, 'same': {'M': {'a': {'L': [{'S': 'b'}]}}}}
+        self.assertEqual(diff_images(new_image, old_image), [
+            ('value', 1, Decimal('2.5')),
+            ('added', None, True),
+            ('gone', 'x', None),
+        ])
+
+    def test_reordered_set_is_not_a_change(self):
+        self.assertEqual(diff_images({'tags': {'SS': ['a', 'b']}},
+                                     {'tags': {'SS': ['b', 'a']}}), [])
+
+
+class TestModifyAudit(AuditProducerLambdaTestCase):
+
+    def test_removed_attribute_is_audited(self):
+        dynamodb = FakeDynamoDB()
+        record = {'eventName': 'MODIFY',
+                  'dynamodb': {'Keys': {'key': {'S': 'k'}},
+                               'OldImage': {'key': {'S': 'k'}, 'value': {'N': '1'}},
+                               'NewImage': {'key': {'S': 'k'}},
+                               'SequenceNumber': '1'}}
+        with patch.object(LAMBDA_HANDLER, 'dynamodb', dynamodb):
+            self.HANDLER.handle_request({'Records': [record]}, None)
+        (item,) = dynamodb.written
+        self.assertEqual((item['updatedAttribute'], item['oldValue'], item['newValue']),
+                         ('value', 1, None))
@@ -0,0 +1,28 @@
+"""
+Benchmarks for the task07 lambdas. Run them from the project root, e.g.:
+    python -m benchmarks.uuid_upload
+"""
+import importlib
+import os
+import time
+
+from tests import ImportFromSourceContext
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
+
+def load_handler(name='uuid_generator'):
+    """Import a lambda handler module the same way the tests do."""
+    with ImportFromSourceContext():
+        return importlib.import_module(f'lambdas.{name}.handler')
+
+
+def best_of(func, repeat=5, number=1):
+    """Return the best per-call wall time (seconds) of func over repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
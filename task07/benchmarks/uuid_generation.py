@@ -0,0 +1,39 @@
+"""
+UUID generation for 1M ids (or the given counts): str(uuid.uuid4()) per
+id, as the UuidGenerator used to, against commons.uuid_bulk as list of
+strings and as NDJSON records ready for upload.
+
+    python -m benchmarks.uuid_generation [count ...]
+"""
+import sys
+import uuid
+
+from benchmarks import best_of, load_handler
+
+
+def run(counts):
+    load_handler()
+    from commons.uuid_bulk import iter_uuid_records, uuid_strings
+
+    for count in counts:
+        cases = (
+            ('str(uuid.uuid4()) per id (baseline)',
+             lambda: [str(uuid.uuid4()) for _ in range(count)]),
+            ('uuid_strings, version 4', lambda: uuid_strings(count)),
+            ('uuid_strings, version 7', lambda: uuid_strings(count, version=7)),
+            ('NDJSON records, version 4',
+             lambda: sum(map(len, iter_uuid_records(count, b'{"id":"', b'"}\n')))),
+            ('NDJSON records, version 7',
+             lambda: sum(map(len, iter_uuid_records(count, b'{"id":"', b'"}\n', 7)))),
+        )
+        print(f'{count} UUIDs')
+        baseline = None
+        for name, generate in cases:
+            elapsed = best_of(generate, repeat=3)
+            baseline = baseline or elapsed
+            print(f'  {name:<36} | {elapsed * 1e3:8.1f} ms | {count / elapsed:12,.0f} ids/s | '
+                  f'{baseline / elapsed:5.1f}x')
+
+
+if __name__ == '__main__':
+    run([int(count) for count in sys.argv[1:]] or [1_000_000])
@@ -0,0 +1,67 @@
+"""
+Throughput of the UuidGenerator upload in IDs per second against a
+local S3 stand-in (tests.s3_stub, in a child process), for every
+output format. The
+baseline is the original code path: the whole pretty-printed JSON body
+built in memory and sent with one PutObject. Multipart uploads use
+5 MiB parts, sent by 1 and by 4 threads.
+
+    python -m benchmarks.uuid_upload [count ...]
+"""
+import json
+import sys
+import tracemalloc
+import uuid
+from unittest.mock import patch
+
+from benchmarks import best_of, load_handler
+from tests.s3_stub import stub_client, stub_process
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+def whole_body_upload(client, count):
+    body = json.dumps({'ids': [str(uuid.uuid4()) for _ in range(count)]}, indent=4)
+    client.put_object(Bucket='bench', Key='baseline', Body=body,
+                      ContentType='application/json')
+    return len(body.encode())
+
+
+def peak_memory_mib(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run(counts):
+    handler = load_handler()
+    with stub_process() as endpoint_url:
+        client = stub_client(endpoint_url)
+        for count in counts:
+            print(f'{count} UUIDs')
+            cases = [('json, one PutObject (baseline)',
+                      lambda: whole_body_upload(client, count))]
+            for output_format in ('json', 'ndjson', 'ndjson.gz'):
+                for concurrency in (1, 4):
+                    def upload(output_format=output_format, concurrency=concurrency):
+                        with patch.object(handler, 'UPLOAD_CONCURRENCY', concurrency), \
+                                patch.object(handler, 'MULTIPART_PART_SIZE', PART_SIZE), \
+                                patch.object(handler, 'MULTIPART_THRESHOLD', PART_SIZE):
+                            return handler.upload_uuids(client, 'bench', output_format,
+                                                        count, output_format)
+                    cases.append((f'{output_format}, {concurrency} upload threads', upload))
+
+            for name, upload in cases:
+                result = upload()
+                size = result if isinstance(result, int) else result.bytes_written
+                elapsed = best_of(upload, repeat=3)
+                memory = peak_memory_mib(upload)
+                print(f'  {name:<34} | {count / elapsed:10,.0f} ids/s | '
+                      f'{size / 1024 / 1024:7.1f} MiB | peak {memory:6.1f} MiB')
+
+
+if __name__ == '__main__':
+    run([int(count) for count in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,170 @@
+"""
+Streaming uploads to S3 that never hold the whole object in memory.
+
+S3UploadStream is a write-only file object: small bodies go up with a
+single PutObject on close, bodies past a size threshold switch to a
+multipart upload whose parts are sent concurrently while the caller
+keeps writing. At most `max_concurrency` parts are in flight, so memory
+stays around (max_concurrency + 1) * part_size.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MiB = 1024 * 1024
+# S3 rejects smaller parts, except the last one
+MIN_PART_SIZE = 5 * MiB
+DEFAULT_PART_SIZE = 8 * MiB
+DEFAULT_THRESHOLD = 8 * MiB
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class S3UploadStream:
+    """
+    Used as a context manager: the object is committed when the block
+    exits cleanly and an unfinished multipart upload is aborted when it
+    raises. gzip.GzipFile(fileobj=stream, mode='wb') compresses on the
+    fly.
+    """
+
+    def __init__(self, client, bucket, key, part_size=DEFAULT_PART_SIZE,
+                 threshold=DEFAULT_THRESHOLD, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 **object_args):
+        """
+        :param client: boto3 S3 client
+        :param bucket: target bucket
+        :param key: target key
+        :param part_size: bytes per multipart part, at least MIN_PART_SIZE
+        :param threshold: bodies larger than this use a multipart upload
+        :param max_concurrency: parts uploaded at the same time
+        :param object_args: PutObject / CreateMultipartUpload arguments,
+            e.g. ContentType
+        """
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f'part_size must be at least {MIN_PART_SIZE} bytes')
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.threshold = threshold
+        self.max_concurrency = max_concurrency
+        self.object_args = object_args
+        self.bytes_written = 0
+        self.upload_id = None
+        self.closed = False
+        self._buffer = bytearray()
+        self._parts = []
+        self._executor = None
+        self._error = None
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    @property
+    def is_multipart(self) -> bool:
+        return self.upload_id is not None
+
+    @property
+    def part_count(self) -> int:
+        return len(self._parts)
+
+    def writable(self):
+        return True
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError('write to a closed S3UploadStream')
+        self._buffer += data
+        self.bytes_written += len(data)
+        if not self.is_multipart and len(self._buffer) > self.threshold:
+            self._start_multipart()
+        if self.is_multipart:
+            while len(self._buffer) >= self.part_size:
+                with memoryview(self._buffer) as view:
+                    part = bytes(view[:self.part_size])
+                del self._buffer[:self.part_size]
+                self._submit_part(part)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """Commits the object: PutObject, or the last part and completion."""
+        if self.closed:
+            return
+        self.closed = True
+        if not self.is_multipart:
+            self.client.put_object(Bucket=self.bucket, Key=self.key,
+                                   Body=bytes(self._buffer), **self.object_args)
+            self._buffer.clear()
+            return
+        try:
+            if self._buffer or not self._parts:
+                self._submit_part(bytes(self._buffer))
+                self._buffer.clear()
+            parts = [future.result() for future in self._parts]
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+                MultipartUpload={'Parts': parts})
+        except BaseException:
+            self._abort()
+            raise
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def abort(self):
+        """Drops everything written; nothing is stored."""
+        if self.closed:
+            return
+        self.closed = True
+        self._buffer.clear()
+        if self.is_multipart:
+            self._abort()
+
+    def _start_multipart(self):
+        response = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=self.key, **self.object_args)
+        self.upload_id = response['UploadId']
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                            thread_name_prefix='s3-part')
+
+    def _submit_part(self, body):
+        # Blocks the writer while max_concurrency parts are in flight
+        self._slots.acquire()
+        # Fail fast instead of uploading the rest of a doomed object
+        if self._error is not None:
+            self._slots.release()
+            raise self._error
+        try:
+            future = self._executor.submit(self._upload_part, len(self._parts) + 1, body)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._part_done)
+        self._parts.append(future)
+
+    def _part_done(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self._error = self._error or future.exception()
+        self._slots.release()
+
+    def _upload_part(self, part_number, body):
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            PartNumber=part_number, Body=body)
+        return {'PartNumber': part_number, 'ETag': response['ETag']}
+
+    def _abort(self):
+        for future in self._parts:
+            future.cancel()
+        # Parts still uploading would outlive an earlier abort
+        self._executor.shutdown(wait=True)
+        self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key,
+                                           UploadId=self.upload_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -1,18 +1,85 @@
-import json
+import gzip
 import os
-import uuid
 from datetime import datetime
 
-import boto3
-
 from commons.abstract_lambda import AbstractLambda
+from commons.aws_clients import get_client
 from commons.log_helper import get_logger
+from commons.s3_upload import MiB, S3UploadStream
+from commons.uuid_bulk import iter_uuid_records
 
 _LOG = get_logger('UuidGenerator-handler')
 
-# Initialize S3 client
-s3_client = boto3.client('s3')
 S3_BUCKET = os.environ.get('target_bucket', 'uuid-storage')
+UUID_COUNT = int(os.environ.get('uuid_count', 10))
+# 4 (random) or 7 (time ordered, for sortable keys)
+UUID_VERSION = int(os.environ.get('uuid_version', 4))
+# "json" is the original {"ids": [...]} file (indent=4), "ndjson" one
+# {"id": ...} object per line and "ndjson.gz" the same gzip compressed
+OUTPUT_FORMAT = os.environ.get('output_format', 'json').lower()
+GZIP_LEVEL = int(os.environ.get('gzip_level', 6))
+MULTIPART_THRESHOLD = int(os.environ.get('multipart_threshold', 8 * MiB))
+MULTIPART_PART_SIZE = int(os.environ.get('multipart_part_size', 8 * MiB))
+UPLOAD_CONCURRENCY = int(os.environ.get('upload_concurrency', 4))
+
+OUTPUT_FORMATS = {
+    # format: (key suffix, object arguments)
+    'json': ('', {'ContentType': 'application/json'}),
+    'ndjson': ('.ndjson', {'ContentType': 'application/x-ndjson'}),
+    'ndjson.gz': ('.ndjson.gz', {'ContentType': 'application/x-ndjson',
+                                 'ContentEncoding': 'gzip'}),
+}
+
+_NDJSON_RECORD = (b'{"id":"', b'"}\n')
+# Every id after a separator; the first one drops it
+_JSON_RECORD = (b',\n        "', b'"')
+_JSON_SEPARATOR_SIZE = 2
+
+
+def render_ndjson(count, version=4):
+    prefix, suffix = _NDJSON_RECORD
+    return iter_uuid_records(count, prefix, suffix, version)
+
+
+def render_json(count, version=4):
+    """
+    Chunks of exactly json.dumps({"ids": [...]}, indent=4), rendered
+    batch by batch.
+    """
+    if not count:
+        yield b'{\n    "ids": []\n}'
+        return
+    yield b'{\n    "ids": [\n'
+    prefix, suffix = _JSON_RECORD
+    chunks = iter_uuid_records(count, prefix, suffix, version)
+    yield next(chunks)[_JSON_SEPARATOR_SIZE:]
+    yield from chunks
+    yield b'\n    ]\n}'
+
+
+def upload_uuids(client, bucket, key, count, output_format, version=4):
+    """
+    Streams count UUIDs to s3://bucket/key in the given format.
+    :return: the finished S3UploadStream, for its statistics
+    """
+    _, object_args = OUTPUT_FORMATS[output_format]
+    render = render_json if output_format == 'json' else render_ndjson
+    chunks = render(count, version)
+    with S3UploadStream(client, bucket, key, part_size=MULTIPART_PART_SIZE,
+                        threshold=MULTIPART_THRESHOLD,
+                        max_concurrency=UPLOAD_CONCURRENCY, **object_args) as stream:
+        if output_format.endswith('.gz'):
+            # mtime=0 keeps the output of the same ids byte-identical
+            with gzip.GzipFile(fileobj=stream, mode='wb',
+                               compresslevel=GZIP_LEVEL, mtime=0) as compressed:
+                for chunk in chunks:
+                    compressed.write(chunk)
+        else:
+            for chunk in chunks:
+                stream.write(chunk)
+    return stream
+
+
 class UuidGenerator(AbstractLambda):
     def validate_request(self, event) -> dict:
         # Validation logic here if needed
@@ -21,36 +88,36 @@ class UuidGenerator(AbstractLambda):
     def handle_request(self, event, context):
         """
         Event is triggered by CloudWatch every minute.
-        The function generates 10 UUIDs, creates a file, and uploads it to S3.
+        The function generates UUID_COUNT UUIDs (10 by default) and
+        streams them to a file in S3.
         """
-        _LOG.info("Generating 10 UUIDs...")
-        
-        # Generate 10 UUIDs
-        uuids = [str(uuid.uuid4()) for _ in range(10)]
-        
-        # Prepare the content for the file
-        content = {"ids": uuids}
-        file_content = json.dumps(content, indent=4)
-        
+        if OUTPUT_FORMAT not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output_format '{OUTPUT_FORMAT}', "
+                             f"expected one of {', '.join(OUTPUT_FORMATS)}")
+        _LOG.info("Generating %s UUIDs...", UUID_COUNT)
+
         # Generate the filename with the current ISO timestamp
         timestamp = datetime.now().isoformat(timespec='milliseconds') + "Z"
-        file_name = f"{timestamp}"
-        
-        _LOG.info(f"Uploading file '{file_name}' to S3 bucket '{S3_BUCKET}'...")
-        
-        # Upload the file to the S3 bucket
+        suffix, _ = OUTPUT_FORMATS[OUTPUT_FORMAT]
+        file_name = f"{timestamp}{suffix}"
+
+        _LOG.info("Uploading file '%s' to S3 bucket '%s'...", file_name, S3_BUCKET)
+
+        # Stream the file to the S3 bucket
         try:
-            s3_client.put_object(
-                Bucket=S3_BUCKET,
-                Key=file_name,
-                Body=file_content,
-                ContentType='application/json'
-            )
-            _LOG.info(f"File '{file_name}' successfully uploaded.")
+            stream = upload_uuids(get_client('s3'), S3_BUCKET, file_name,
+                                  UUID_COUNT, OUTPUT_FORMAT, UUID_VERSION)
+            if stream.is_multipart:
+                _LOG.info("File '%s' successfully uploaded: %s bytes in %s "
+                          "parts.", file_name, stream.bytes_written,
+                          stream.part_count)
+            else:
+                _LOG.info("File '%s' successfully uploaded: %s bytes.",
+                          file_name, stream.bytes_written)
         except Exception as e:
-            _LOG.error(f"Failed to upload file: {str(e)}")
+            _LOG.error("Failed to upload file: %s", e)
             raise
-        
+
         return {"statusCode": 200, "body": "Successfully generated UUIDs and uploaded to S3."}
 
 HANDLER = UuidGenerator()
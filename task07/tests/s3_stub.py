@@ -0,0 +1,185 @@
+"""
+Local HTTP server standing in for S3 in tests and benchmarks. It speaks
+the path-style REST calls an upload needs (PutObject, the multipart
+upload calls and GetObject) and keeps objects in memory.
+"""
+import contextlib
+import hashlib
+import multiprocessing
+import re
+import socket
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+_PART = re.compile(rb'<PartNumber>(\d+)</PartNumber>\s*<ETag>([^<]*)</ETag>')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _target(self):
+        url = urlsplit(self.path)
+        bucket, _, key = unquote(url.path).lstrip('/').partition('/')
+        query = {name: values[0] for name, values
+                 in parse_qs(url.query, keep_blank_values=True).items()}
+        return bucket, key, query
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else b''
+
+    def do_PUT(self):
+        stub = self.server.stub
+        bucket, key, query = self._target()
+        body = self._body()
+        with stub.lock:
+            stub.calls.append(('PUT', key, query))
+            failure = stub.part_failures.pop(0) if 'partNumber' in query and stub.part_failures else None
+        if failure is not None:
+            return self._send(failure, b'<Error><Code>InternalError</Code></Error>')
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if not stub.store_bodies:
+            body = len(body)
+        with stub.lock:
+            if 'partNumber' in query:
+                stub.uploads[query['uploadId']]['parts'][int(query['partNumber'])] = body
+            else:
+                stub.objects[(bucket, key)] = {'body': body, 'headers': dict(self.headers)}
+        self._send(200, b'', {'ETag': etag})
+
+    def do_POST(self):
+        stub = self.server.stub
+        bucket, key, query = self._target()
+        body = self._body()
+        with stub.lock:
+            stub.calls.append(('POST', key, query))
+            if 'uploads' in query:
+                upload_id = uuid.uuid4().hex
+                stub.uploads[upload_id] = {'parts': {}, 'headers': dict(self.headers)}
+                xml = (f'<InitiateMultipartUploadResult><Bucket>{bucket}</Bucket>'
+                       f'<Key>{key}</Key><UploadId>{upload_id}</UploadId>'
+                       f'</InitiateMultipartUploadResult>')
+                return self._send(200, xml.encode())
+            upload = stub.uploads.pop(query['uploadId'])
+            numbers = [int(number) for number, _ in _PART.findall(body)]
+            parts = [upload['parts'][number] for number in numbers]
+            stub.objects[(bucket, key)] = {
+                'body': b''.join(parts) if stub.store_bodies else sum(parts),
+                'headers': upload['headers'], 'parts': len(numbers)}
+        xml = (f'<CompleteMultipartUploadResult><Bucket>{bucket}</Bucket>'
+               f'<Key>{key}</Key><ETag>"stub"</ETag></CompleteMultipartUploadResult>')
+        self._send(200, xml.encode())
+
+    def do_DELETE(self):
+        stub = self.server.stub
+        _, key, query = self._target()
+        with stub.lock:
+            stub.calls.append(('DELETE', key, query))
+            stub.uploads.pop(query.get('uploadId'), None)
+            stub.aborted.append(key)
+        self._send(204, b'')
+
+    def do_GET(self):
+        stub = self.server.stub
+        bucket, key, _ = self._target()
+        stored = stub.objects.get((bucket, key))
+        if stored is None:
+            return self._send(404, b'<Error><Code>NoSuchKey</Code></Error>')
+        self._send(200, stored['body'])
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        if status != 204:
+            self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if status != 204:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 64
+
+
+class S3Stub:
+    """
+    Threaded S3 stand-in on a free localhost port, used as a context
+    manager. Stored objects are in `objects` keyed by (bucket, key);
+    `part_failures` lists statuses returned for the next part uploads.
+    Without `store_bodies` only the body sizes are kept.
+    """
+
+    def __init__(self, part_failures=(), store_bodies=True):
+        self.objects = {}
+        self.uploads = {}
+        self.calls = []
+        self.aborted = []
+        self.part_failures = list(part_failures)
+        self.store_bodies = store_bodies
+        self.lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={'poll_interval': 0.01}, daemon=True)
+
+    @property
+    def endpoint_url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def client(self, **config_overrides):
+        """boto3 S3 client talking to this stub."""
+        return stub_client(self.endpoint_url, **config_overrides)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def stub_client(endpoint_url, **config_overrides):
+    """boto3 S3 client talking to a stub at endpoint_url."""
+    import boto3
+    from botocore.config import Config
+    config = Config(s3={'addressing_style': 'path'}, retries={'max_attempts': 1},
+                    max_pool_connections=32, **config_overrides)
+    return boto3.client('s3', endpoint_url=endpoint_url, region_name='us-east-1',
+                        aws_access_key_id='stub', aws_secret_access_key='stub',
+                        config=config)
+
+
+def _serve(endpoint_urls, stop):
+    with S3Stub(store_bodies=False) as stub:
+        endpoint_urls.put(stub.endpoint_url)
+        stop.wait()
+
+
+@contextlib.contextmanager
+def stub_process():
+    """
+    S3Stub without stored bodies in a child process, so that it neither
+    competes for the GIL nor shows up in memory measurements.
+    :return: endpoint URL of the stub
+    """
+    endpoint_urls, stop = multiprocessing.Queue(), multiprocessing.Event()
+    process = multiprocessing.Process(target=_serve, args=(endpoint_urls, stop), daemon=True)
+    process.start()
+    try:
+        yield endpoint_urls.get(timeout=10)
+    finally:
+        stop.set()
+        process.join(timeout=5)
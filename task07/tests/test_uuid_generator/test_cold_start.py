@@ -0,0 +1,10 @@
+from tests.import_profile import HEAVY_MODULES, IMPORT_TIME_BUDGET_MS, profile_lambda
+from tests.test_uuid_generator import UuidGeneratorLambdaTestCase
+
+
+class TestColdStart(UuidGeneratorLambdaTestCase):
+
+    def test_handler_import(self):
+        profile = profile_lambda('uuid_generator')
+        self.assertEqual(profile.loaded(*HEAVY_MODULES), [], profile.report())
+        self.assertLess(profile.total_ms, IMPORT_TIME_BUDGET_MS, profile.report())
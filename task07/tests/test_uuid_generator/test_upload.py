@@ -0,0 +1,86 @@
+import gzip
+import json
+import uuid
+from unittest.mock import patch
+
+from tests.s3_stub import S3Stub
+from tests.test_uuid_generator import UuidGeneratorLambdaTestCase, LAMBDA_HANDLER
+from commons.s3_upload import MiB, S3UploadStream
+
+
+class TestUpload(UuidGeneratorLambdaTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.s3 = S3Stub().__enter__()
+        self.addCleanup(self.s3.__exit__, None, None, None)
+        patcher = patch.object(LAMBDA_HANDLER, 'get_client', return_value=self.s3.client())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def configure(self, **settings):
+        for name, value in settings.items():
+            patcher = patch.object(LAMBDA_HANDLER, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def stored(self):
+        self.assertEqual(len(self.s3.objects), 1)
+        (bucket, key), stored = next(iter(self.s3.objects.items()))
+        self.assertEqual(bucket, LAMBDA_HANDLER.S3_BUCKET)
+        return key, stored
+
+    def assert_uuid4s(self, ids, count):
+        self.assertEqual(len(set(ids)), count)
+        for value in ids[:100]:
+            self.assertEqual(uuid.UUID(value).version, 4)
+
+    def test_json_file_is_unchanged(self):
+        response = self.HANDLER.handle_request({}, {})
+
+        self.assertEqual(response['statusCode'], 200)
+        _, stored = self.stored()
+        ids = json.loads(stored['body'])['ids']
+        self.assert_uuid4s(ids, 10)
+        self.assertEqual(stored['body'].decode(), json.dumps({'ids': ids}, indent=4))
+        self.assertEqual(stored['headers']['Content-Type'], 'application/json')
+
+    def test_json_rendering(self):
+        for count in (0, 1, 3):
+            body = b''.join(LAMBDA_HANDLER.render_json(count)).decode()
+            self.assertEqual(body, json.dumps(json.loads(body), indent=4))
+            self.assertEqual(len(json.loads(body)['ids']), count)
+
+    def test_ndjson_gzip(self):
+        self.configure(UUID_COUNT=25_000, OUTPUT_FORMAT='ndjson.gz')
+        self.HANDLER.handle_request({}, {})
+
+        key, stored = self.stored()
+        self.assertTrue(key.endswith('.ndjson.gz'))
+        self.assertEqual(stored['headers']['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(stored['body']).decode().splitlines()
+        self.assert_uuid4s([json.loads(line)['id'] for line in lines], 25_000)
+
+    def test_large_output_uses_concurrent_multipart_upload(self):
+        self.configure(UUID_COUNT=250_000, OUTPUT_FORMAT='ndjson',
+                       MULTIPART_THRESHOLD=5 * MiB, MULTIPART_PART_SIZE=5 * MiB)
+        self.HANDLER.handle_request({}, {})
+
+        key, stored = self.stored()
+        self.assertTrue(key.endswith('.ndjson'))
+        self.assertEqual(stored['parts'], 3)
+        self.assertEqual(stored['headers']['Content-Type'], 'application/x-ndjson')
+        ids = [json.loads(line)['id'] for line in stored['body'].decode().splitlines()]
+        self.assert_uuid4s(ids, 250_000)
+
+    def test_failed_part_aborts_the_upload(self):
+        self.s3.part_failures = [400]
+        with self.assertRaises(Exception):
+            with S3UploadStream(self.s3.client(), 'bucket', 'key', part_size=5 * MiB,
+                                threshold=5 * MiB) as stream:
+                for _ in range(12):
+                    stream.write(b'x' * MiB)
+
+        self.assertEqual(self.s3.aborted, ['key'])
+        self.assertEqual(self.s3.objects, {})
+        self.assertEqual(self.s3.uploads, {})
@@ -0,0 +1,53 @@
+import json
+import time
+import uuid
+
+from tests.test_uuid_generator import UuidGeneratorLambdaTestCase, LAMBDA_HANDLER
+from commons.uuid_bulk import (BATCH_SIZE, iter_uuid_records, render_uuid_batch,
+                               uuid_strings)
+
+
+class TestUuidBulk(UuidGeneratorLambdaTestCase):
+
+    def assert_valid(self, values, version):
+        for value in values:
+            parsed = uuid.UUID(value)
+            self.assertEqual(str(parsed), value)
+            self.assertEqual(parsed.version, version)
+            self.assertEqual(parsed.variant, uuid.RFC_4122)
+
+    def test_uuid4(self):
+        values = uuid_strings(3 * BATCH_SIZE + 5)
+        self.assertEqual(len(values), 3 * BATCH_SIZE + 5)
+        self.assertEqual(len(set(values)), len(values))
+        self.assert_valid(values, 4)
+        # Every random bit varies
+        bits = 0
+        for value in values[:256]:
+            bits |= uuid.UUID(value).int
+        self.assertEqual(bits, uuid.UUID('ffffffff-ffff-4fff-bfff-ffffffffffff').int)
+
+    def test_uuid7_is_time_ordered(self):
+        before = time.time_ns() // 1_000_000
+        values = uuid_strings(2 * BATCH_SIZE + 5, version=7)
+        self.assert_valid(values, 7)
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+        millis = uuid.UUID(values[0]).int >> 80
+        self.assertGreaterEqual(millis, before)
+        self.assertLess(millis, before + 60_000)
+        # The next call continues the order
+        self.assertLess(values[-1], uuid_strings(1, version=7)[0])
+
+    def test_records(self):
+        lines = render_uuid_batch(3, b'{"id":"', b'"}\n').decode().splitlines()
+        self.assert_valid([json.loads(line)['id'] for line in lines], 4)
+        self.assertEqual(sum(map(len, iter_uuid_records(10, batch_size=4))), 10 * 36)
+        with self.assertRaises(ValueError):
+            uuid_strings(1, version=1)
+
+    def test_json_rendering_with_uuid7(self):
+        body = b''.join(LAMBDA_HANDLER.render_json(BATCH_SIZE + 1, version=7)).decode()
+        ids = json.loads(body)['ids']
+        self.assertEqual(body, json.dumps({'ids': ids}, indent=4))
+        self.assert_valid(ids, 7)
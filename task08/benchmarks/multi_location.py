@@ -0,0 +1,52 @@
+"""
+Wall-clock time of fetching N sites from a local weather API stub that
+answers each request after a fixed latency: one site after another
+against WeatherSDK.get_weather_for. With at least as many workers as
+distinct sites the batch takes about as long as one request.
+
+    python -m benchmarks.multi_location [sites] [latency_ms] [workers]
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import best_of, load_handler
+from tests.http_stub import StubServer
+
+
+def run(sites=100, latency_ms=50, workers=None):
+    handler = load_handler()
+    workers = int(workers or handler.WEATHER_MAX_WORKERS)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    coordinates = [(40 + i / 10, 20 + i / 10) for i in range(int(sites))]
+    # Half of the requested sites are repeats
+    requested = coordinates + coordinates[:len(coordinates) // 2]
+
+    def client():
+        return handler.CachingHttpClient(
+            session=handler.build_session(pool_size=workers),
+            default_ttl=0)
+
+    with StubServer(delay=latency_ms / 1000) as server:
+        handler.WEATHER_API_URL = server.url
+
+        def sequential():
+            sequential_client = client()
+            for latitude, longitude in requested:
+                handler.WeatherSDK(latitude, longitude, client=sequential_client).get_weather()
+
+        def concurrent():
+            handler.WeatherSDK.get_weather_for(requested, client=client(), executor=executor)
+
+        single = best_of(lambda: handler.WeatherSDK(40, 20, client=client()).get_weather())
+        before = best_of(sequential, repeat=1)
+        after = best_of(concurrent, repeat=3)
+    print(f'{len(requested)} requested sites, {len(coordinates)} distinct, '
+          f'{latency_ms:.0f} ms upstream latency, {workers} workers')
+    print(f'single request  | {single * 1e3:8.1f} ms')
+    print(f'sequential      | {before * 1e3:8.1f} ms')
+    print(f'get_weather_for | {after * 1e3:8.1f} ms | {before / after:5.1f}x')
+    executor.shutdown()
+
+
+if __name__ == '__main__':
+    run(*[float(a) for a in sys.argv[1:]])
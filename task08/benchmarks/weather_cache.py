@@ -0,0 +1,40 @@
+"""
+Cost of WeatherSDK.get_weather against a local stub of the weather API:
+a fresh requests.get per call (the previous SDK), the pooled session
+with the cache disabled, and repeated calls served from the cache.
+
+    python -m benchmarks.weather_cache
+"""
+import requests
+
+from benchmarks import best_of, load_handler
+from tests.http_stub import StubServer
+
+
+def run(number=200):
+    handler = load_handler()
+    with StubServer() as server:
+        def sdk(client):
+            weather_sdk = handler.WeatherSDK(50.4375, 30.5, client=client)
+            weather_sdk.base_url = server.url
+            return weather_sdk
+
+        def fresh_connection():
+            response = requests.get(server.url, params=sdk(None).params)
+            response.raise_for_status()
+            return response.json()
+
+        uncached = handler.CachingHttpClient(default_ttl=0)
+        cached = handler.CachingHttpClient(default_ttl=900)
+        sdk(cached).get_weather()
+
+        before = best_of(fresh_connection, number=number)
+        pooled = best_of(lambda: sdk(uncached).get_weather(), number=number)
+        hit = best_of(lambda: sdk(cached).get_weather(), number=number * 100)
+    print(f'requests.get per call | {before * 1e6:10.1f} us')
+    print(f'pooled session        | {pooled * 1e6:10.1f} us | {before / pooled:6.1f}x')
+    print(f'cache hit             | {hit * 1e6:10.1f} us | {before / hit:6.0f}x')
+
+
+if __name__ == '__main__':
+    run()
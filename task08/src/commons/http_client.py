@@ -0,0 +1,200 @@
+"""
+Pooled, retrying HTTP client with a response cache for upstream JSON
+APIs, kept for the life of a warm container.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from commons.lazy_import import lazy_import
+from commons.log_helper import get_logger
+
+# Loaded when the first session is built, not at handler import
+requests = lazy_import('requests')
+requests_adapters = lazy_import('requests.adapters')
+urllib3_retry = lazy_import('urllib3.util.retry')
+
+_LOG = get_logger('http-client')
+
+DEFAULT_CONNECT_TIMEOUT_SEC = 3.05
+DEFAULT_READ_TIMEOUT_SEC = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.3
+DEFAULT_POOL_SIZE = 10
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_MAX_AGE = re.compile(r'(?:^|,)\s*(?:s-maxage|max-age)\s*=\s*"?(\d+)"?', re.IGNORECASE)
+
+
+def build_session(pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+                  backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                  retry_statuses=RETRY_STATUSES) -> 'requests.Session':
+    """
+    requests.Session with a keep-alive connection pool, retrying
+    connection errors and the given statuses with exponential backoff.
+    :param pool_size: connections kept per host
+    :param max_retries: retries per request
+    :param backoff_factor: backoff between retries, see urllib3 Retry
+    :param retry_statuses: response statuses that are retried
+    """
+    retry = urllib3_retry.Retry(
+        total=max_retries, backoff_factor=backoff_factor,
+        status_forcelist=retry_statuses, allowed_methods=('GET',),
+        respect_retry_after_header=True, raise_on_status=False)
+    adapter = requests_adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def freshness_lifetime(headers, default_ttl):
+    """
+    Seconds a response may be served from cache, from its Cache-Control.
+    :param headers: response headers
+    :param default_ttl: lifetime when the upstream does not set max-age
+    :return: lifetime in seconds, None if it must not be stored
+    """
+    cache_control = headers.get('Cache-Control', '').lower()
+    if 'no-store' in cache_control:
+        return None
+    if 'no-cache' in cache_control:
+        # Stored for revalidation only
+        return 0
+    match = _MAX_AGE.search(cache_control)
+    if match:
+        age = int(headers.get('Age', 0) or 0)
+        return max(int(match.group(1)) - age, 0)
+    return default_ttl
+
+
+class CacheEntry:
+    __slots__ = ('payload', 'etag', 'expires_at')
+
+    def __init__(self, payload, etag, expires_at):
+        self.payload = payload
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of decoded responses with per-entry expiry.
+    Expired entries that carry an ETag are kept for revalidation.
+    """
+
+    def __init__(self, max_entries=256, clock=time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """
+        :return: (entry, is_fresh); entry is None when nothing is cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(key)
+            if entry.expires_at > self._clock():
+                return entry, True
+            if entry.etag is None:
+                del self._entries[key]
+                return None, False
+            return entry, False
+
+    def store(self, key, payload, etag, ttl):
+        with self._lock:
+            self._entries[key] = CacheEntry(payload, etag, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachingHttpClient:
+    """
+    GETs JSON through a pooled session. Fresh cached responses are served
+    without a request; stale ones with an ETag are revalidated with
+    If-None-Match, and a 304 renews them. Concurrent calls for the same
+    URL and params share one upstream request.
+    Cached payloads are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, session=None, cache=None, default_ttl=0,
+                 timeout=(DEFAULT_CONNECT_TIMEOUT_SEC, DEFAULT_READ_TIMEOUT_SEC)):
+        """
+        :param session: requests.Session, build_session() by default
+        :param cache: ResponseCache, a new one by default
+        :param default_ttl: lifetime of responses without max-age
+        :param timeout: (connect, read) timeout in seconds
+        """
+        self.session = session or build_session()
+        self.cache = cache if cache is not None else ResponseCache()
+        self.default_ttl = default_ttl
+        self.timeout = timeout
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(url, params):
+        return url, tuple(sorted((params or {}).items()))
+
+    def get_json(self, url, params=None):
+        """
+        :raises requests.exceptions.RequestException: on connection errors
+            and error statuses left after the retries
+        """
+        key = self.cache_key(url, params)
+        entry, is_fresh = self.cache.lookup(key)
+        if is_fresh:
+            return entry.payload
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[key] = Future()
+        if not is_leader:
+            return future.result()
+        try:
+            # A request that just finished may have filled the cache
+            entry, is_fresh = self.cache.lookup(key)
+            payload = entry.payload if is_fresh else self._fetch(key, url, params, entry)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(payload)
+            return payload
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def _fetch(self, key, url, params, entry):
+        headers = {'If-None-Match': entry.etag} if entry is not None else {}
+        response = self.session.get(url, params=params, headers=headers,
+                                    timeout=self.timeout)
+        if response.status_code == 304 and entry is not None:
+            _LOG.debug("Revalidated %s", url)
+            payload = entry.payload
+        else:
+            response.raise_for_status()
+            payload = response.json()
+
+        ttl = freshness_lifetime(response.headers, self.default_ttl)
+        etag = response.headers.get('ETag') or (entry.etag if entry else None)
+        if ttl is not None and (ttl > 0 or etag):
+            self.cache.store(key, payload, etag, ttl)
+        return payload
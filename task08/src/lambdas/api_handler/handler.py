@@ -1,16 +1,65 @@
 # src/lambdas/api_handler/handler.py
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from commons.log_helper import get_logger
 from commons.abstract_lambda import AbstractLambda
-import requests
+from commons.http_client import CachingHttpClient, ResponseCache, build_session
+from commons.lazy_import import lazy_import
+
+requests = lazy_import('requests')
 
 _LOG = get_logger('ApiHandler-handler')
 
+WEATHER_API_URL = os.environ.get('weather_api_url', 'https://api.open-meteo.com/v1/forecast')
+# Open-Meteo sends no Cache-Control; reuse a forecast for this many seconds
+WEATHER_CACHE_TTL_SEC = int(os.environ.get('weather_cache_ttl', 900))
+WEATHER_CONNECT_TIMEOUT_SEC = float(os.environ.get('weather_connect_timeout', 3.05))
+WEATHER_READ_TIMEOUT_SEC = float(os.environ.get('weather_read_timeout', 10))
+WEATHER_MAX_RETRIES = int(os.environ.get('weather_max_retries', 3))
+# Concurrent upstream requests (and pooled connections) for multi-location calls
+WEATHER_MAX_WORKERS = int(os.environ.get('weather_max_workers', 32))
+WEATHER_MAX_LOCATIONS = int(os.environ.get('weather_max_locations', 500))
+# Coordinates equal at this many decimals (about 11 m) share a forecast
+COORDINATE_PRECISION = 4
+
+DEFAULT_LATITUDE = 50.4375
+DEFAULT_LONGITUDE = 30.5
+
+_weather_client = None
+_weather_executor = None
+
+
+def weather_client() -> CachingHttpClient:
+    """HTTP client shared by all WeatherSDK instances of the container."""
+    global _weather_client
+    if _weather_client is None:
+        _weather_client = CachingHttpClient(
+            session=build_session(pool_size=WEATHER_MAX_WORKERS,
+                                  max_retries=WEATHER_MAX_RETRIES),
+            cache=ResponseCache(),
+            default_ttl=WEATHER_CACHE_TTL_SEC,
+            timeout=(WEATHER_CONNECT_TIMEOUT_SEC, WEATHER_READ_TIMEOUT_SEC),
+        )
+    return _weather_client
+
+
+def weather_executor() -> ThreadPoolExecutor:
+    """Thread pool kept across warm invocations for multi-location fetches."""
+    global _weather_executor
+    if _weather_executor is None:
+        _weather_executor = ThreadPoolExecutor(max_workers=WEATHER_MAX_WORKERS,
+                                               thread_name_prefix='weather')
+    return _weather_executor
+
+
 class WeatherSDK:
-    def __init__(self, latitude, longitude):
+    def __init__(self, latitude, longitude, client=None):
         self.latitude = latitude
         self.longitude = longitude
-        self.base_url = "https://api.open-meteo.com/v1/forecast"
+        self.base_url = WEATHER_API_URL
+        self.client = client or weather_client()
         self.params = {
             'latitude': self.latitude,
             'longitude': self.longitude,
@@ -19,13 +68,90 @@ class WeatherSDK:
         }
 
     def get_weather(self):
+        """
+        Forecast for the location, served from the container cache while
+        it is fresh. The returned dict is shared and must not be mutated.
+        """
         try:
-            response = requests.get(self.base_url, params=self.params)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json(self.base_url, params=self.params)
         except requests.exceptions.RequestException as e:
             return {"error": str(e)}
 
+    @classmethod
+    def get_weather_for(cls, coordinates, client=None, executor=None):
+        """
+        Forecasts for many locations, fetched concurrently. Identical
+        coordinates are fetched once, and requests already in flight for
+        a location are shared through the client.
+        :param coordinates: iterable of (latitude, longitude)
+        :param client: CachingHttpClient, the container one by default
+        :param executor: thread pool, the container one by default
+        :return: ((latitude, longitude), weather) pairs for the unique
+            coordinates in first-seen order; weather holds "error" on failure
+        """
+        unique = list(dict.fromkeys(
+            (round(latitude, COORDINATE_PRECISION), round(longitude, COORDINATE_PRECISION))
+            for latitude, longitude in coordinates
+        ))
+        sdks = [cls(latitude, longitude, client=client) for latitude, longitude in unique]
+        if len(sdks) <= 1:
+            return [(location, sdk.get_weather()) for location, sdk in zip(unique, sdks)]
+        executor = executor or weather_executor()
+        futures = [executor.submit(sdk.get_weather) for sdk in sdks]
+        return [(location, future.result()) for location, future in zip(unique, futures)]
+
+
+def _query_values(event, name):
+    multi_value = (event.get('multiValueQueryStringParameters') or {}).get(name)
+    if multi_value:
+        raw = ','.join(multi_value)
+    else:
+        raw = (event.get('queryStringParameters') or {}).get(name)
+    if raw is None:
+        return None
+    return [value for value in raw.split(',') if value.strip()]
+
+
+def parse_coordinates(event):
+    """
+    Coordinates from the latitude/longitude query parameters, given as
+    comma separated lists or repeated parameters.
+    :return: list of (latitude, longitude), None if neither is given
+    :raises ValueError: on malformed or mismatched lists
+    """
+    latitudes = _query_values(event, 'latitude')
+    longitudes = _query_values(event, 'longitude')
+    if latitudes is None and longitudes is None:
+        return None
+    if not latitudes or not longitudes or len(latitudes) != len(longitudes):
+        raise ValueError('latitude and longitude must be lists of the same length.')
+    if len(latitudes) > WEATHER_MAX_LOCATIONS:
+        raise ValueError(f'At most {WEATHER_MAX_LOCATIONS} locations are supported.')
+    try:
+        coordinates = [(float(latitude), float(longitude))
+                       for latitude, longitude in zip(latitudes, longitudes)]
+    except ValueError:
+        raise ValueError('latitude and longitude must be numbers.')
+    for latitude, longitude in coordinates:
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError(f'Coordinates out of range: {latitude}, {longitude}.')
+    return coordinates
+
+
+def structure_forecast(weather_data):
+    """Explicitly structure the hourly data to match the expected format."""
+    hourly_data = weather_data.get('hourly', {})
+    return {
+        'latitude': weather_data.get('latitude'),
+        'longitude': weather_data.get('longitude'),
+        'hourly': {
+            'time': hourly_data.get('time', []),
+            'temperature_2m': hourly_data.get('temperature_2m', []),
+            'relative_humidity_2m': hourly_data.get('relative_humidity_2m', []),
+            'wind_speed_10m': hourly_data.get('wind_speed_10m', []),
+        }
+    }
+
 
 class ApiHandler(AbstractLambda):
 
@@ -34,41 +160,59 @@ class ApiHandler(AbstractLambda):
 
     def handle_request(self, event, context):
         """
-        Handle the incoming event and fetch weather data
+        Handle the incoming event and fetch weather data, for the
+        latitude/longitude query lists or the default location
         """
-        latitude = float(50.4375)
-        longitude = float(30.5)
+        try:
+            coordinates = parse_coordinates(event or {})
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'body': f"Error: {e}"
+            }
+        if coordinates is not None:
+            return self.handle_locations(coordinates)
 
         # Create an instance of the WeatherSDK
-        weather_sdk = WeatherSDK(latitude, longitude)
-        
+        weather_sdk = WeatherSDK(DEFAULT_LATITUDE, DEFAULT_LONGITUDE)
+
         # Get weather data
         weather_data = weather_sdk.get_weather()
 
         if 'error' in weather_data:
-            _LOG.error(f"Error fetching weather: {weather_data['error']}")
+            _LOG.error("Error fetching weather: %s", weather_data['error'])
             return {
                 'statusCode': 500,
                 'body': f"Error: {weather_data['error']}"
             }
 
-        # Explicitly structure the hourly data to match the expected format
-        hourly_data = weather_data.get('hourly', {})
-        structured_hourly = {
-            'time': hourly_data.get('time', []),
-            'temperature_2m': hourly_data.get('temperature_2m', []),
-            'relative_humidity_2m': hourly_data.get('relative_humidity_2m', []),
-            'wind_speed_10m': hourly_data.get('wind_speed_10m', []),
-        }
-
         # Return the structured response
         return {
             'statusCode': 200,
-            'body': {
-                'latitude': weather_data.get('latitude'),
-                'longitude': weather_data.get('longitude'),
-                'hourly': structured_hourly
-            }
+            'body': structure_forecast(weather_data)
+        }
+
+    def handle_locations(self, coordinates):
+        """
+        Combined response for many locations, one entry per distinct
+        requested location (upstream snaps coordinates to its grid). A
+        location that failed carries its error, and the call fails only
+        if all of them did.
+        """
+        locations = []
+        failed = 0
+        for (latitude, longitude), weather_data in WeatherSDK.get_weather_for(coordinates):
+            requested = {'latitude': latitude, 'longitude': longitude}
+            if 'error' in weather_data:
+                _LOG.error("Error fetching weather for %s, %s: %s",
+                           latitude, longitude, weather_data['error'])
+                failed += 1
+                locations.append({'requested': requested, 'error': weather_data['error']})
+            else:
+                locations.append({'requested': requested, **structure_forecast(weather_data)})
+        return {
+            'statusCode': 500 if failed == len(locations) else 200,
+            'body': {'locations': locations}
         }
 
 HANDLER = ApiHandler()
@@ -0,0 +1,111 @@
+"""
+Local HTTP server standing in for the weather API in tests and
+benchmarks. Every response is scripted through StubServer attributes.
+"""
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this,
+        # keep-alive clients wait for the delayed ACK on every response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        stub = self.server.stub
+        query = dict(parse_qsl(urlsplit(self.path).query))
+        with stub.lock:
+            stub.requests.append((self.path, dict(self.headers)))
+            failure = stub.failures.pop(0) if stub.failures else None
+        if stub.delay:
+            stub.delay_event.wait(stub.delay)
+
+        if failure is not None:
+            self._send(failure, b'{"error": "stub failure"}')
+        elif stub.etag and self.headers.get('If-None-Match') == stub.etag:
+            self._send(304, b'', stub.headers)
+        else:
+            self._send(200, json.dumps(stub.payload(query)).encode(), stub.headers)
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.server.stub.etag:
+            self.send_header('ETag', self.server.stub.etag)
+        try:
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            # The client gave up, e.g. on a read timeout
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def forecast_payload(query):
+    """Open-Meteo shaped forecast for the requested coordinates."""
+    return {
+        'latitude': float(query.get('latitude', 0)),
+        'longitude': float(query.get('longitude', 0)),
+        'hourly': {
+            'time': ['2025-01-01T00:00', '2025-01-01T01:00'],
+            'temperature_2m': [1.5, 1.2],
+            'relative_humidity_2m': [80, 82],
+            'wind_speed_10m': [10.1, 9.8],
+        },
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for every connection of a wide client pool at once
+    request_queue_size = 256
+
+
+class StubServer:
+    """
+    Threaded HTTP server on a free localhost port, used as a context
+    manager. `failures` lists statuses returned before succeeding,
+    `headers` are added to successful responses and `etag` turns on
+    If-None-Match handling.
+    """
+
+    def __init__(self, payload=forecast_payload, headers=None, etag=None,
+                 failures=(), delay=0.0):
+        self.payload = payload
+        self.headers = dict(headers or {})
+        self.etag = etag
+        self.failures = list(failures)
+        self.delay = delay
+        self.delay_event = threading.Event()
+        self.requests = []
+        self.lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={'poll_interval': 0.01}, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/v1/forecast'
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.delay_event.set()
+        self._server.shutdown()
+        self._server.server_close()
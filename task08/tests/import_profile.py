@@ -0,0 +1,99 @@
+"""
+Import-time profile of the lambda handlers, recorded with
+`python -X importtime` in a fresh interpreter so nothing is cached.
+Run it from the project root to print the profile of every lambda:
+    python -m tests.import_profile [lambda_name ...]
+"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from tests import ImportFromSourceContext
+
+# Modules that must not be loaded just by importing a handler
+HEAVY_MODULES = ('boto3', 'botocore', 'aws_xray_sdk', 'requests')
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('import_time_budget_ms', 150))
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class ImportRecord:
+    __slots__ = ('name', 'self_us', 'cumulative_us', 'depth')
+
+    def __init__(self, name, self_us, cumulative_us, depth):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+
+class ImportProfile:
+    """Parsed `-X importtime` output of importing one module."""
+
+    def __init__(self, module, records):
+        self.module = module
+        self.records = records
+        self.modules = {record.name for record in records}
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of the profiled module."""
+        for record in self.records:
+            if record.name == self.module:
+                return record.cumulative_us / 1000
+        raise LookupError(f'{self.module} was not imported')
+
+    def loaded(self, *names):
+        """Which of the given top-level packages got imported."""
+        return [name for name in names if name in self.modules]
+
+    def heaviest(self, count=10):
+        """Records with the largest self time."""
+        return sorted(self.records, key=lambda r: r.self_us, reverse=True)[:count]
+
+    def report(self, count=10) -> str:
+        lines = [f'{self.module}: {self.total_ms:.1f} ms']
+        lines.extend(f'  {r.self_us / 1000:8.2f} ms self | '
+                     f'{r.cumulative_us / 1000:8.2f} ms cumulative | {r.name}'
+                     for r in self.heaviest(count))
+        return '\n'.join(lines)
+
+
+def profile_import(module, source_path=None) -> ImportProfile:
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+    :param module: dotted module name, e.g. 'lambdas.api_handler.handler'
+    :param source_path: folder the module is imported from, the project
+        source folder by default
+    """
+    source_path = str(source_path or ImportFromSourceContext().source_path)
+    env = dict(os.environ, PYTHONPATH=source_path)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=source_path, env=env, capture_output=True, text=True, check=True)
+    records = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us),
+                                        len(indent) // 2))
+    return ImportProfile(module, records)
+
+
+def profile_lambda(lambda_name) -> ImportProfile:
+    """Profile of importing lambdas.<lambda_name>.handler."""
+    return profile_import(f'lambdas.{lambda_name}.handler')
+
+
+def lambda_names():
+    lambdas_path = Path(ImportFromSourceContext().source_path, 'lambdas')
+    return sorted(path.name for path in lambdas_path.iterdir()
+                  if Path(path, 'handler.py').exists())
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or lambda_names():
+        print(profile_lambda(name).report())
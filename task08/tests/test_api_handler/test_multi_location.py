@@ -0,0 +1,89 @@
+import threading
+import time
+from unittest.mock import patch
+
+from tests.http_stub import StubServer
+from tests.test_api_handler import ApiHandlerLambdaTestCase, LAMBDA_HANDLER
+from commons.http_client import CachingHttpClient, ResponseCache, build_session
+
+
+class TestMultiLocation(ApiHandlerLambdaTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client = CachingHttpClient(
+            session=build_session(pool_size=16, max_retries=0),
+            cache=ResponseCache(), default_ttl=900, timeout=(1, 5))
+        client_patch = patch.object(LAMBDA_HANDLER, '_weather_client', self.client)
+        client_patch.start()
+        self.addCleanup(client_patch.stop)
+
+    def serve(self, server):
+        url_patch = patch.object(LAMBDA_HANDLER, 'WEATHER_API_URL', server.url)
+        url_patch.start()
+        self.addCleanup(url_patch.stop)
+        return server
+
+    def event(self, latitude, longitude):
+        return {'queryStringParameters': {'latitude': latitude, 'longitude': longitude}}
+
+    def test_combined_response(self):
+        with self.serve(StubServer()) as server:
+            response = self.HANDLER.handle_request(
+                self.event('50.4375,52.52,50.4375', '30.5,13.41,30.5'), None)
+        self.assertEqual(response['statusCode'], 200)
+        locations = response['body']['locations']
+        self.assertEqual([l['requested'] for l in locations],
+                         [{'latitude': 50.4375, 'longitude': 30.5},
+                          {'latitude': 52.52, 'longitude': 13.41}])
+        self.assertEqual(locations[1]['latitude'], 52.52)
+        self.assertEqual(len(locations[0]['hourly']['time']), 2)
+        self.assertEqual(len(server.requests), 2)
+
+    def test_fetched_concurrently(self):
+        coordinates = [(float(i), float(i)) for i in range(8)]
+        with self.serve(StubServer(delay=0.2)):
+            start = time.perf_counter()
+            results = LAMBDA_HANDLER.WeatherSDK.get_weather_for(coordinates, client=self.client)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all('error' not in weather for _, weather in results))
+        self.assertLess(elapsed, 0.2 * 4)
+
+    def test_in_flight_requests_are_coalesced(self):
+        results = []
+        with self.serve(StubServer(delay=0.2)) as server:
+            sdk = LAMBDA_HANDLER.WeatherSDK(1.0, 2.0, client=self.client)
+            threads = [threading.Thread(target=lambda: results.append(sdk.get_weather()))
+                       for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(server.requests), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_partial_failure(self):
+        with self.serve(StubServer(failures=[500])):
+            response = self.HANDLER.handle_request(self.event('1,3', '2,4'), None)
+        self.assertEqual(response['statusCode'], 200)
+        errors = [l for l in response['body']['locations'] if 'error' in l]
+        self.assertEqual(len(errors), 1)
+
+    def test_all_failed(self):
+        with self.serve(StubServer(failures=[500, 500])):
+            response = self.HANDLER.handle_request(self.event('1,3', '2,4'), None)
+        self.assertEqual(response['statusCode'], 500)
+
+    def test_multi_value_parameters(self):
+        event = {'multiValueQueryStringParameters': {'latitude': ['1', '3'],
+                                                     'longitude': ['2', '4']}}
+        self.assertEqual(LAMBDA_HANDLER.parse_coordinates(event), [(1.0, 2.0), (3.0, 4.0)])
+
+    def test_invalid_parameters(self):
+        for latitude, longitude in (('1,2', '3'), ('north', '3'), ('91', '0'), ('1', None)):
+            params = {'latitude': latitude}
+            if longitude is not None:
+                params['longitude'] = longitude
+            response = self.HANDLER.handle_request({'queryStringParameters': params}, None)
+            self.assertEqual(response['statusCode'], 400, params)
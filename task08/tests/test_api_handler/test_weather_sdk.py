@@ -0,0 +1,97 @@
+from tests.http_stub import StubServer
+from tests.test_api_handler import ApiHandlerLambdaTestCase, LAMBDA_HANDLER
+from commons.http_client import (CachingHttpClient, ResponseCache, build_session,
+                                 freshness_lifetime)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestWeatherSDK(ApiHandlerLambdaTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.clock = FakeClock()
+
+    def client(self, default_ttl=900, max_retries=0):
+        return CachingHttpClient(
+            session=build_session(max_retries=max_retries, backoff_factor=0),
+            cache=ResponseCache(clock=self.clock), default_ttl=default_ttl,
+            timeout=(1, 2))
+
+    def sdk(self, server, client, latitude=50.4375, longitude=30.5):
+        sdk = LAMBDA_HANDLER.WeatherSDK(latitude, longitude, client=client)
+        sdk.base_url = server.url
+        return sdk
+
+    def test_cached_within_ttl(self):
+        client = self.client()
+        with StubServer() as server:
+            first = self.sdk(server, client).get_weather()
+            second = self.sdk(server, client).get_weather()
+            self.clock.now = 901
+            self.sdk(server, client).get_weather()
+        self.assertEqual(first['latitude'], 50.4375)
+        self.assertIs(first, second)
+        self.assertEqual(len(server.requests), 2)
+
+    def test_cache_is_keyed_by_location(self):
+        client = self.client()
+        with StubServer() as server:
+            kyiv = self.sdk(server, client).get_weather()
+            berlin = self.sdk(server, client, 52.52, 13.41).get_weather()
+        self.assertEqual((kyiv['latitude'], berlin['latitude']), (50.4375, 52.52))
+        self.assertEqual(len(server.requests), 2)
+
+    def test_max_age_and_etag_revalidation(self):
+        client = self.client()
+        with StubServer(headers={'Cache-Control': 'max-age=60'}, etag='"v1"') as server:
+            first = self.sdk(server, client).get_weather()
+            self.clock.now = 30
+            self.sdk(server, client).get_weather()
+            self.clock.now = 61
+            revalidated = self.sdk(server, client).get_weather()
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(server.requests[1][1].get('If-None-Match'), '"v1"')
+        self.assertIs(revalidated, first)
+
+    def test_no_store_is_not_cached(self):
+        client = self.client()
+        with StubServer(headers={'Cache-Control': 'no-store'}) as server:
+            self.sdk(server, client).get_weather()
+            self.sdk(server, client).get_weather()
+        self.assertEqual(len(server.requests), 2)
+
+    def test_retries_server_errors(self):
+        client = self.client(max_retries=2)
+        with StubServer(failures=[503, 502]) as server:
+            weather = self.sdk(server, client).get_weather()
+        self.assertNotIn('error', weather)
+        self.assertEqual(len(server.requests), 3)
+
+    def test_error_after_retries(self):
+        client = self.client(max_retries=1)
+        with StubServer(failures=[500, 500]) as server:
+            weather = self.sdk(server, client).get_weather()
+        self.assertIn('error', weather)
+        self.assertEqual(len(client.cache), 0)
+
+    def test_timeout_is_reported(self):
+        client = self.client()
+        client.timeout = (1, 0.05)
+        with StubServer(delay=1) as server:
+            weather = self.sdk(server, client).get_weather()
+        self.assertIn('error', weather)
+
+    def test_freshness_lifetime(self):
+        self.assertEqual(freshness_lifetime({}, 900), 900)
+        self.assertEqual(freshness_lifetime({'Cache-Control': 'public, max-age=120',
+                                             'Age': '20'}, 900), 100)
+        self.assertEqual(freshness_lifetime({'Cache-Control': 'no-cache'}, 900), 0)
+        self.assertIsNone(freshness_lifetime({'Cache-Control': 'private, no-store'}, 900))
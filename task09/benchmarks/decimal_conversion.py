@@ -0,0 +1,62 @@
+"""
+float -> Decimal conversion of forecast payloads: the recursive
+per-item conversion the processor used to define on every request
+against commons.decimal_helper.to_decimal, for hourly series of 1k, 10k
+and 100k values. "rounded" series repeat values the way one-decimal
+temperatures do; "full precision" series never repeat, so they show the
+bulk path without help from the memoization.
+
+    python -m benchmarks.decimal_conversion
+"""
+import random
+from decimal import Decimal
+
+from benchmarks import best_of, load_handler
+
+
+def convert_to_decimal(obj):
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    elif isinstance(obj, list):
+        return [convert_to_decimal(i) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: convert_to_decimal(v) for k, v in obj.items()}
+    return obj
+
+
+def payload(count, decimals):
+    rng = random.Random(count)
+    values = [rng.uniform(-20, 35) for _ in range(count)]
+    if decimals is not None:
+        values = [round(value, decimals) for value in values]
+    return {
+        'elevation': 38.0,
+        'hourly': {
+            'temperature_2m': values,
+            'relative_humidity_2m': [rng.randint(20, 100) for _ in range(count)],
+        },
+        'latitude': 52.52,
+        'timezone': 'GMT',
+    }
+
+
+def run():
+    load_handler()
+    from commons.decimal_helper import float_to_decimal, to_decimal
+
+    for label, decimals in (('rounded', 1), ('full precision', None)):
+        print(label)
+        for count in (1_000, 10_000, 100_000):
+            data = payload(count, decimals)
+            assert to_decimal(data) == convert_to_decimal(data)
+            number = max(1, 100_000 // count)
+            baseline = best_of(lambda: convert_to_decimal(data), number=number)
+            # Cold memo on every run, as for a payload with new values
+            elapsed = best_of(lambda: (float_to_decimal.cache_clear(), to_decimal(data)),
+                              number=number)
+            print(f'  {count:7d} values | closure {baseline * 1e3:8.2f} ms | '
+                  f'to_decimal {elapsed * 1e3:8.2f} ms | {baseline / elapsed:4.1f}x faster')
+
+
+if __name__ == '__main__':
+    run()
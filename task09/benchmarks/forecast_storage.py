@@ -0,0 +1,83 @@
+"""
+Item size, write capacity and client-side write time of a stored
+forecast: the hourly series as DynamoDB lists of Decimals (the "map"
+storage) against commons.forecast_codec packed Binary attributes, with
+and without zlib. The write time covers the conversion and boto3's
+serialization of the item into the PutItem request.
+
+    python -m benchmarks.forecast_storage
+"""
+import math
+import random
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeSerializer
+
+from benchmarks import best_of, load_handler
+
+
+def attribute_size(value) -> int:
+    """Bytes a value adds to a DynamoDB item, after the DynamoDB sizing rules."""
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, Decimal)):
+        digits = len(Decimal(value).normalize().as_tuple().digits)
+        return (digits + 1) // 2 + 1
+    if isinstance(value, dict):
+        return 3 + sum(len(key.encode()) + attribute_size(v) + 1 for key, v in value.items())
+    if isinstance(value, list):
+        return 3 + sum(attribute_size(v) + 1 for v in value)
+    raise TypeError(type(value))
+
+
+def item_size(item) -> int:
+    return sum(len(key.encode()) + attribute_size(value) for key, value in item.items())
+
+
+def convert_to_decimal(obj):
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    elif isinstance(obj, list):
+        return [convert_to_decimal(i) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: convert_to_decimal(v) for k, v in obj.items()}
+    return obj
+
+
+def hourly_forecast(days):
+    rng = random.Random(days)
+    hours = days * 24
+    return {
+        'temperature_2m': [round(5 + 8 * math.sin(h / 24 * 2 * math.pi) + rng.uniform(-1, 1), 1)
+                           for h in range(hours)],
+        'time': [f'2025-01-{1 + h // 24:02d}T{h % 24:02d}:00' for h in range(hours)],
+    }
+
+
+def run():
+    codec = load_handler().encode_hourly
+    serialize = TypeSerializer().serialize
+    for days in (7, 16):
+        hourly = hourly_forecast(days)
+        storages = (
+            ('lists of Decimals', lambda: convert_to_decimal(hourly)),
+            ('columnar', lambda: codec(hourly, compress=False)),
+            ('columnar + zlib', lambda: codec(hourly, compress=True)),
+        )
+        print(f'{days} days, {days * 24} hours')
+        baseline = None
+        for name, encode in storages:
+            size = item_size({'id': 'x' * 36, 'forecast': {'hourly': encode()}})
+            elapsed = best_of(lambda: serialize(encode()), number=50)
+            baseline = baseline or (size, elapsed)
+            print(f'  {name:<18} | {size:6d} B | {math.ceil(size / 1024):2d} WCU | '
+                  f'{elapsed * 1e6:8.1f} us | {baseline[0] / size:4.1f}x smaller | '
+                  f'{baseline[1] / elapsed:4.1f}x faster')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,171 @@
+"""
+Columnar encoding of forecast time series for DynamoDB.
+
+A series of n numbers stored as a DynamoDB list costs an attribute per
+element (and a Decimal conversion for each). Here every series becomes
+one Binary attribute: numbers are scaled to integers by their decimal
+precision, delta encoded into a packed array and optionally zlib
+compressed, and ISO timestamps become delta encoded epoch seconds.
+Decoding gives back exactly the values that were encoded.
+"""
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate, repeat
+from operator import eq, mul, sub, truediv
+
+ENCODING = 'columnar-v1'
+NUMBER_CODEC = 'delta-int'
+FLOAT_CODEC = 'float64'
+TIME_CODEC = 'delta-time'
+# Open-Meteo's iso8601 timestamps, e.g. 2025-01-02T00:00
+MINUTE_TIME_FORMAT = '%Y-%m-%dT%H:%M'
+MAX_DECIMALS = 6
+
+_INT32 = 2 ** 31
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _scaled(values):
+    """
+    Values as integers at the fewest decimals that keep every value
+    exact, up to MAX_DECIMALS (beyond that they are rounded).
+    :return: (scale, integers)
+    """
+    for scale in range(MAX_DECIMALS + 1):
+        factor = 10 ** scale
+        integers = list(map(round, map(mul, values, repeat(factor))))
+        # n / 10**scale is the float nearest to the decimal value, so this
+        # holds exactly when the value has at most `scale` decimals
+        if all(map(eq, map(truediv, integers, repeat(factor)), values)):
+            break
+    return scale, integers
+
+
+def _pack(values, typecode, compress) -> bytes:
+    packed = array(typecode, values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    data = packed.tobytes()
+    return zlib.compress(data, 9) if compress else data
+
+
+def _unpack(data, typecode, compression):
+    if compression == 'zlib':
+        data = zlib.decompress(data)
+    unpacked = array(typecode)
+    unpacked.frombytes(data)
+    if sys.byteorder == 'big':
+        unpacked.byteswap()
+    return unpacked
+
+
+def _deltas(values):
+    return list(map(sub, values, [0, *values[:-1]]))
+
+
+def _binary_bytes(data) -> bytes:
+    # boto3 reads Binary attributes back as boto3.dynamodb.types.Binary
+    return getattr(data, 'value', data)
+
+
+def _typecode(values) -> str:
+    if not values or (-_INT32 <= min(values) and max(values) < _INT32):
+        return 'i'
+    return 'q'
+
+
+def encode_numbers(values, compress=True) -> dict:
+    """
+    :param values: ints or floats; a series with None is kept as float64
+        with NaN for the gaps
+    :param compress: zlib the packed bytes
+    :return: DynamoDB-ready dict describing and holding the series
+    """
+    compression = 'zlib' if compress else None
+    if any(value is None for value in values):
+        data = _pack([float('nan') if value is None else value for value in values],
+                     'd', compress)
+        return {'codec': FLOAT_CODEC, 'count': len(values),
+                'compression': compression, 'data': data}
+
+    scale, integers = _scaled(values)
+    deltas = _deltas(integers)
+    typecode = _typecode(deltas)
+    return {'codec': NUMBER_CODEC, 'scale': scale, 'type': typecode,
+            'count': len(values), 'compression': compression,
+            'data': _pack(deltas, typecode, compress)}
+
+
+def decode_numbers(encoded) -> list:
+    """Inverse of encode_numbers."""
+    compression = encoded.get('compression')
+    data = _binary_bytes(encoded['data'])
+    if encoded['codec'] == FLOAT_CODEC:
+        return [None if value != value else value
+                for value in _unpack(data, 'd', compression)]
+    scale = int(encoded['scale'])
+    integers = accumulate(_unpack(data, encoded['type'], compression))
+    if not scale:
+        return list(integers)
+    return list(map(truediv, integers, repeat(10 ** scale)))
+
+
+def encode_times(values, compress=True) -> dict:
+    """
+    :param values: naive ISO timestamps of one timezone
+    :param compress: zlib the packed bytes
+    :return: DynamoDB-ready dict describing and holding the series
+    """
+    time_format = MINUTE_TIME_FORMAT if all(len(value) == 16 for value in values) else None
+    seconds = [int((datetime.fromisoformat(value) - _EPOCH).total_seconds())
+               for value in values]
+    deltas = _deltas(seconds)
+    typecode = _typecode(deltas)
+    return {'codec': TIME_CODEC, 'format': time_format, 'type': typecode,
+            'count': len(values), 'compression': 'zlib' if compress else None,
+            'data': _pack(deltas, typecode, compress)}
+
+
+def decode_times(encoded) -> list:
+    """Inverse of encode_times."""
+    seconds = accumulate(_unpack(_binary_bytes(encoded['data']), encoded['type'],
+                                 encoded.get('compression')))
+    time_format = encoded.get('format')
+    times = (_EPOCH + timedelta(seconds=value) for value in seconds)
+    if time_format:
+        return [time.strftime(time_format) for time in times]
+    return [time.isoformat() for time in times]
+
+
+def encode_hourly(hourly, compress=True) -> dict:
+    """
+    Columnar form of an hourly block: "time" as timestamps, every other
+    series as numbers.
+    """
+    encoded = {'encoding': ENCODING}
+    for name, values in hourly.items():
+        if name == 'time':
+            encoded[name] = encode_times(values, compress)
+        else:
+            encoded[name] = encode_numbers(values, compress)
+    return encoded
+
+
+def decode_hourly(hourly) -> dict:
+    """
+    Plain lists from a stored hourly block; blocks written as lists
+    (without the columnar encoding marker) are returned unchanged.
+    """
+    if hourly.get('encoding') != ENCODING:
+        return hourly
+    decoded = {}
+    for name, encoded in hourly.items():
+        if name == 'encoding':
+            continue
+        if encoded['codec'] == TIME_CODEC:
+            decoded[name] = decode_times(encoded)
+        else:
+            decoded[name] = decode_numbers(encoded)
+    return decoded
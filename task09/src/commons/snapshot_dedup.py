@@ -0,0 +1,113 @@
+"""
+Content-addressed writes of snapshots that are refetched far more often
+than they change.
+
+A snapshot is identified by the hash of its normalized content. A warm
+container remembers the hashes it has stored and skips those puts
+outright; everything else is put with a condition on the key not
+existing, so a snapshot stored by another container is not written
+again either.
+"""
+import hashlib
+import json
+import uuid
+from collections import OrderedDict
+
+from commons.lazy_import import lazy_import
+
+botocore_exceptions = lazy_import('botocore.exceptions')
+
+# Ids of snapshots are UUIDs derived from their content hash
+SNAPSHOT_NAMESPACE = uuid.UUID('6f1c2b0e-8d5a-4c3e-9b7f-2a4e6d8c0b1f')
+
+WRITTEN = 'written'
+SKIPPED_MEMO = 'skipped_memo'
+SKIPPED_CONDITIONAL = 'skipped_conditional'
+
+
+def content_hash(payload, exclude=()) -> str:
+    """
+    SHA-256 of the canonical JSON of a payload: keys sorted, no
+    whitespace, so equal content always hashes the same.
+    :param payload: JSON-like dict
+    :param exclude: top-level keys left out, e.g. ones that change on
+        every fetch of the same content
+    """
+    if exclude:
+        payload = {key: value for key, value in payload.items() if key not in exclude}
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'),
+                           ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def snapshot_id(digest) -> str:
+    """Deterministic UUID string for a content hash."""
+    return str(uuid.uuid5(SNAPSHOT_NAMESPACE, digest))
+
+
+class SnapshotWriter:
+    """
+    Puts snapshots at most once per content hash and counts the writes
+    it avoided.
+    """
+
+    def __init__(self, memo_size=1024, key_name='id'):
+        """
+        :param memo_size: hashes remembered by the container
+        :param key_name: hash key attribute of the table
+        """
+        self.memo_size = memo_size
+        self.key_name = key_name
+        self._stored = OrderedDict()
+        self.stats = dict.fromkeys((WRITTEN, SKIPPED_MEMO, SKIPPED_CONDITIONAL), 0)
+
+    def is_stored(self, digest) -> bool:
+        """
+        Whether this container already stored the snapshot; a hit counts
+        as an avoided write, so check before building the item.
+        """
+        if digest not in self._stored:
+            return False
+        self._stored.move_to_end(digest)
+        self.stats[SKIPPED_MEMO] += 1
+        return True
+
+    def put(self, table, item, digest) -> str:
+        """
+        Conditionally puts the item unless it is stored already.
+        :return: WRITTEN, SKIPPED_MEMO or SKIPPED_CONDITIONAL
+        :raises botocore.exceptions.ClientError: on failures other than
+            the item existing
+        """
+        if self.is_stored(digest):
+            return SKIPPED_MEMO
+        try:
+            table.put_item(Item=item,
+                           ConditionExpression='attribute_not_exists(#key)',
+                           ExpressionAttributeNames={'#key': self.key_name})
+            outcome = WRITTEN
+        except botocore_exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            outcome = SKIPPED_CONDITIONAL
+        self.stats[outcome] += 1
+        self._remember(digest)
+        return outcome
+
+    def _remember(self, digest):
+        self._stored[digest] = None
+        self._stored.move_to_end(digest)
+        while len(self._stored) > self.memo_size:
+            self._stored.popitem(last=False)
+
+    @property
+    def writes_avoided(self) -> int:
+        return self.stats[SKIPPED_MEMO] + self.stats[SKIPPED_CONDITIONAL]
+
+    def report(self) -> dict:
+        return {**self.stats, 'writes_avoided': self.writes_avoided}
+
+    def clear(self):
+        self._stored.clear()
+        for outcome in self.stats:
+            self.stats[outcome] = 0
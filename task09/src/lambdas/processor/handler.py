@@ -1,18 +1,46 @@
 import os
 import uuid
-import boto3
-import requests
-from decimal import Decimal
 
-from aws_xray_sdk.core import patch_all
-
-patch_all()
-
-from commons.log_helper import get_logger
+from commons.log_helper import get_logger, lazy
 from commons.abstract_lambda import AbstractLambda
+from commons.aws_clients import get_table
+from commons.decimal_helper import to_decimal
+from commons.forecast_codec import encode_hourly
+from commons.lazy_import import lazy_import
+from commons.snapshot_dedup import SnapshotWriter, content_hash, snapshot_id
 
 _LOG = get_logger('Processor-handler')
 
+requests = lazy_import('requests')
+xray_core = lazy_import('aws_xray_sdk.core')
+
+# Trace the outgoing HTTP and DynamoDB calls; the X-Ray SDK is loaded
+# with the first invocation instead of at import
+XRAY_ENABLED = os.environ.get('xray_enabled', 'true').lower() == 'true'
+XRAY_PATCHED_LIBRARIES = ('requests', 'botocore')
+_xray_patched = False
+
+# "map" stores the hourly series as DynamoDB lists of numbers, "columnar"
+# packs each series into one Binary attribute (see commons.forecast_codec)
+FORECAST_STORAGE = os.environ.get('forecast_storage', 'map').lower()
+# "zlib" or "none", for the columnar storage
+FORECAST_COMPRESSION = os.environ.get('forecast_compression', 'zlib').lower()
+
+# Store each distinct forecast once, keyed by its content hash, instead of
+# a new item per invocation (see commons.snapshot_dedup)
+FORECAST_DEDUP = os.environ.get('forecast_dedup', 'false').lower() == 'true'
+SNAPSHOT_MEMO_SIZE = int(os.environ.get('snapshot_memo_size', 1024))
+# Differs between fetches of the same forecast
+VOLATILE_FORECAST_FIELDS = ('generationtime_ms',)
+SNAPSHOT_WRITER = SnapshotWriter(memo_size=SNAPSHOT_MEMO_SIZE)
+
+
+def patch_xray():
+    global _xray_patched
+    if XRAY_ENABLED and not _xray_patched:
+        xray_core.patch(XRAY_PATCHED_LIBRARIES)
+        _xray_patched = True
+
 class Processor(AbstractLambda):
     def validate_request(self, event) -> dict:
         # You can implement some event validation if needed
@@ -20,54 +48,64 @@ class Processor(AbstractLambda):
 
     def handle_request(self, event, context):
         self.validate_request(event)
-        _LOG.info(f"Received event: '{event}', processing.")
+        patch_xray()
+        _LOG.info("Received event: '%s', processing.", lazy(event))
         url = "https://api.open-meteo.com/v1/forecast?latitude=52.52&longitude=13.41&current=temperature_2m,wind_speed_10m&hourly=temperature_2m,relative_humidity_2m,wind_speed_10m"
         response = requests.get(url)
         forecast_data = response.json()
 
         table_name = os.environ.get("target_table", "Weather")
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.Table(table_name)
-        _LOG.info(f"found table: {table} for write")
-
-        # Convert all float types to Decimal
-        def convert_to_decimal(obj):
-            if isinstance(obj, float):
-                return Decimal(str(obj))
-            elif isinstance(obj, list):
-                return [convert_to_decimal(i) for i in obj]
-            elif isinstance(obj, dict):
-                return {k: convert_to_decimal(v) for k, v in obj.items()}
-            return obj
+        table = get_table(table_name)
+        _LOG.info("found table: %s for write", table)
+
+        hourly = {
+            "temperature_2m": forecast_data["hourly"].get("temperature_2m", []),
+            "time": forecast_data["hourly"].get("time", []),
+        }
+        forecast = {
+            "elevation": forecast_data.get("elevation"),
+            "generationtime_ms": forecast_data.get("generationtime_ms"),
+            "hourly": hourly,
+            "hourly_units": {
+                "temperature_2m": forecast_data["hourly_units"].get("temperature_2m"),
+                "time": forecast_data["hourly_units"].get("time"),
+            },
+            "latitude": forecast_data.get("latitude"),
+            "longitude": forecast_data.get("longitude"),
+            "timezone": forecast_data.get("timezone"),
+            "timezone_abbreviation": forecast_data.get("timezone_abbreviation"),
+            "utc_offset_seconds": forecast_data.get("utc_offset_seconds"),
+        }
+        if FORECAST_DEDUP:
+            digest = content_hash(forecast, exclude=VOLATILE_FORECAST_FIELDS)
+            if SNAPSHOT_WRITER.is_stored(digest):
+                _LOG.info("Forecast %s is already stored, write skipped: %s",
+                          digest, lazy(SNAPSHOT_WRITER.report()))
+                return 200
 
+        columnar = FORECAST_STORAGE == 'columnar'
         # Convert forecast_data to match DynamoDB requirements
         item = {
-            "id": str(uuid.uuid4()),
-            "forecast": convert_to_decimal({
-                "elevation": forecast_data.get("elevation"),
-                "generationtime_ms": forecast_data.get("generationtime_ms"),
-                "hourly": {
-                    "temperature_2m": forecast_data["hourly"].get("temperature_2m", []),
-                    "time": forecast_data["hourly"].get("time", []),
-                },
-                "hourly_units": {
-                    "temperature_2m": forecast_data["hourly_units"].get("temperature_2m"),
-                    "time": forecast_data["hourly_units"].get("time"),
-                },
-                "latitude": forecast_data.get("latitude"),
-                "longitude": forecast_data.get("longitude"),
-                "timezone": forecast_data.get("timezone"),
-                "timezone_abbreviation": forecast_data.get("timezone_abbreviation"),
-                "utc_offset_seconds": forecast_data.get("utc_offset_seconds"),
-            })
+            "id": snapshot_id(digest) if FORECAST_DEDUP else str(uuid.uuid4()),
+            "forecast": to_decimal({**forecast, "hourly": {}} if columnar else forecast),
         }
+        if FORECAST_DEDUP:
+            item["content_hash"] = digest
+        if columnar:
+            item["forecast"]["hourly"] = encode_hourly(
+                hourly, compress=FORECAST_COMPRESSION == 'zlib')
 
-        _LOG.info(f"prepared an item to be saved: {item}")
+        _LOG.debug("prepared an item to be saved: %s", lazy(item))
         try:
-            table.put_item(Item=item)
+            if FORECAST_DEDUP:
+                outcome = SNAPSHOT_WRITER.put(table, item, digest)
+                _LOG.info("Forecast %s %s: %s", digest, outcome,
+                          lazy(SNAPSHOT_WRITER.report()))
+            else:
+                table.put_item(Item=item)
             return 200
         except Exception as e:
-            _LOG.error(f"something went wrong, received error: {e}")
+            _LOG.error("something went wrong, received error: %s", e)
             return 400
 
 HANDLER = Processor()
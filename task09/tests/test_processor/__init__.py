@@ -4,6 +4,7 @@ from tests import ImportFromSourceContext
 
 with ImportFromSourceContext():
     LAMBDA_HANDLER = importlib.import_module('lambdas.processor.handler')
+    aws_clients = importlib.import_module('commons.aws_clients')
 
 
 class ProcessorLambdaTestCase(unittest.TestCase):
@@ -11,4 +12,9 @@ class ProcessorLambdaTestCase(unittest.TestCase):
 
     def setUp(self) -> None:
         self.HANDLER = LAMBDA_HANDLER.Processor()
-
+        # Handlers memoize boto3 resources, which tests replace with mocks
+        aws_clients.clear()
+        self.addCleanup(aws_clients.clear)
+        # Stored forecasts are remembered by the warm container
+        LAMBDA_HANDLER.SNAPSHOT_WRITER.clear()
+        self.addCleanup(LAMBDA_HANDLER.SNAPSHOT_WRITER.clear)
@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+from tests.test_processor import ProcessorLambdaTestCase
+from commons.decimal_helper import to_decimal
+
+
+class TestDecimalHelper(ProcessorLambdaTestCase):
+
+    def test_floats_become_decimals_of_their_str(self):
+        values = [0.1, 1.5, -7.25, 1e-07, 12345678.9, 0.1]
+        self.assertEqual(to_decimal(values), [Decimal(str(v)) for v in values])
+        self.assertEqual(to_decimal(0.1), Decimal('0.1'))
+
+    def test_nested_payload(self):
+        payload = {
+            'elevation': 38.0,
+            'hourly': {'time': ['2025-01-01T00:00'], 'temperature_2m': [1.5, None, 2],
+                       'series': [[0.5], {'x': 1.25}]},
+            'timezone': 'GMT',
+            'utc_offset_seconds': 0,
+            'flag': True,
+        }
+        self.assertEqual(to_decimal(payload), {
+            'elevation': Decimal('38.0'),
+            'hourly': {'time': ['2025-01-01T00:00'],
+                       'temperature_2m': [Decimal('1.5'), None, 2],
+                       'series': [[Decimal('0.5')], {'x': Decimal('1.25')}]},
+            'timezone': 'GMT',
+            'utc_offset_seconds': 0,
+            'flag': True,
+        })
+
+    def test_returns_copies(self):
+        values = [1, 2, 3]
+        payload = {'values': values}
+        converted = to_decimal(payload)
+        self.assertIsNot(converted['values'], values)
+        converted['values'].append(4)
+        self.assertEqual(values, [1, 2, 3])
@@ -0,0 +1,65 @@
+from unittest.mock import patch, MagicMock
+
+from boto3.dynamodb.types import Binary
+
+from tests.test_processor import ProcessorLambdaTestCase, LAMBDA_HANDLER
+from commons.forecast_codec import (decode_hourly, decode_numbers, decode_times,
+                                    encode_hourly, encode_numbers, encode_times)
+
+TIMES = [f'2025-01-{day:02d}T{hour:02d}:00' for day in (1, 2) for hour in range(24)]
+TEMPERATURES = [round(-3.5 + 0.7 * i, 1) for i in range(48)]
+
+
+class TestForecastCodec(ProcessorLambdaTestCase):
+
+    def test_numbers_round_trip(self):
+        for values in (TEMPERATURES, [1, 5, -3, 2 ** 40], [0.125, 2.5, -7.0],
+                       [1.5, None, 2.25], []):
+            for compress in (True, False):
+                self.assertEqual(decode_numbers(encode_numbers(values, compress)), values)
+
+    def test_times_round_trip(self):
+        self.assertEqual(decode_times(encode_times(TIMES)), TIMES)
+        with_seconds = ['2025-01-01T00:00:30', '2025-01-01T00:15:00']
+        self.assertEqual(decode_times(encode_times(with_seconds, compress=False)),
+                         with_seconds)
+
+    def test_hourly_round_trip_through_binary(self):
+        encoded = encode_hourly({'time': TIMES, 'temperature_2m': TEMPERATURES})
+        # What boto3 hands back when the item is read
+        for series in encoded.values():
+            if isinstance(series, dict):
+                series['data'] = Binary(series['data'])
+        self.assertEqual(decode_hourly(encoded),
+                         {'time': TIMES, 'temperature_2m': TEMPERATURES})
+
+    def test_list_storage_passes_through(self):
+        hourly = {'time': TIMES, 'temperature_2m': TEMPERATURES}
+        self.assertIs(decode_hourly(hourly), hourly)
+
+    def test_compact(self):
+        encoded = encode_numbers(TEMPERATURES * 4)
+        self.assertLess(len(encoded['data']), len(TEMPERATURES * 4))
+
+
+class TestColumnarStorage(ProcessorLambdaTestCase):
+
+    @patch.object(LAMBDA_HANDLER, 'FORECAST_STORAGE', 'columnar')
+    @patch.object(LAMBDA_HANDLER, 'patch_xray', lambda: None)
+    def test_columnar_item(self):
+        forecast = {
+            'elevation': 10, 'generationtime_ms': 0.5, 'latitude': 52.52,
+            'longitude': 13.41, 'timezone': 'GMT', 'timezone_abbreviation': 'GMT',
+            'utc_offset_seconds': 0,
+            'hourly': {'time': TIMES, 'temperature_2m': TEMPERATURES},
+            'hourly_units': {'time': 'iso8601', 'temperature_2m': '°C'},
+        }
+        table = MagicMock()
+        with patch.object(LAMBDA_HANDLER, 'requests') as requests, \
+                patch.object(LAMBDA_HANDLER, 'get_table', return_value=table):
+            requests.get.return_value.json.return_value = forecast
+            self.assertEqual(self.HANDLER.handle_request({}, None), 200)
+        item = table.put_item.call_args.kwargs['Item']
+        self.assertIsInstance(item['forecast']['hourly']['time']['data'], bytes)
+        self.assertEqual(decode_hourly(item['forecast']['hourly']),
+                         {'time': TIMES, 'temperature_2m': TEMPERATURES})
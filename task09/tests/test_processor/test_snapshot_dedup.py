@@ -0,0 +1,114 @@
+from unittest.mock import patch, MagicMock
+
+from botocore.exceptions import ClientError
+
+from tests.test_processor import ProcessorLambdaTestCase, LAMBDA_HANDLER
+from commons.snapshot_dedup import content_hash, snapshot_id
+
+
+def forecast_response(temperatures=(1.2, 3.4), generationtime_ms=12.34):
+    return {
+        "elevation": 10,
+        "generationtime_ms": generationtime_ms,
+        "hourly": {
+            "temperature_2m": list(temperatures),
+            "time": ["2025-01-02T00:00", "2025-01-02T01:00"],
+        },
+        "hourly_units": {"temperature_2m": "°C", "time": "iso8601"},
+        "latitude": 52.52,
+        "longitude": 13.419998,
+        "timezone": "GMT",
+        "timezone_abbreviation": "GMT",
+        "utc_offset_seconds": 0,
+    }
+
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'PutItem')
+
+
+@patch.object(LAMBDA_HANDLER, 'FORECAST_DEDUP', True)
+@patch("requests.get")
+@patch("boto3.resource")
+class TestSnapshotDedup(ProcessorLambdaTestCase):
+
+    def invoke(self, mock_boto_resource, mock_requests_get, response, table=None):
+        table = table or MagicMock()
+        mock_boto_resource.return_value.Table.return_value = table
+        mock_requests_get.return_value.json.return_value = response
+        return self.HANDLER.handle_request({}, {}), table
+
+    def test_unchanged_forecast_is_written_once(self, mock_boto_resource, mock_requests_get):
+        status, table = self.invoke(mock_boto_resource, mock_requests_get,
+                                    forecast_response(generationtime_ms=1.0))
+        self.assertEqual(status, 200)
+        # Only the generation time differs
+        status, _ = self.invoke(mock_boto_resource, mock_requests_get,
+                                forecast_response(generationtime_ms=2.0), table)
+        self.assertEqual(status, 200)
+
+        table.put_item.assert_called_once()
+        kwargs = table.put_item.call_args.kwargs
+        self.assertEqual(kwargs['ConditionExpression'], 'attribute_not_exists(#key)')
+        digest = kwargs['Item']['content_hash']
+        self.assertEqual(kwargs['Item']['id'], snapshot_id(digest))
+        self.assertEqual(LAMBDA_HANDLER.SNAPSHOT_WRITER.report(), {
+            'written': 1, 'skipped_memo': 1, 'skipped_conditional': 0,
+            'writes_avoided': 1})
+
+    def test_changed_forecast_is_written(self, mock_boto_resource, mock_requests_get):
+        _, table = self.invoke(mock_boto_resource, mock_requests_get, forecast_response())
+        self.invoke(mock_boto_resource, mock_requests_get,
+                    forecast_response(temperatures=(1.2, 3.5)), table)
+
+        self.assertEqual(table.put_item.call_count, 2)
+        ids = {call.kwargs['Item']['id'] for call in table.put_item.call_args_list}
+        self.assertEqual(len(ids), 2)
+
+    def test_stored_by_another_container(self, mock_boto_resource, mock_requests_get):
+        table = MagicMock()
+        table.put_item.side_effect = client_error('ConditionalCheckFailedException')
+        status, _ = self.invoke(mock_boto_resource, mock_requests_get,
+                                forecast_response(), table)
+        self.assertEqual(status, 200)
+        self.assertEqual(LAMBDA_HANDLER.SNAPSHOT_WRITER.writes_avoided, 1)
+
+        # Remembered from now on
+        self.invoke(mock_boto_resource, mock_requests_get, forecast_response(), table)
+        table.put_item.assert_called_once()
+
+    def test_other_errors_are_not_remembered(self, mock_boto_resource, mock_requests_get):
+        table = MagicMock()
+        table.put_item.side_effect = [client_error('ProvisionedThroughputExceededException'),
+                                      None]
+        status, _ = self.invoke(mock_boto_resource, mock_requests_get,
+                                forecast_response(), table)
+        self.assertEqual(status, 400)
+        status, _ = self.invoke(mock_boto_resource, mock_requests_get,
+                                forecast_response(), table)
+        self.assertEqual(status, 200)
+        self.assertEqual(table.put_item.call_count, 2)
+
+    def test_content_hash_is_canonical(self, *mocks):
+        self.assertEqual(content_hash({'a': 1, 'b': [1.5, None]}),
+                         content_hash({'b': [1.5, None], 'a': 1}))
+        self.assertEqual(content_hash({'a': 1, 't': 1.0}, exclude=('t',)),
+                         content_hash({'a': 1, 't': 2.0}, exclude=('t',)))
+        self.assertNotEqual(content_hash({'a': 1}), content_hash({'a': 1.5}))
+
+
+@patch("requests.get")
+@patch("boto3.resource")
+class TestWithoutDedup(ProcessorLambdaTestCase):
+
+    def test_every_forecast_is_written(self, mock_boto_resource, mock_requests_get):
+        # forecast_dedup is off unless enabled in the environment
+        self.assertFalse(LAMBDA_HANDLER.FORECAST_DEDUP)
+        table = mock_boto_resource.return_value.Table.return_value
+        mock_requests_get.return_value.json.return_value = forecast_response()
+        for _ in range(2):
+            self.assertEqual(self.HANDLER.handle_request({}, {}), 200)
+
+        self.assertEqual(table.put_item.call_count, 2)
+        ids = {call.kwargs['Item']['id'] for call in table.put_item.call_args_list}
+        self.assertEqual(len(ids), 2)
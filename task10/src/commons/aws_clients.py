@@ -0,0 +1,137 @@
+"""
+Warm-container registry of boto3 clients, resources and Table handles.
+
+Building a client or resource loads service models and opens a new
+connection pool, which costs milliseconds per invocation. Everything
+handed out here is built on first use and kept for the life of the
+container, keyed by service, region and client configuration.
+"""
+import os
+import threading
+
+from commons.lazy_import import lazy_import
+
+# Loaded with the first client, not when a handler module is imported
+boto3 = lazy_import('boto3')
+botocore_config = lazy_import('botocore.config')
+
+MAX_POOL_CONNECTIONS = int(os.environ.get('boto_max_pool_connections', 50))
+CONNECT_TIMEOUT_SEC = float(os.environ.get('boto_connect_timeout', 2))
+READ_TIMEOUT_SEC = float(os.environ.get('boto_read_timeout', 10))
+MAX_ATTEMPTS = int(os.environ.get('boto_max_attempts', 3))
+
+DEFAULT_CONFIG = {
+    'max_pool_connections': MAX_POOL_CONNECTIONS,
+    'connect_timeout': CONNECT_TIMEOUT_SEC,
+    'read_timeout': READ_TIMEOUT_SEC,
+    'retries': {'mode': 'standard', 'max_attempts': MAX_ATTEMPTS},
+    # Keep idle pooled connections alive between warm invocations
+    'tcp_keepalive': True,
+}
+
+_lock = threading.Lock()
+_clients = {}
+_resources = {}
+_tables = {}
+_thread_local = threading.local()
+
+
+def _key(*parts, config_overrides):
+    # botocore Config objects are not hashable, so the overrides are keyed
+    # by their representation
+    return parts + (repr(sorted(config_overrides.items())),)
+
+
+def _config(config_overrides):
+    return botocore_config.Config(**{**DEFAULT_CONFIG, **config_overrides})
+
+
+def get_client(service_name, region_name=None, **config_overrides):
+    """
+    Memoized boto3 client. Clients are thread safe and shared by all
+    threads.
+    :param service_name: e.g. 's3'
+    :param region_name: region, defaults to the boto3 resolution chain
+    :param config_overrides: botocore Config arguments replacing the defaults
+    """
+    key = _key(service_name, region_name, config_overrides=config_overrides)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = boto3.client(service_name, region_name=region_name,
+                                      config=_config(config_overrides))
+                _clients[key] = client
+    return client
+
+
+def get_resource(service_name, region_name=None, per_thread=False,
+                 **config_overrides):
+    """
+    Memoized boto3 resource.
+    :param service_name: e.g. 'dynamodb'
+    :param region_name: region, defaults to the boto3 resolution chain
+    :param per_thread: resources are not thread safe; give every thread
+        its own, built from a dedicated session
+    :param config_overrides: botocore Config arguments replacing the defaults
+    """
+    key = _key(service_name, region_name, config_overrides=config_overrides)
+    if per_thread:
+        resources = _thread_resources()
+        resource = resources.get(key)
+        if resource is None:
+            with _lock:
+                session = boto3.session.Session()
+            resource = session.resource(service_name, region_name=region_name,
+                                        config=_config(config_overrides))
+            resources[key] = resource
+        return resource
+
+    resource = _resources.get(key)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(key)
+            if resource is None:
+                resource = boto3.resource(service_name, region_name=region_name,
+                                          config=_config(config_overrides))
+                _resources[key] = resource
+    return resource
+
+
+def get_table(table_name, region_name=None, per_thread=False):
+    """
+    Memoized DynamoDB Table handle on the shared (or per thread) resource.
+    :param table_name: DynamoDB table name
+    :param region_name: region, defaults to the boto3 resolution chain
+    :param per_thread: see get_resource
+    """
+    key = (table_name, region_name)
+    tables = _thread_tables() if per_thread else _tables
+    table = tables.get(key)
+    if table is None:
+        table = get_resource('dynamodb', region_name,
+                             per_thread=per_thread).Table(table_name)
+        tables[key] = table
+    return table
+
+
+def _thread_resources():
+    if not hasattr(_thread_local, 'resources'):
+        _thread_local.resources = {}
+    return _thread_local.resources
+
+
+def _thread_tables():
+    if not hasattr(_thread_local, 'tables'):
+        _thread_local.tables = {}
+    return _thread_local.tables
+
+
+def clear():
+    """Drop every memoized client, resource and table (used by tests)."""
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _tables.clear()
+        _thread_local.__dict__.clear()
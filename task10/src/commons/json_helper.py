@@ -0,0 +1,39 @@
+import json
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """
+    Converts the types boto3 returns for DynamoDB attributes that JSON has
+    no encoding for: N as Decimal (int when whole, else float) and
+    SS/NS/BS as set.
+    """
+    if isinstance(obj, Decimal):
+        # to_integral_value, unlike obj % 1, works past the 28 digit context
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps(obj) -> str:
+    """
+    Serializes DynamoDB items to a JSON string. Uses orjson when it is
+    installed, which calls the Decimal hook from C and encodes several
+    times faster, otherwise falls back to the stdlib encoder. orjson only
+    encodes integers of up to 64 bits; objects holding larger ones (DynamoDB
+    numbers have up to 38 digits) are encoded by the stdlib encoder too.
+    :param obj: object to serialize, may contain Decimal and set values
+    :return: JSON string
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default).decode()
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, default=_default)
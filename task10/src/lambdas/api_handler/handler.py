@@ -2,21 +2,27 @@ import json
 import os
 import random
 import uuid
-from decimal import Decimal
-
-import boto3
-from boto3.dynamodb.conditions import Attr  # For overlap checking
 
+from commons import RESPONSE_BAD_REQUEST_CODE
 from commons.abstract_lambda import AbstractLambda
-from commons.log_helper import get_logger
+from commons.aws_clients import get_client, get_table
+from commons.exception import ApplicationException
+from commons.json_helper import dumps as json_dumps
+from commons.lazy_import import lazy_import, lazy_object
+from commons.log_helper import get_logger, lazy
+from commons.pagination import InvalidPageRequest, fetch_page, parse_page_params
+from commons.router import Route, Router
+
+# For overlap checking
+conditions = lazy_import('boto3.dynamodb.conditions')
 
 _LOG = get_logger('ApiHandler-handler')
 
 # --- Cognito client ---
-cognito_client = boto3.client(
+cognito_client = lazy_object(lambda: get_client(
     'cognito-idp',
     region_name=os.environ.get('region', 'eu-central-1')
-)
+))
 
 # --- Environment variables ---
 CUP_ID = os.environ.get('cup_id')
@@ -24,23 +30,11 @@ CLIENT_ID = os.environ.get('cup_client_id')
 tables_name = os.environ.get("tables_table")
 reservations_name = os.environ.get("reservations_table")
 
-# --- DynamoDB setup ---
-dynamodb = boto3.resource(
-    'dynamodb',
-    region_name=os.environ.get('region', 'eu-central-1')
-)
-tables_table = dynamodb.Table(tables_name)
-reservations_table = dynamodb.Table(reservations_name)
-
-# -------------------
-# Decimal -> JSON fix
-# -------------------
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            # Convert to int if it’s a whole number, else float
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+# --- DynamoDB setup (built on first use, e.g. never for /signup) ---
+tables_table = lazy_object(lambda: get_table(
+    tables_name, region_name=os.environ.get('region', 'eu-central-1')))
+reservations_table = lazy_object(lambda: get_table(
+    reservations_name, region_name=os.environ.get('region', 'eu-central-1')))
 
 class ApiHandler(AbstractLambda):
     """
@@ -53,62 +47,16 @@ class ApiHandler(AbstractLambda):
 
     def handle_request(self, event, context):
         """
-        Main dispatch for the API endpoints.
+        Main dispatch for the API endpoints, see ROUTER below.
         """
-        _LOG.info("Lambda event: %s", json.dumps(event))
-        method = event.get('httpMethod')
-        path = event.get('resource')
-        body = {}
-
-        # Parse JSON body if present
-        if event.get('body'):
-            try:
-                body = json.loads(event['body'])
-            except Exception as e:
-                _LOG.error("Error parsing request body: %s", str(e))
-                return {
-                    "statusCode": 400,
-                    "headers": {"Content-Type": "application/json"},
-                    "body": json.dumps({"message": "Invalid JSON input."})
-                }
-
-        _LOG.info("Received request. Path: %s, Method: %s", path, method)
-
-        # -----------------------
-        #    PUBLIC ENDPOINTS
-        # -----------------------
-        if path == '/signup' and method == 'POST':
-            return self.signup(body)
-
-        if path == '/signin' and method == 'POST':
-            return self.signin(body)
-
-        # -----------------------
-        # PROTECTED ENDPOINTS (with Cognito)
-        # -----------------------
-        if path == '/tables' and method == 'GET':
-            return self.get_tables()
-
-        if path == '/tables' and method == 'POST':
-            return self.create_table(body)
-
-        if path == '/tables/{tableId}' and method == 'GET':
-            table_id = event.get('pathParameters', {}).get('tableId')
-            return self.get_table_by_id(table_id)
-
-        if path == '/reservations' and method == 'GET':
-            return self.get_reservations()
-
-        if path == '/reservations' and method == 'POST':
-            return self.create_reservation(body)
-
-        # If no route is matched:
-        _LOG.warning("No matching route found for path: %s, method: %s", path, method)
-        return {
-            "statusCode": 400,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({"message": f"Unsupported path {path} or method {method}"})
-        }
+        try:
+            return ROUTER.dispatch(event, self)
+        except ApplicationException as e:
+            return {
+                "statusCode": e.code,
+                "headers": {"Content-Type": "application/json"},
+                "body": json.dumps({"message": e.content})
+            }
 
     def signup(self, body: dict):
         """
@@ -141,7 +89,7 @@ class ApiHandler(AbstractLambda):
                 Username=email
             )
         except Exception as e:
-            _LOG.error(f"Sign up error for email '{email}': {str(e)}")
+            _LOG.error("Sign up error for email '%s': %s", email, e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -187,7 +135,7 @@ class ApiHandler(AbstractLambda):
                 }
             )
 
-            _LOG.info("admin_initiate_auth response: %s", auth_result)
+            _LOG.debug("admin_initiate_auth response: %s", lazy(auth_result))
 
             if auth_result and 'AuthenticationResult' in auth_result:
                 id_token = auth_result['AuthenticationResult'].get('IdToken')
@@ -206,7 +154,7 @@ class ApiHandler(AbstractLambda):
                     "body": json.dumps({'message': 'Unable to authenticate user.'})
                 }
         except Exception as e:
-            _LOG.error(f"Sign in error for email '{email}': {str(e)}")
+            _LOG.error("Sign in error for email '%s': %s", email, e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -214,9 +162,10 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({'message': 'Invalid login.'})
             }
 
-    def get_tables(self):
+    def get_tables(self, query_params=None):
         """
-        Return a list of all tables.
+        Return a page of tables. Optional query parameters:
+        limit (1-1000, default 100) and nextToken from the previous page.
         {
           "tables": [
             {
@@ -227,21 +176,34 @@ class ApiHandler(AbstractLambda):
               "minOrder": ...
             },
             ...
-          ]
+          ],
+          "nextToken": string, present while more pages remain
         }
         """
-        _LOG.info("Fetching all tables from DynamoDB.")
+        _LOG.info("Fetching a page of tables from DynamoDB.")
+        try:
+            limit, start_key = parse_page_params(query_params)
+        except InvalidPageRequest as e:
+            _LOG.error(str(e))
+            return {
+                "statusCode": 400,
+                "headers": {"Content-Type": "application/json"},
+                "body": json.dumps({'message': str(e)})
+            }
+
         try:
-            response = tables_table.scan()
-            items = response.get('Items', [])
-            _LOG.info("Tables scan response: %s", items)
+            items, next_token = fetch_page(tables_table.scan, limit, start_key)
+            _LOG.info("Tables scan returned %d items.", len(items))
+            result = {"tables": items}
+            if next_token:
+                result["nextToken"] = next_token
             return {
                 "statusCode": 200,
                 "headers": {"Content-Type": "application/json"},
-                "body": json.dumps({"tables": items}, cls=DecimalEncoder)
+                "body": json_dumps(result)
             }
         except Exception as e:
-            _LOG.error(f"Error fetching tables: {str(e)}")
+            _LOG.error("Error fetching tables: %s", e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -260,7 +222,7 @@ class ApiHandler(AbstractLambda):
           "minOrder": optional int
         }
         """
-        _LOG.info("Request to create a new table. Body: %s", body)
+        _LOG.info("Request to create a new table. Body: %s", lazy(body))
         table_id = body.get('id')
         table_number = body.get('number')
         places = body.get('places')
@@ -294,7 +256,7 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({"id": table_id})
             }
         except Exception as e:
-            _LOG.error(f"Error creating table: {str(e)}")
+            _LOG.error("Error creating table: %s", e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -334,14 +296,14 @@ class ApiHandler(AbstractLambda):
                     "body": json.dumps({'message': f'Table with id {table_id} not found.'})
                 }
 
-            _LOG.info("Retrieved table data: %s", item)
+            _LOG.debug("Retrieved table data: %s", lazy(item))
             return {
                 "statusCode": 200,
                 "headers": {"Content-Type": "application/json"},
-                "body": json.dumps(item, cls=DecimalEncoder)
+                "body": json_dumps(item)
             }
         except Exception as e:
-            _LOG.error(f"Error fetching table by ID {table_id}: {str(e)}")
+            _LOG.error("Error fetching table by ID %s: %s", table_id, e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -349,9 +311,10 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({'message': f'Unable to retrieve table {table_id}.'})
             }
 
-    def get_reservations(self):
+    def get_reservations(self, query_params=None):
         """
-        Return a list of all reservations.
+        Return a page of reservations. Optional query parameters:
+        limit (1-1000, default 100) and nextToken from the previous page.
         {
           "reservations": [
             {
@@ -363,21 +326,34 @@ class ApiHandler(AbstractLambda):
               "slotTimeEnd": string (HH:MM)
             },
             ...
-          ]
+          ],
+          "nextToken": string, present while more pages remain
         }
         """
-        _LOG.info("Fetching all reservations from DynamoDB.")
+        _LOG.info("Fetching a page of reservations from DynamoDB.")
         try:
-            response = reservations_table.scan()
-            items = response.get('Items', [])
-            _LOG.info("Reservations scan response: %s", items)
+            limit, start_key = parse_page_params(query_params)
+        except InvalidPageRequest as e:
+            _LOG.error(str(e))
+            return {
+                "statusCode": 400,
+                "headers": {"Content-Type": "application/json"},
+                "body": json.dumps({'message': str(e)})
+            }
+
+        try:
+            items, next_token = fetch_page(reservations_table.scan, limit, start_key)
+            _LOG.info("Reservations scan returned %d items.", len(items))
+            result = {"reservations": items}
+            if next_token:
+                result["nextToken"] = next_token
             return {
                 "statusCode": 200,
                 "headers": {"Content-Type": "application/json"},
-                "body": json.dumps({"reservations": items}, cls=DecimalEncoder)
+                "body": json_dumps(result)
             }
         except Exception as e:
-            _LOG.error(f"Error fetching reservations: {str(e)}")
+            _LOG.error("Error fetching reservations: %s", e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -398,7 +374,7 @@ class ApiHandler(AbstractLambda):
         }
         Returns: { "reservationId": <uuidv4> }
         """
-        _LOG.info("Request to create a new reservation. Body: %s", body)
+        _LOG.info("Request to create a new reservation. Body: %s", lazy(body))
         table_number = body.get('tableNumber')
         client_name = body.get('clientName')
         phone_number = body.get('phoneNumber')
@@ -423,7 +399,7 @@ class ApiHandler(AbstractLambda):
             }
         try:
             check_resp = tables_table.scan(
-                FilterExpression=Attr("number").eq(int(table_number))
+                FilterExpression=conditions.Attr("number").eq(int(table_number))
             )
             found_items = check_resp.get('Items', [])
             if not found_items:
@@ -447,8 +423,8 @@ class ApiHandler(AbstractLambda):
         try:
             existing_reservations = reservations_table.scan(
                 FilterExpression=(
-                    Attr("tableNumber").eq(int(table_number)) &
-                    Attr("date").eq(date_val)
+                    conditions.Attr("tableNumber").eq(int(table_number)) &
+                    conditions.Attr("date").eq(date_val)
                 )
             ).get('Items', [])
 
@@ -500,7 +476,7 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({"reservationId": reservation_id_str})
             }
         except Exception as e:
-            _LOG.error(f"Error creating reservation: {str(e)}")
+            _LOG.error("Error creating reservation: %s", e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -509,11 +485,40 @@ class ApiHandler(AbstractLambda):
             }
 
 
+# -----------------------
+# Route table
+# -----------------------
+def json_object_body(request):
+    if not isinstance(request.body, dict):
+        raise ApplicationException(code=RESPONSE_BAD_REQUEST_CODE,
+                                   content='A JSON object is expected.')
+
+
+ROUTER = Router([
+    #    PUBLIC ENDPOINTS
+    Route('POST', '/signup', lambda handler, request: handler.signup(request.body),
+          [json_object_body]),
+    Route('POST', '/signin', lambda handler, request: handler.signin(request.body),
+          [json_object_body]),
+    # PROTECTED ENDPOINTS (with Cognito)
+    Route('GET', '/tables',
+          lambda handler, request: handler.get_tables(request.query_params)),
+    Route('POST', '/tables', lambda handler, request: handler.create_table(request.body),
+          [json_object_body]),
+    Route('GET', '/tables/{tableId}',
+          lambda handler, request: handler.get_table_by_id(request.path_params.get('tableId'))),
+    Route('GET', '/reservations',
+          lambda handler, request: handler.get_reservations(request.query_params)),
+    Route('POST', '/reservations',
+          lambda handler, request: handler.create_reservation(request.body),
+          [json_object_body]),
+])
+
 HANDLER = ApiHandler()
 
 def lambda_handler(event, context):
     """
     AWS Lambda entry point.
     """
-    _LOG.info("Entered lambda_handler with event: %s", json.dumps(event))
+    _LOG.info("Entered lambda_handler.")
     return HANDLER.handle_request(event, context)
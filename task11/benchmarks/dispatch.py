@@ -0,0 +1,79 @@
+"""
+Per-request dispatch overhead of ApiHandler.handle_request: the previous
+if-chain, which serialized every event with json.dumps before routing,
+against commons.router. Route targets are stubbed so only dispatch is
+measured.
+
+    python -m benchmarks.dispatch
+"""
+import json
+import logging
+
+from benchmarks import best_of, load_handler
+
+EVENT = {
+    'resource': '/reservations',
+    'path': '/reservations',
+    'httpMethod': 'GET',
+    'headers': {f'Header-{i}': 'x' * 40 for i in range(20)},
+    'queryStringParameters': {'limit': '50'},
+    'pathParameters': None,
+    'requestContext': {
+        'authorizer': {'claims': {'sub': 'user', 'email': 'user@example.com'}},
+        'identity': {'sourceIp': '127.0.0.1', 'userAgent': 'benchmark'},
+    },
+    'body': None,
+}
+
+
+class StubHandler:
+
+    def get_tables(self, query_params):
+        return 200
+
+    def get_reservations(self, query_params):
+        return 200
+
+
+def if_chain(handler, event):
+    """handle_request before the router, minus the endpoints themselves."""
+    logging.getLogger('benchmark').info("Lambda event: %s", json.dumps(event))
+    method = event.get('httpMethod')
+    path = event.get('resource')
+    body = json.loads(event['body']) if event.get('body') else {}
+    if path == '/signup' and method == 'POST':
+        return body
+    if path == '/signin' and method == 'POST':
+        return body
+    if path == '/tables' and method == 'GET':
+        return handler.get_tables(event.get('queryStringParameters'))
+    if path == '/tables' and method == 'POST':
+        return body
+    if path == '/tables/{tableId}' and method == 'GET':
+        return event.get('pathParameters', {}).get('tableId')
+    if path == '/reservations' and method == 'GET':
+        return handler.get_reservations(event.get('queryStringParameters'))
+    return None
+
+
+def run():
+    module = load_handler()
+    logging.getLogger('benchmark').setLevel(logging.INFO)
+    logging.getLogger('benchmark').addHandler(logging.NullHandler())
+    logging.getLogger('benchmark').propagate = False
+    router_logger = logging.getLogger('commons.log_helper.router')
+    router_logger.disabled = True
+    stub = StubHandler()
+    number = 20_000
+
+    old = best_of(lambda: if_chain(stub, EVENT), number=number)
+    new = best_of(lambda: module.ROUTER.dispatch(EVENT, stub), number=number)
+    templated = best_of(lambda: module.ROUTER.resolve('GET', '/tables/42'),
+                        number=number)
+    print(f'if-chain + json.dumps(event) {old * 1e6:8.2f} us/request')
+    print(f'router dispatch (INFO)       {new * 1e6:8.2f} us/request')
+    print(f'router resolve, raw path     {templated * 1e6:8.2f} us/request')
+
+
+if __name__ == '__main__':
+    run()
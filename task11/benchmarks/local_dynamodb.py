@@ -0,0 +1,235 @@
+"""
+In-process stand-in for a boto3 DynamoDB ``Table`` resource.
+
+Supports the calls used by the handlers (get_item, put_item, scan, query)
+including FilterExpression/KeyConditionExpression built with
+boto3.dynamodb.conditions, Limit/ExclusiveStartKey pagination,
+Segment/TotalSegments and global secondary indexes. Every request is
+charged a fixed ``latency`` to model the network round-trip, and the
+number of requests and items read is recorded so benchmarks can report
+consumed capacity as well as wall time.
+"""
+import threading
+import time
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import ConditionBase
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+def _to_dynamodb(value):
+    """Mimic boto3's deserializer: numbers come back as Decimal."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _to_dynamodb(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_dynamodb(v) for v in value]
+    return value
+
+
+def _operand(value, item):
+    if isinstance(value, ConditionBase):
+        return evaluate(value, item)
+    name = getattr(value, 'name', None)
+    if name is not None and hasattr(value, 'eq'):
+        return item.get(name)
+    return value
+
+
+def evaluate(condition, item):
+    """Evaluate a boto3 condition object against a plain item dict."""
+    expression = condition.get_expression()
+    operator = expression['operator']
+    values = [_operand(v, item) for v in expression['values']]
+    if operator == 'AND':
+        return values[0] and values[1]
+    if operator == 'OR':
+        return values[0] or values[1]
+    if operator == 'NOT':
+        return not values[0]
+    if operator == 'attribute_exists':
+        return values[0] is not None
+    if operator == 'attribute_not_exists':
+        return values[0] is None
+    if values[0] is None:
+        return False
+    if operator == '=':
+        return values[0] == values[1]
+    if operator == '<>':
+        return values[0] != values[1]
+    if operator == '<':
+        return values[0] < values[1]
+    if operator == '<=':
+        return values[0] <= values[1]
+    if operator == '>':
+        return values[0] > values[1]
+    if operator == '>=':
+        return values[0] >= values[1]
+    if operator == 'BETWEEN':
+        return values[1] <= values[0] <= values[2]
+    if operator == 'begins_with':
+        return values[0].startswith(values[1])
+    if operator == 'IN':
+        return values[0] in values[1]
+    if operator == 'contains':
+        return values[1] in values[0]
+    raise NotImplementedError(f'Unsupported operator {operator}')
+
+
+def _hash_value(condition, hash_key):
+    """Find the equality value for hash_key in a KeyConditionExpression."""
+    expression = condition.get_expression()
+    if expression['operator'] == 'AND':
+        for value in expression['values']:
+            found = _hash_value(value, hash_key)
+            if found is not None:
+                return found
+        return None
+    left = expression['values'][0]
+    if expression['operator'] == '=' and getattr(left, 'name', None) == hash_key:
+        return _to_dynamodb(expression['values'][1])
+    return None
+
+
+def _project(item, projection, names):
+    if not projection:
+        return item
+    attributes = [names.get(a.strip(), a.strip()) for a in projection.split(',')]
+    return {a: item[a] for a in attributes if a in item}
+
+
+class LocalTable:
+    """In-memory DynamoDB table with a hash primary key."""
+
+    def __init__(self, hash_key='id', indexes=None,
+                 page_size=DEFAULT_PAGE_SIZE, latency=0.0):
+        """
+        :param hash_key: primary key attribute name
+        :param indexes: {index_name: (hash_key, sort_key or None)}
+        :param page_size: items evaluated per page, standing in for the 1 MB limit
+        :param latency: seconds charged per request
+        """
+        self.hash_key = hash_key
+        self.indexes = dict(indexes or {})
+        self.page_size = page_size
+        self.latency = latency
+        self.requests = 0
+        self.items_read = 0
+        self._keys = []
+        self._items = {}
+        self._positions = {}
+        self._index_data = {name: {} for name in self.indexes}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def reset_counters(self):
+        self.requests = 0
+        self.items_read = 0
+
+    def _charge(self, items_read):
+        with self._lock:
+            self.requests += 1
+            self.items_read += items_read
+        if self.latency:
+            time.sleep(self.latency)
+
+    def load(self, items):
+        """Bulk insert without charging requests, for seeding benchmarks."""
+        for item in items:
+            self._store(_to_dynamodb(item))
+
+    def _store(self, item):
+        key = item[self.hash_key]
+        if key not in self._items:
+            self._positions[key] = len(self._keys)
+            self._keys.append(key)
+        else:
+            self._unindex(self._items[key])
+        self._items[key] = item
+        for name, (index_hash, _) in self.indexes.items():
+            if index_hash in item:
+                self._index_data[name].setdefault(item[index_hash], []).append(item)
+
+    def _unindex(self, item):
+        for name, (index_hash, _) in self.indexes.items():
+            bucket = self._index_data[name].get(item.get(index_hash), [])
+            if item in bucket:
+                bucket.remove(item)
+
+    def put_item(self, Item, **kwargs):
+        with self._lock:
+            self._store(_to_dynamodb(Item))
+        self._charge(0)
+        return {}
+
+    def get_item(self, Key, **kwargs):
+        item = self._items.get(_to_dynamodb(Key[self.hash_key]))
+        self._charge(1 if item else 0)
+        return {'Item': item} if item else {}
+
+    def scan(self, FilterExpression=None, Limit=None, ExclusiveStartKey=None,
+             Segment=0, TotalSegments=1, ProjectionExpression=None,
+             ExpressionAttributeNames=None, Select=None, **kwargs):
+        total = len(self._keys)
+        segment_start = Segment * total // TotalSegments
+        segment_end = (Segment + 1) * total // TotalSegments
+        start = segment_start
+        if ExclusiveStartKey:
+            start = self._positions[ExclusiveStartKey[self.hash_key]] + 1
+        end = min(segment_end, start + (Limit or self.page_size))
+        items = [self._items[k] for k in self._keys[start:end]]
+        self._charge(len(items))
+        response = {'ScannedCount': len(items)}
+        if FilterExpression is not None:
+            items = [i for i in items if evaluate(FilterExpression, i)]
+        response['Count'] = len(items)
+        if Select != 'COUNT':
+            names = ExpressionAttributeNames or {}
+            response['Items'] = [
+                _project(i, ProjectionExpression, names) for i in items]
+        if end < segment_end:
+            response['LastEvaluatedKey'] = {self.hash_key: self._keys[end - 1]}
+        return response
+
+    def query(self, KeyConditionExpression, IndexName=None,
+              FilterExpression=None, Limit=None, ExclusiveStartKey=None,
+              ProjectionExpression=None, ExpressionAttributeNames=None,
+              Select=None, ScanIndexForward=True, **kwargs):
+        if IndexName is None:
+            hash_key, sort_key = self.hash_key, None
+            item = self._items.get(
+                _hash_value(KeyConditionExpression, hash_key))
+            bucket = [item] if item else []
+        else:
+            hash_key, sort_key = self.indexes[IndexName]
+            bucket = self._index_data[IndexName].get(
+                _hash_value(KeyConditionExpression, hash_key), [])
+        if sort_key:
+            bucket = sorted(bucket, key=lambda i: i.get(sort_key),
+                            reverse=not ScanIndexForward)
+        matched = [i for i in bucket if evaluate(KeyConditionExpression, i)]
+        start = 0
+        if ExclusiveStartKey:
+            keys = [i[self.hash_key] for i in matched]
+            start = keys.index(ExclusiveStartKey[self.hash_key]) + 1
+        end = min(len(matched), start + (Limit or self.page_size))
+        items = matched[start:end]
+        self._charge(len(items))
+        response = {'ScannedCount': len(items)}
+        if FilterExpression is not None:
+            items = [i for i in items if evaluate(FilterExpression, i)]
+        response['Count'] = len(items)
+        if Select != 'COUNT':
+            names = ExpressionAttributeNames or {}
+            response['Items'] = [
+                _project(i, ProjectionExpression, names) for i in items]
+        if end < len(matched):
+            response['LastEvaluatedKey'] = {
+                self.hash_key: matched[end - 1][self.hash_key]}
+        return response
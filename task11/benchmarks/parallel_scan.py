@@ -0,0 +1,40 @@
+"""
+Throughput of commons.parallel_scan against the local DynamoDB stand-in
+for an increasing number of segments. Each scan request is charged a fixed
+round-trip latency, which is what the thread pool overlaps.
+
+    python -m benchmarks.parallel_scan [rows] [latency_ms]
+"""
+import sys
+import time
+
+from benchmarks import load_handler
+from benchmarks.local_dynamodb import LocalTable
+
+SEGMENTS = (1, 2, 4, 8, 16)
+
+
+def run(rows=200_000, latency_ms=20.0):
+    load_handler()
+    from commons.parallel_scan import parallel_scan
+
+    table = LocalTable(latency=latency_ms / 1000)
+    table.load({'id': i, 'tableNumber': i % 50, 'date': '2025-02-01',
+                'slotTimeStart': '18:00', 'slotTimeEnd': '20:00'}
+               for i in range(rows))
+
+    baseline = None
+    for segments in SEGMENTS:
+        start = time.perf_counter()
+        count = sum(1 for _ in parallel_scan(lambda: table,
+                                             total_segments=segments))
+        elapsed = time.perf_counter() - start
+        assert count == rows, count
+        baseline = baseline or elapsed
+        print(f'{segments:>3} segments | {elapsed * 1e3:9.1f} ms | '
+              f'{rows / elapsed:12,.0f} items/s | '
+              f'speedup x{baseline / elapsed:5.2f}')
+
+
+if __name__ == '__main__':
+    run(*[float(a) if i else int(a) for i, a in enumerate(sys.argv[1:])])
@@ -0,0 +1,57 @@
+"""
+Serialization cost of 10k-item table and reservation listings: the old
+DecimalEncoder against commons.json_helper, with and without orjson.
+
+    python -m benchmarks.serialization [items]
+"""
+import json
+import sys
+from decimal import Decimal
+
+from benchmarks import best_of, load_handler
+
+
+class DecimalEncoder(json.JSONEncoder):
+    """The encoder the handlers used before json_helper."""
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return int(obj) if obj % 1 == 0 else float(obj)
+        return super(DecimalEncoder, self).default(obj)
+
+
+def listings(count):
+    tables = [{'id': Decimal(i), 'number': Decimal(i), 'places': Decimal(4),
+               'isVip': i % 2 == 0, 'minOrder': Decimal('12.5')}
+              for i in range(count)]
+    reservations = [{'id': Decimal(i), 'reservationId': f'{i:032x}',
+                     'tableNumber': Decimal(i % 50), 'clientName': 'John Doe',
+                     'phoneNumber': '123456789', 'date': '2025-02-01',
+                     'slotTimeStart': '18:00', 'slotTimeEnd': '20:00'}
+                    for i in range(count)]
+    return {'tables': tables}, {'reservations': reservations}
+
+
+def run(count=10_000):
+    load_handler()
+    from commons import json_helper
+
+    orjson = json_helper.orjson
+    for payload in listings(count):
+        name = next(iter(payload))
+        before = best_of(lambda: json.dumps(payload, cls=DecimalEncoder))
+        assert json.loads(json_helper.dumps(payload)) == json.loads(
+            json.dumps(payload, cls=DecimalEncoder))
+        json_helper.orjson = None
+        stdlib = best_of(lambda: json_helper.dumps(payload))
+        json_helper.orjson = orjson
+        line = (f'{count} {name:<12} | DecimalEncoder {before * 1e3:7.2f} ms | '
+                f'json_helper (stdlib) {stdlib * 1e3:7.2f} ms')
+        if orjson is not None:
+            fast = best_of(lambda: json_helper.dumps(payload))
+            line += f' | json_helper (orjson) {fast * 1e3:7.2f} ms'
+        print(line)
+
+
+if __name__ == '__main__':
+    run(*[int(a) for a in sys.argv[1:]])
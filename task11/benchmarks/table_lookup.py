@@ -0,0 +1,65 @@
+"""
+Compares the table-existence check used by create_reservation: a filtered
+scan over the tables table against the "number" GSI query (cold) and the
+warm-container cache (warm), at 10k, 100k and 1M table rows.
+
+    python -m benchmarks.table_lookup [rows ...]
+"""
+import sys
+
+from boto3.dynamodb.conditions import Attr
+
+from benchmarks import best_of, load_handler
+from benchmarks.local_dynamodb import LocalTable
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def scan_for_number(table, number):
+    """The scan-based check, walking every page until a match is found."""
+    params = {'FilterExpression': Attr("number").eq(number)}
+    while True:
+        response = table.scan(**params)
+        if response.get('Items'):
+            return True
+        if 'LastEvaluatedKey' not in response:
+            return False
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def run(rows):
+    handler = load_handler()
+    table = LocalTable(indexes={handler.TABLES_BY_NUMBER_INDEX: ('number', None)})
+    table.load({'id': i, 'number': i, 'places': 4, 'isVip': False}
+               for i in range(rows))
+    handler.tables_table = table
+    # Worst case for the scan: the number lives on the last page
+    number = rows - 1
+
+    table.reset_counters()
+    scan_time = best_of(lambda: scan_for_number(table, number), repeat=1)
+    scan_requests, scan_read = table.requests, table.items_read
+
+    def cold_lookup():
+        handler.known_table_numbers.clear()
+        handler.table_number_exists(number)
+
+    table.reset_counters()
+    query_time = best_of(cold_lookup, number=100)
+    query_requests = table.requests / 500
+    query_read = table.items_read / 500
+
+    handler.table_number_exists(number)
+    warm_time = best_of(lambda: handler.table_number_exists(number),
+                        number=10_000)
+
+    print(f'{rows:>9} rows | scan {scan_time * 1e3:10.2f} ms '
+          f'({scan_requests} requests, {scan_read} items read) | '
+          f'index query {query_time * 1e6:8.2f} us '
+          f'({query_requests:.0f} request, {query_read:.0f} items read) | '
+          f'warm cache {warm_time * 1e6:6.2f} us')
+
+
+if __name__ == '__main__':
+    for size in [int(a) for a in sys.argv[1:]] or DEFAULT_SIZES:
+        run(size)
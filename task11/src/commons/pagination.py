@@ -0,0 +1,100 @@
+import base64
+import json
+
+from commons.lazy_import import lazy_import
+
+dynamodb_types = lazy_import('boto3.dynamodb.types')
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+class InvalidPageRequest(ValueError):
+    pass
+
+
+def encode_token(last_evaluated_key) -> str:
+    """
+    Turns a DynamoDB LastEvaluatedKey into an opaque, URL-safe cursor.
+    Key values are kept in DynamoDB typed form so numbers round-trip exactly.
+    :param last_evaluated_key: key dict returned by scan/query
+    :return: cursor string
+    """
+    typed = {k: dynamodb_types.TypeSerializer().serialize(v) for k, v in last_evaluated_key.items()}
+    raw = json.dumps(typed, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_token(token: str) -> dict:
+    """
+    Inverse of encode_token.
+    :param token: cursor string received as the nextToken query parameter
+    :return: key dict to pass as ExclusiveStartKey
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        typed = json.loads(raw)
+        return {k: dynamodb_types.TypeDeserializer().deserialize(v) for k, v in typed.items()}
+    except Exception as e:
+        raise InvalidPageRequest(f'Invalid nextToken: {token}') from e
+
+
+def parse_page_params(query_params) -> tuple:
+    """
+    Reads `limit` and `nextToken` from API Gateway queryStringParameters.
+    :param query_params: queryStringParameters of the event, may be None
+    :return: (limit, exclusive_start_key or None)
+    """
+    query_params = query_params or {}
+    limit = query_params.get('limit')
+    if limit is None:
+        limit = DEFAULT_PAGE_LIMIT
+    else:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise InvalidPageRequest(f'Invalid limit: {limit}')
+        if not 0 < limit <= MAX_PAGE_LIMIT:
+            raise InvalidPageRequest(
+                f'limit must be between 1 and {MAX_PAGE_LIMIT}')
+    token = query_params.get('nextToken')
+    return limit, decode_token(token) if token else None
+
+
+def fetch_page(operation, limit, exclusive_start_key=None, **kwargs) -> tuple:
+    """
+    Reads a single page of at most `limit` items.
+    :param operation: bound table.scan or table.query
+    :param limit: maximum number of items to return
+    :param exclusive_start_key: key to resume from, or None
+    :param kwargs: extra scan/query parameters
+    :return: (items, next_token or None)
+    """
+    items = []
+    while True:
+        params = dict(kwargs, Limit=limit - len(items))
+        if exclusive_start_key:
+            params['ExclusiveStartKey'] = exclusive_start_key
+        response = operation(**params)
+        items.extend(response.get('Items', []))
+        exclusive_start_key = response.get('LastEvaluatedKey')
+        # A filtered page may come back short; keep reading to fill it
+        if not exclusive_start_key or len(items) >= limit:
+            break
+    next_token = encode_token(exclusive_start_key) if exclusive_start_key else None
+    return items, next_token
+
+
+def iter_items(operation, **kwargs):
+    """
+    Yields every item of a scan/query, one page in memory at a time.
+    :param operation: bound table.scan or table.query
+    :param kwargs: extra scan/query parameters
+    """
+    while True:
+        response = operation(**kwargs)
+        yield from response.get('Items', [])
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return
+        kwargs['ExclusiveStartKey'] = last_evaluated_key
@@ -0,0 +1,95 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+DEFAULT_TOTAL_SEGMENTS = 8
+DEFAULT_MAX_BUFFERED_PAGES = 16
+
+_SEGMENT_DONE = object()
+_PUT_TIMEOUT_SEC = 0.1
+
+
+class _SegmentFailed:
+
+    def __init__(self, error):
+        self.error = error
+
+
+def parallel_scan(table_factory, total_segments=DEFAULT_TOTAL_SEGMENTS,
+                  max_workers=None,
+                  max_buffered_pages=DEFAULT_MAX_BUFFERED_PAGES,
+                  executor=None, **scan_kwargs):
+    """
+    Scans a table with Segment/TotalSegments across a thread pool and yields
+    its items as one merged stream, in no particular order.
+
+    Workers hand whole pages over a bounded queue, so at most
+    `max_buffered_pages` pages are held in memory: when the consumer falls
+    behind the workers block until it catches up. Closing the generator
+    early stops the workers.
+    :param table_factory: callable returning an object with a boto3-style
+        `scan`, called once per segment. boto3 resources are not thread
+        safe, so production callers should build a Table per call.
+    :param total_segments: number of scan segments
+    :param max_workers: concurrent segment scans, defaults to total_segments;
+        ignored with an executor
+    :param max_buffered_pages: pages buffered between workers and consumer
+    :param executor: long-lived executor to run the segment scans on, so
+        its threads (and what they keep per thread) outlive one scan; a
+        pool of its own is created and shut down otherwise
+    :param scan_kwargs: extra scan parameters, e.g. FilterExpression
+    """
+    pages = queue.Queue(maxsize=max_buffered_pages)
+    stop = threading.Event()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=_PUT_TIMEOUT_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan_segment(segment):
+        try:
+            table = table_factory()
+            params = dict(scan_kwargs, Segment=segment,
+                          TotalSegments=total_segments)
+            while not stop.is_set():
+                response = table.scan(**params)
+                if not put(response.get('Items', [])):
+                    return
+                last_evaluated_key = response.get('LastEvaluatedKey')
+                if not last_evaluated_key:
+                    break
+                params['ExclusiveStartKey'] = last_evaluated_key
+            put(_SEGMENT_DONE)
+        except Exception as e:
+            put(_SegmentFailed(e))
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers or total_segments,
+                                      thread_name_prefix='parallel-scan')
+    futures = []
+    try:
+        for segment in range(total_segments):
+            futures.append(executor.submit(scan_segment, segment))
+        remaining = total_segments
+        while remaining:
+            entry = pages.get()
+            if entry is _SEGMENT_DONE:
+                remaining -= 1
+            elif isinstance(entry, _SegmentFailed):
+                raise entry.error
+            else:
+                yield from entry
+    finally:
+        stop.set()
+        if own_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            for future in futures:
+                future.cancel()
+            wait(futures)
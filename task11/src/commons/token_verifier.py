@@ -0,0 +1,208 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+import urllib.request
+from collections import OrderedDict
+
+from commons import RESPONSE_SERVICE_UNAVAILABLE_CODE, RESPONSE_UNAUTHORIZED
+from commons.exception import ApplicationException
+from commons.log_helper import get_logger
+
+_LOG = get_logger('token-verifier')
+
+DEFAULT_JWKS_TTL_SEC = 3600
+# Minimum delay between refreshes triggered by an unknown key id, so forged
+# tokens can't make every request re-download the key set
+MIN_JWKS_REFRESH_INTERVAL_SEC = 60
+DEFAULT_CACHE_SIZE = 1024
+JWKS_FETCH_TIMEOUT_SEC = 5
+
+# DER prefix of the DigestInfo structure for SHA-256 (RFC 8017, 9.2)
+_SHA256_DIGEST_INFO = bytes.fromhex('3031300d060960864801650304020105000420')
+
+
+def _b64url_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+def _b64url_to_int(value: str) -> int:
+    return int.from_bytes(_b64url_decode(value), 'big')
+
+
+def _unauthorized(message):
+    return ApplicationException(code=RESPONSE_UNAUTHORIZED, content=message)
+
+
+def verify_rs256(signing_input: bytes, signature: bytes, n: int, e: int) -> bool:
+    """
+    RSASSA-PKCS1-v1_5 verification with SHA-256. Verification only needs
+    the public exponent, so plain modular exponentiation is enough.
+    :param signing_input: b'<header>.<payload>' of the token
+    :param signature: decoded signature bytes
+    :param n: key modulus
+    :param e: key public exponent
+    """
+    k = (n.bit_length() + 7) // 8
+    s = int.from_bytes(signature, 'big')
+    if len(signature) != k or s >= n:
+        return False
+    encoded = pow(s, e, n).to_bytes(k, 'big')
+    t = _SHA256_DIGEST_INFO + hashlib.sha256(signing_input).digest()
+    expected = b'\x00\x01' + b'\xff' * (k - len(t) - 3) + b'\x00' + t
+    return hmac.compare_digest(encoded, expected)
+
+
+class JwksCache:
+    """Public keys of a Cognito user pool, refreshed every `ttl` seconds."""
+
+    def __init__(self, url, ttl=DEFAULT_JWKS_TTL_SEC, fetch=None):
+        """
+        :param url: JWKS endpoint
+        :param ttl: seconds before the key set is downloaded again
+        :param fetch: callable(url) -> JWKS dict, defaults to an HTTP GET
+        """
+        self.url = url
+        self.ttl = ttl
+        self._fetch = fetch or self._http_fetch
+        self._keys = {}
+        self._expires_at = 0.0
+        self._fetched_at = None
+
+    @staticmethod
+    def _http_fetch(url):
+        with urllib.request.urlopen(url, timeout=JWKS_FETCH_TIMEOUT_SEC) as response:
+            return json.loads(response.read())
+
+    def _refresh(self):
+        """
+        Downloads the key set. When the download or the key set is broken
+        the keys already known stay in use until the next attempt, which
+        waits MIN_JWKS_REFRESH_INTERVAL_SEC.
+        :raises ApplicationException: 503 when no keys are known at all
+        """
+        _LOG.info('Fetching JWKS from %s', self.url)
+        self._fetched_at = time.monotonic()
+        try:
+            jwks = self._fetch(self.url)
+            keys = {
+                key['kid']: (_b64url_to_int(key['n']), _b64url_to_int(key['e']))
+                for key in jwks.get('keys', [])
+                if key.get('kty') == 'RSA'
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            _LOG.error('Failed to load JWKS from %s: %r', self.url, e)
+            self._expires_at = self._fetched_at + MIN_JWKS_REFRESH_INTERVAL_SEC
+            if not self._keys:
+                raise ApplicationException(code=RESPONSE_SERVICE_UNAVAILABLE_CODE,
+                                           content='Token signing keys are unavailable.')
+            return
+        self._keys = keys
+        self._expires_at = self._fetched_at + self.ttl
+
+    def get(self, kid):
+        """
+        :return: (n, e) for the key id, or None if the pool has no such key
+        """
+        now = time.monotonic()
+        if now >= self._expires_at:
+            self._refresh()
+        elif kid not in self._keys and \
+                now - self._fetched_at >= MIN_JWKS_REFRESH_INTERVAL_SEC:
+            # Cognito may have rotated its keys since the last download
+            self._refresh()
+        return self._keys.get(kid)
+
+
+class TokenVerifier:
+    """
+    Verifies Cognito user pool JWTs inside the lambda. Tokens that already
+    passed verification are kept in a bounded LRU until they expire, so a
+    warm container re-checks a known token with a dict lookup.
+    """
+
+    def __init__(self, region, user_pool_id, client_id, token_use='id',
+                 jwks_ttl=DEFAULT_JWKS_TTL_SEC,
+                 cache_size=DEFAULT_CACHE_SIZE, fetch=None):
+        """
+        :param region: user pool region
+        :param user_pool_id: Cognito user pool id
+        :param client_id: app client id the tokens must be issued for
+        :param token_use: 'id' or 'access'
+        :param jwks_ttl: seconds the user pool keys are cached for
+        :param cache_size: maximum number of memoized tokens
+        :param fetch: optional JWKS fetcher, see JwksCache
+        """
+        self.issuer = f'https://cognito-idp.{region}.amazonaws.com/{user_pool_id}'
+        self.client_id = client_id
+        self.token_use = token_use
+        self.cache_size = cache_size
+        self.jwks = JwksCache(f'{self.issuer}/.well-known/jwks.json',
+                              ttl=jwks_ttl, fetch=fetch)
+        self._verified = OrderedDict()
+
+    def verify(self, token) -> dict:
+        """
+        :param token: encoded JWT
+        :return: token claims
+        :raises ApplicationException: 401 when the token is not valid
+        """
+        if not token:
+            raise _unauthorized('Missing authorization token.')
+        now = time.time()
+        cached = self._verified.get(token)
+        if cached is not None:
+            if cached['exp'] > now:
+                self._verified.move_to_end(token)
+                return cached
+            del self._verified[token]
+
+        claims = self._verify_uncached(token, now)
+        self._verified[token] = claims
+        if len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+        return claims
+
+    def _verify_uncached(self, token, now) -> dict:
+        try:
+            header_b64, payload_b64, signature_b64 = token.split('.')
+            header = json.loads(_b64url_decode(header_b64))
+            claims = json.loads(_b64url_decode(payload_b64))
+            signature = _b64url_decode(signature_b64)
+        except (ValueError, TypeError):
+            raise _unauthorized('Malformed authorization token.')
+        if not isinstance(header, dict) or not isinstance(claims, dict):
+            raise _unauthorized('Malformed authorization token.')
+
+        if header.get('alg') != 'RS256':
+            raise _unauthorized('Unsupported token algorithm.')
+        key = self.jwks.get(header.get('kid'))
+        if key is None:
+            raise _unauthorized('Unknown token signing key.')
+        signing_input = f'{header_b64}.{payload_b64}'.encode()
+        if not verify_rs256(signing_input, signature, *key):
+            raise _unauthorized('Invalid token signature.')
+
+        if not isinstance(claims.get('exp'), (int, float)) or claims['exp'] <= now:
+            raise _unauthorized('Token has expired.')
+        if claims.get('iss') != self.issuer:
+            raise _unauthorized('Invalid token issuer.')
+        if claims.get('token_use') != self.token_use:
+            raise _unauthorized('Invalid token use.')
+        audience = claims.get('aud') if self.token_use == 'id' else claims.get('client_id')
+        if audience != self.client_id:
+            raise _unauthorized('Invalid token audience.')
+        return claims
+
+
+def get_bearer_token(event):
+    """
+    Reads the token from the Authorization header, with or without the
+    'Bearer ' prefix.
+    """
+    headers = event.get('headers') or {}
+    value = headers.get('Authorization') or headers.get('authorization') or ''
+    if value[:7].lower() == 'bearer ':
+        value = value[7:]
+    return value.strip()
@@ -1,46 +1,195 @@
 import json
 import os
 import random
+import time
 import uuid
-from decimal import Decimal
-
-import boto3
-from boto3.dynamodb.conditions import Attr  # For overlap checking
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 
+from commons import RESPONSE_BAD_REQUEST_CODE
 from commons.abstract_lambda import AbstractLambda
-from commons.log_helper import get_logger
+from commons.aws_clients import get_client, get_table
+from commons.exception import ApplicationException
+from commons.json_helper import dumps as json_dumps
+from commons.lazy_import import lazy_import, lazy_object
+from commons.log_helper import get_logger, lazy
+from commons.pagination import (InvalidPageRequest, fetch_page, iter_items,
+                                parse_page_params)
+from commons.parallel_scan import parallel_scan
+from commons.router import Route, Router
+from commons.s3_upload import S3UploadStream
+from commons.token_verifier import TokenVerifier, get_bearer_token
+
+conditions = lazy_import('boto3.dynamodb.conditions')
 
 _LOG = get_logger('ApiHandler-handler')
 
 # --- Cognito client ---
-cognito_client = boto3.client(
+cognito_client = lazy_object(lambda: get_client(
     'cognito-idp',
     region_name=os.environ.get('region', 'eu-central-1')
-)
+))
 
 # --- Environment variables ---
 CUP_ID = os.environ.get('cup_id')
 CLIENT_ID = os.environ.get('cup_client_id')
 tables_name = os.environ.get("tables_table")
 reservations_name = os.environ.get("reservations_table")
+# Verify ID tokens in the lambda instead of relying on an API Gateway authorizer
+VERIFY_TOKENS = os.environ.get('verify_tokens', 'false').lower() == 'true'
+
+# --- Local token verification (keys are only fetched on first use) ---
+token_verifier = TokenVerifier(
+    region=os.environ.get('region', 'eu-central-1'),
+    user_pool_id=CUP_ID,
+    client_id=CLIENT_ID,
+    jwks_ttl=int(os.environ.get('jwks_ttl', 3600))
+)
 
-# --- DynamoDB setup ---
-dynamodb = boto3.resource(
-    'dynamodb',
-    region_name=os.environ.get('region', 'eu-central-1')
+# --- DynamoDB setup (built on first use, e.g. never for /signup) ---
+tables_table = lazy_object(lambda: get_table(
+    tables_name, region_name=os.environ.get('region', 'eu-central-1')))
+reservations_table = lazy_object(lambda: get_table(
+    reservations_name, region_name=os.environ.get('region', 'eu-central-1')))
+
+# GSI on tables: hash key "number"
+TABLES_BY_NUMBER_INDEX = os.environ.get('tables_table_index', 'number-index')
+# GSI on reservations: hash key "tableNumber", sort key "date"
+RESERVATIONS_BY_TABLE_DATE_INDEX = os.environ.get(
+    'reservations_table_index', 'tableNumber-date-index'
 )
-tables_table = dynamodb.Table(tables_name)
-reservations_table = dynamodb.Table(reservations_name)
+TABLE_NUMBER_CACHE_TTL_SEC = int(os.environ.get('table_number_cache_ttl', 300))
+EXPORT_SCAN_SEGMENTS = int(os.environ.get('export_scan_segments', 8))
+EXPORT_BUCKET = os.environ.get('export_bucket')
+EXPORT_PREFIX = os.environ.get('export_prefix', 'exports/reservations/')
+EXPORT_URL_TTL_SEC = int(os.environ.get('export_url_ttl', 900))
+ADMIN_GROUP = os.environ.get('admin_group', 'admin')
+
+# Scan workers live as long as the container, so the Tables they keep per
+# thread are built once and reused by every export
+export_executor = lazy_object(lambda: ThreadPoolExecutor(
+    max_workers=EXPORT_SCAN_SEGMENTS, thread_name_prefix='export-scan'))
+
+
+def reservations_table_for_thread():
+    """
+    boto3 resources are not thread safe, so every parallel scan worker
+    uses its own Table, kept per thread for the life of the container.
+    """
+    return get_table(reservations_name,
+                     region_name=os.environ.get('region', 'eu-central-1'),
+                     per_thread=True)
 
 # -------------------
-# Decimal -> JSON fix
+# Table number lookup
 # -------------------
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            # Convert to int if it’s a whole number, else float
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return super(DecimalEncoder, self).default(obj)
+class TableNumberCache:
+    """
+    Warm-container cache of table numbers known to exist. Entries expire
+    after `ttl` seconds so tables changed by other containers are re-read.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._expires_at = {}
+
+    def __contains__(self, number):
+        expires_at = self._expires_at.get(number)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._expires_at[number]
+            return False
+        return True
+
+    def add(self, number):
+        self._expires_at[number] = time.monotonic() + self.ttl
+
+    def discard(self, number):
+        self._expires_at.pop(number, None)
+
+    def clear(self):
+        self._expires_at.clear()
+
+
+known_table_numbers = TableNumberCache(TABLE_NUMBER_CACHE_TTL_SEC)
+
+
+def table_number_exists(table_number):
+    """
+    Check that a table with the given "number" exists using the warm cache,
+    falling back to a single-item COUNT query on the number GSI.
+    """
+    number = int(table_number)
+    if number in known_table_numbers:
+        return True
+    response = tables_table.query(
+        IndexName=TABLES_BY_NUMBER_INDEX,
+        KeyConditionExpression=conditions.Key("number").eq(number),
+        Select='COUNT',
+        Limit=1
+    )
+    if response.get('Count', 0) > 0:
+        known_table_numbers.add(number)
+        return True
+    return False
+
+# -------------------
+# Reservation slot index
+# -------------------
+class SlotIndex:
+    """
+    Sorted interval index over the reservations of one table on one date.
+    Slots are kept ordered by start time together with a running maximum of
+    end times, so an overlap lookup is a single bisect: O(log n).
+    """
+
+    def __init__(self, reservations):
+        ordered = sorted(
+            reservations, key=lambda r: (r["slotTimeStart"], r["slotTimeEnd"])
+        )
+        self._starts = [r["slotTimeStart"] for r in ordered]
+        self._reservations = ordered
+        # _max_end[i] -> index of the slot with the latest end among ordered[:i + 1]
+        self._max_end = []
+        best = None
+        for i, r in enumerate(ordered):
+            if best is None or r["slotTimeEnd"] > ordered[best]["slotTimeEnd"]:
+                best = i
+            self._max_end.append(best)
+
+    def __len__(self):
+        return len(self._reservations)
+
+    def find_overlap(self, slot_start, slot_end):
+        """
+        Return an existing reservation overlapping [slot_start, slot_end),
+        or None. Overlap occurs if: (start1 < end2) AND (start2 < end1)
+        """
+        # Candidates are every slot starting before the requested end
+        last = bisect_left(self._starts, slot_end) - 1
+        if last < 0:
+            return None
+        candidate = self._reservations[self._max_end[last]]
+        if candidate["slotTimeEnd"] > slot_start:
+            return candidate
+        return None
+
+
+def query_reservations_for_table_date(table_number, date_val):
+    """
+    Fetch the slots booked for one table on one date through the
+    (tableNumber, date) GSI, following LastEvaluatedKey across pages.
+    """
+    return list(iter_items(
+        reservations_table.query,
+        IndexName=RESERVATIONS_BY_TABLE_DATE_INDEX,
+        KeyConditionExpression=(
+            conditions.Key("tableNumber").eq(int(table_number))
+            & conditions.Key("date").eq(date_val)
+        ),
+        ProjectionExpression='slotTimeStart, slotTimeEnd'
+    ))
 
 # -------------------
 # CORS headers
@@ -64,62 +213,16 @@ class ApiHandler(AbstractLambda):
 
     def handle_request(self, event, context):
         """
-        Main dispatch for the API endpoints.
+        Main dispatch for the API endpoints, see ROUTER below.
         """
-        _LOG.info("Lambda event: %s", json.dumps(event))
-        method = event.get('httpMethod')
-        path = event.get('resource')
-        body = {}
-
-        # Parse JSON body if present
-        if event.get('body'):
-            try:
-                body = json.loads(event['body'])
-            except Exception as e:
-                _LOG.error("Error parsing request body: %s", str(e))
-                return {
-                    "statusCode": 400,
-                    "headers": CORS_HEADERS,
-                    "body": json.dumps({"message": "Invalid JSON input."})
-                }
-
-        _LOG.info("Received request. Path: %s, Method: %s", path, method)
-
-        # -----------------------
-        #    PUBLIC ENDPOINTS
-        # -----------------------
-        if path == '/signup' and method == 'POST':
-            return self.signup(body)
-
-        if path == '/signin' and method == 'POST':
-            return self.signin(body)
-
-        # -----------------------
-        # PROTECTED ENDPOINTS (with Cognito)
-        # -----------------------
-        if path == '/tables' and method == 'GET':
-            return self.get_tables()
-
-        if path == '/tables' and method == 'POST':
-            return self.create_table(body)
-
-        if path == '/tables/{tableId}' and method == 'GET':
-            table_id = event.get('pathParameters', {}).get('tableId')
-            return self.get_table_by_id(table_id)
-
-        if path == '/reservations' and method == 'GET':
-            return self.get_reservations()
-
-        if path == '/reservations' and method == 'POST':
-            return self.create_reservation(body)
-
-        # If no route is matched:
-        _LOG.warning("No matching route found for path: %s, method: %s", path, method)
-        return {
-            "statusCode": 400,
-            "headers": CORS_HEADERS,
-            "body": json.dumps({"message": f"Unsupported path {path} or method {method}"})
-        }
+        try:
+            return ROUTER.dispatch(event, self)
+        except ApplicationException as e:
+            return {
+                "statusCode": e.code,
+                "headers": CORS_HEADERS,
+                "body": json.dumps({"message": e.content})
+            }
 
     def signup(self, body: dict):
         """
@@ -152,7 +255,7 @@ class ApiHandler(AbstractLambda):
                 Username=email
             )
         except Exception as e:
-            _LOG.error(f"Sign up error for email '{email}': {str(e)}")
+            _LOG.error("Sign up error for email '%s': %s", email, e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -198,7 +301,7 @@ class ApiHandler(AbstractLambda):
                 }
             )
 
-            _LOG.info("admin_initiate_auth response: %s", auth_result)
+            _LOG.debug("admin_initiate_auth response: %s", lazy(auth_result))
 
             if auth_result and 'AuthenticationResult' in auth_result:
                 id_token = auth_result['AuthenticationResult'].get('IdToken')
@@ -217,7 +320,7 @@ class ApiHandler(AbstractLambda):
                     "body": json.dumps({'message': 'Unable to authenticate user.'})
                 }
         except Exception as e:
-            _LOG.error(f"Sign in error for email '{email}': {str(e)}")
+            _LOG.error("Sign in error for email '%s': %s", email, e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -225,9 +328,10 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({'message': 'Invalid login.'})
             }
 
-    def get_tables(self):
+    def get_tables(self, query_params=None):
         """
-        Return a list of all tables.
+        Return a page of tables. Optional query parameters:
+        limit (1-1000, default 100) and nextToken from the previous page.
         {
           "tables": [
             {
@@ -238,21 +342,34 @@ class ApiHandler(AbstractLambda):
               "minOrder": ...
             },
             ...
-          ]
+          ],
+          "nextToken": string, present while more pages remain
         }
         """
-        _LOG.info("Fetching all tables from DynamoDB.")
+        _LOG.info("Fetching a page of tables from DynamoDB.")
         try:
-            response = tables_table.scan()
-            items = response.get('Items', [])
-            _LOG.info("Tables scan response: %s", items)
+            limit, start_key = parse_page_params(query_params)
+        except InvalidPageRequest as e:
+            _LOG.error(str(e))
+            return {
+                "statusCode": 400,
+                "headers": CORS_HEADERS,
+                "body": json.dumps({'message': str(e)})
+            }
+
+        try:
+            items, next_token = fetch_page(tables_table.scan, limit, start_key)
+            _LOG.info("Tables scan returned %d items.", len(items))
+            result = {"tables": items}
+            if next_token:
+                result["nextToken"] = next_token
             return {
                 "statusCode": 200,
                 "headers": CORS_HEADERS,
-                "body": json.dumps({"tables": items}, cls=DecimalEncoder)
+                "body": json_dumps(result)
             }
         except Exception as e:
-            _LOG.error(f"Error fetching tables: {str(e)}")
+            _LOG.error("Error fetching tables: %s", e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -271,7 +388,7 @@ class ApiHandler(AbstractLambda):
           "minOrder": optional int
         }
         """
-        _LOG.info("Request to create a new table. Body: %s", body)
+        _LOG.info("Request to create a new table. Body: %s", lazy(body))
         table_id = body.get('id')
         table_number = body.get('number')
         places = body.get('places')
@@ -297,6 +414,9 @@ class ApiHandler(AbstractLambda):
                 item['minOrder'] = int(min_order)
 
             tables_table.put_item(Item=item)
+            # Overwriting an id may retire its previous number, so start over
+            known_table_numbers.clear()
+            known_table_numbers.add(item['number'])
             _LOG.info("Table created successfully with id: %d", table_id)
 
             return {
@@ -305,7 +425,7 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({"id": table_id})
             }
         except Exception as e:
-            _LOG.error(f"Error creating table: {str(e)}")
+            _LOG.error("Error creating table: %s", e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -345,14 +465,14 @@ class ApiHandler(AbstractLambda):
                     "body": json.dumps({'message': f'Table with id {table_id} not found.'})
                 }
 
-            _LOG.info("Retrieved table data: %s", item)
+            _LOG.debug("Retrieved table data: %s", lazy(item))
             return {
                 "statusCode": 200,
                 "headers": CORS_HEADERS,
-                "body": json.dumps(item, cls=DecimalEncoder)
+                "body": json_dumps(item)
             }
         except Exception as e:
-            _LOG.error(f"Error fetching table by ID {table_id}: {str(e)}")
+            _LOG.error("Error fetching table by ID %s: %s", table_id, e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -360,9 +480,10 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({'message': f'Unable to retrieve table {table_id}.'})
             }
 
-    def get_reservations(self):
+    def get_reservations(self, query_params=None):
         """
-        Return a list of all reservations.
+        Return a page of reservations. Optional query parameters:
+        limit (1-1000, default 100) and nextToken from the previous page.
         {
           "reservations": [
             {
@@ -374,21 +495,34 @@ class ApiHandler(AbstractLambda):
               "slotTimeEnd": string (HH:MM)
             },
             ...
-          ]
+          ],
+          "nextToken": string, present while more pages remain
         }
         """
-        _LOG.info("Fetching all reservations from DynamoDB.")
+        _LOG.info("Fetching a page of reservations from DynamoDB.")
+        try:
+            limit, start_key = parse_page_params(query_params)
+        except InvalidPageRequest as e:
+            _LOG.error(str(e))
+            return {
+                "statusCode": 400,
+                "headers": CORS_HEADERS,
+                "body": json.dumps({'message': str(e)})
+            }
+
         try:
-            response = reservations_table.scan()
-            items = response.get('Items', [])
-            _LOG.info("Reservations scan response: %s", items)
+            items, next_token = fetch_page(reservations_table.scan, limit, start_key)
+            _LOG.info("Reservations scan returned %d items.", len(items))
+            result = {"reservations": items}
+            if next_token:
+                result["nextToken"] = next_token
             return {
                 "statusCode": 200,
                 "headers": CORS_HEADERS,
-                "body": json.dumps({"reservations": items}, cls=DecimalEncoder)
+                "body": json_dumps(result)
             }
         except Exception as e:
-            _LOG.error(f"Error fetching reservations: {str(e)}")
+            _LOG.error("Error fetching reservations: %s", e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -396,6 +530,73 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({'message': 'Unable to retrieve reservations.'})
             }
 
+    def export_reservations(self, event):
+        """
+        Admin export of every reservation, read with a parallel segmented
+        scan and streamed to S3 as newline-delimited JSON, one reservation
+        per line, so the export is never held in memory nor bound by the
+        response size limit. Returns the object location and a presigned
+        download URL valid for `export_url_ttl` seconds.
+        Only callers in the Cognito group `admin_group` are allowed.
+        """
+        claims = (event.get('requestContext') or {}).get('authorizer', {}).get('claims', {})
+        groups = claims.get('cognito:groups') or []
+        if isinstance(groups, str):
+            # REST API authorizers flatten the list to "[admin, staff]" or "admin"
+            groups = groups.strip('[]').replace(',', ' ').split()
+        if ADMIN_GROUP not in groups:
+            _LOG.error("Reservations export denied for groups: %s", groups)
+            return {
+                "statusCode": 403,
+                "headers": CORS_HEADERS,
+                "body": json.dumps({'message': 'Reservations export requires admin access.'})
+            }
+        if not EXPORT_BUCKET:
+            _LOG.error("Reservations export requested without an export_bucket.")
+            return {
+                "statusCode": 400,
+                "headers": CORS_HEADERS,
+                "body": json.dumps({'message': 'Unable to export reservations.'})
+            }
+
+        key = f"{EXPORT_PREFIX}{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{uuid.uuid4()}.ndjson"
+        _LOG.info("Exporting reservations with %d scan segments to s3://%s/%s.",
+                  EXPORT_SCAN_SEGMENTS, EXPORT_BUCKET, key)
+        try:
+            s3 = get_client('s3', region_name=os.environ.get('region', 'eu-central-1'))
+            count = 0
+            with S3UploadStream(s3, EXPORT_BUCKET, key,
+                                ContentType='application/x-ndjson') as stream:
+                for item in parallel_scan(reservations_table_for_thread,
+                                          total_segments=EXPORT_SCAN_SEGMENTS,
+                                          executor=export_executor):
+                    stream.write(json_dumps(item).encode('utf-8') + b'\n')
+                    count += 1
+            url = s3.generate_presigned_url(
+                'get_object', Params={'Bucket': EXPORT_BUCKET, 'Key': key},
+                ExpiresIn=EXPORT_URL_TTL_SEC)
+            _LOG.info("Exported %d reservations (%d bytes).", count, stream.bytes_written)
+            return {
+                "statusCode": 200,
+                "headers": CORS_HEADERS,
+                "body": json.dumps({
+                    'bucket': EXPORT_BUCKET,
+                    'key': key,
+                    'count': count,
+                    'bytes': stream.bytes_written,
+                    'url': url,
+                    'expiresIn': EXPORT_URL_TTL_SEC
+                })
+            }
+        except Exception as e:
+            _LOG.error("Error exporting reservations: %s", e)
+            _LOG.exception(e)
+            return {
+                "statusCode": 400,
+                "headers": CORS_HEADERS,
+                "body": json.dumps({'message': 'Unable to export reservations.'})
+            }
+
     def create_reservation(self, body: dict):
         """
         Create a new reservation item in DynamoDB.
@@ -409,7 +610,7 @@ class ApiHandler(AbstractLambda):
         }
         Returns: { "reservationId": <uuidv4> }
         """
-        _LOG.info("Request to create a new reservation. Body: %s", body)
+        _LOG.info("Request to create a new reservation. Body: %s", lazy(body))
         table_number = body.get('tableNumber')
         client_name = body.get('clientName')
         phone_number = body.get('phoneNumber')
@@ -435,11 +636,7 @@ class ApiHandler(AbstractLambda):
 
         # Verify table existence by 'number'
         try:
-            check_resp = tables_table.scan(
-                FilterExpression=Attr("number").eq(int(table_number))
-            )
-            found_items = check_resp.get('Items', [])
-            if not found_items:
+            if not table_number_exists(table_number):
                 _LOG.error("Reservation failed. Table number %s does not exist.", table_number)
                 return {
                     "statusCode": 400,
@@ -457,27 +654,22 @@ class ApiHandler(AbstractLambda):
 
         # Check for overlapping reservations
         try:
-            existing_reservations = reservations_table.scan(
-                FilterExpression=(
-                    Attr("tableNumber").eq(int(table_number)) &
-                    Attr("date").eq(date_val)
+            slot_index = SlotIndex(
+                query_reservations_for_table_date(table_number, date_val)
+            )
+            r = slot_index.find_overlap(slot_start, slot_end)
+            if r is not None:
+                _LOG.error(
+                    "Reservation time overlap. Existing: %s - %s, Requested: %s - %s",
+                    r["slotTimeStart"], r["slotTimeEnd"], slot_start, slot_end
                 )
-            ).get('Items', [])
-
-            # Overlap occurs if: (start1 < end2) AND (start2 < end1)
-            for r in existing_reservations:
-                if (slot_start < r["slotTimeEnd"]) and (r["slotTimeStart"] < slot_end):
-                    _LOG.error(
-                        "Reservation time overlap. Existing: %s - %s, Requested: %s - %s",
-                        r["slotTimeStart"], r["slotTimeEnd"], slot_start, slot_end
-                    )
-                    return {
-                        "statusCode": 400,
-                        "headers": CORS_HEADERS,
-                        "body": json.dumps({
-                            'message': f"Time overlap for table {table_number} on {date_val}."
-                        })
-                    }
+                return {
+                    "statusCode": 400,
+                    "headers": CORS_HEADERS,
+                    "body": json.dumps({
+                        'message': f"Time overlap for table {table_number} on {date_val}."
+                    })
+                }
         except Exception as e:
             _LOG.error("Error checking for overlapping reservations: %s", str(e))
             _LOG.exception(e)
@@ -512,7 +704,7 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({"reservationId": reservation_id_str})
             }
         except Exception as e:
-            _LOG.error(f"Error creating reservation: {str(e)}")
+            _LOG.error("Error creating reservation: %s", e)
             _LOG.exception(e)
             return {
                 "statusCode": 400,
@@ -520,11 +712,61 @@ class ApiHandler(AbstractLambda):
                 "body": json.dumps({'message': 'Unable to create reservation.'})
             }
 
+# -----------------------
+# Route table
+# -----------------------
+def json_object_body(request):
+    if not isinstance(request.body, dict):
+        raise ApplicationException(code=RESPONSE_BAD_REQUEST_CODE,
+                                   content='A JSON object is expected.')
+
+
+def authorize(request):
+    """
+    Validation hook of the protected routes: with verify_tokens enabled the
+    ID token is checked here and its claims are exposed the same way API
+    Gateway's Cognito authorizer passes them along.
+    """
+    if VERIFY_TOKENS:
+        try:
+            claims = token_verifier.verify(get_bearer_token(request.event))
+        except ApplicationException as e:
+            _LOG.error("Token verification failed: %s", e.content)
+            raise
+        request.event.setdefault('requestContext', {})['authorizer'] = {'claims': claims}
+
+
+ROUTER = Router([
+    #    PUBLIC ENDPOINTS
+    Route('POST', '/signup', lambda handler, request: handler.signup(request.body),
+          [json_object_body]),
+    Route('POST', '/signin', lambda handler, request: handler.signin(request.body),
+          [json_object_body]),
+    # PROTECTED ENDPOINTS (with Cognito)
+    Route('GET', '/tables',
+          lambda handler, request: handler.get_tables(request.query_params),
+          [authorize]),
+    Route('POST', '/tables', lambda handler, request: handler.create_table(request.body),
+          [authorize, json_object_body]),
+    Route('GET', '/tables/{tableId}',
+          lambda handler, request: handler.get_table_by_id(request.path_params.get('tableId')),
+          [authorize]),
+    Route('GET', '/reservations',
+          lambda handler, request: handler.get_reservations(request.query_params),
+          [authorize]),
+    Route('POST', '/reservations',
+          lambda handler, request: handler.create_reservation(request.body),
+          [authorize, json_object_body]),
+    Route('GET', '/reservations/export',
+          lambda handler, request: handler.export_reservations(request.event),
+          [authorize]),
+])
+
 HANDLER = ApiHandler()
 
 def lambda_handler(event, context):
     """
     AWS Lambda entry point.
     """
-    _LOG.info("Entered lambda_handler with event: %s", json.dumps(event))
+    _LOG.info("Entered lambda_handler.")
     return HANDLER.handle_request(event, context)
@@ -0,0 +1,18 @@
+import importlib
+import os
+import unittest
+
+from tests import ImportFromSourceContext
+
+os.environ.setdefault('tables_table', 'Tables')
+os.environ.setdefault('reservations_table', 'Reservations')
+
+with ImportFromSourceContext():
+    LAMBDA_HANDLER = importlib.import_module('lambdas.api_handler.handler')
+
+
+class ApiHandlerLambdaTestCase(unittest.TestCase):
+    """Common setups for this lambda"""
+
+    def setUp(self) -> None:
+        self.HANDLER = LAMBDA_HANDLER.ApiHandler()
@@ -0,0 +1,44 @@
+import json
+from unittest.mock import patch, MagicMock
+
+from tests.import_profile import HEAVY_MODULES, IMPORT_TIME_BUDGET_MS, profile_lambda
+from tests.test_api_handler import ApiHandlerLambdaTestCase, LAMBDA_HANDLER
+from commons.lazy_import import LazyModule, lazy_import, lazy_object
+
+
+class TestColdStart(ApiHandlerLambdaTestCase):
+
+    def test_handler_import(self):
+        profile = profile_lambda('api_handler')
+        self.assertEqual(profile.loaded(*HEAVY_MODULES), [], profile.report())
+        self.assertLess(profile.total_ms, IMPORT_TIME_BUDGET_MS, profile.report())
+
+    def test_signup_does_not_build_dynamodb_tables(self):
+        event = {'httpMethod': 'POST', 'resource': '/signup',
+                 'body': json.dumps({'email': 'a@b.c', 'password': 'Secret#123'})}
+        with patch.object(LAMBDA_HANDLER, 'cognito_client', MagicMock()):
+            response = self.HANDLER.handle_request(event, None)
+        self.assertEqual(response['statusCode'], 200)
+        self.assertFalse(LAMBDA_HANDLER.tables_table.is_resolved)
+        self.assertFalse(LAMBDA_HANDLER.reservations_table.is_resolved)
+
+
+class TestLazyImport(ApiHandlerLambdaTestCase):
+
+    def test_loaded_module_is_returned_as_is(self):
+        self.assertIs(lazy_import('json'), json)
+
+    def test_module_is_imported_on_first_use(self):
+        module = LazyModule('json')
+        self.assertIn('not loaded', repr(module))
+        self.assertIs(module.dumps, json.dumps)
+        self.assertNotIn('not loaded', repr(module))
+
+    def test_object_is_built_once(self):
+        factory = MagicMock(return_value=MagicMock(name='client'))
+        client = lazy_object(factory)
+        self.assertFalse(client.is_resolved)
+        client.sign_up()
+        client.sign_up()
+        factory.assert_called_once_with()
+        self.assertEqual(factory.return_value.sign_up.call_count, 2)
@@ -0,0 +1,113 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from tests.test_api_handler import ApiHandlerLambdaTestCase, LAMBDA_HANDLER
+from commons.parallel_scan import parallel_scan
+
+
+class SegmentedTable:
+    """Serves `rows` ids split into segments, `page_size` items per page."""
+
+    def __init__(self, rows, page_size=3, fail_segment=None):
+        self.rows = rows
+        self.page_size = page_size
+        self.fail_segment = fail_segment
+
+    def scan(self, Segment, TotalSegments, ExclusiveStartKey=None, **kwargs):
+        if Segment == self.fail_segment:
+            raise RuntimeError('throttled')
+        ids = list(range(self.rows))[Segment::TotalSegments]
+        start = ids.index(ExclusiveStartKey['id']) + 1 if ExclusiveStartKey else 0
+        page = ids[start:start + self.page_size]
+        response = {'Items': [{'id': i} for i in page]}
+        if start + self.page_size < len(ids):
+            response['LastEvaluatedKey'] = {'id': page[-1]}
+        return response
+
+
+class FakeS3:
+    """Keeps put objects in memory and signs URLs with a fixed query."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = {'body': Body, **kwargs}
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://{Params['Bucket']}.s3/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+
+class TestParallelScan(ApiHandlerLambdaTestCase):
+
+    def test_merges_every_segment(self):
+        table = SegmentedTable(50)
+        items = list(parallel_scan(lambda: table, total_segments=4,
+                                   max_buffered_pages=1))
+        self.assertEqual(sorted(i['id'] for i in items), list(range(50)))
+
+    def test_early_close_stops_workers(self):
+        stream = parallel_scan(lambda: SegmentedTable(1000), total_segments=4,
+                               max_buffered_pages=1)
+        self.assertIn('id', next(stream))
+        stream.close()
+
+    def test_shared_executor_is_left_running(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for _ in range(2):
+                items = list(parallel_scan(lambda: SegmentedTable(30), total_segments=4,
+                                           executor=executor))
+                self.assertEqual(sorted(i['id'] for i in items), list(range(30)))
+
+    def test_segment_error_is_raised(self):
+        with self.assertRaises(RuntimeError):
+            list(parallel_scan(lambda: SegmentedTable(50, fail_segment=2),
+                               total_segments=4))
+
+
+class TestExportReservations(ApiHandlerLambdaTestCase):
+
+    @staticmethod
+    def event(groups):
+        return {
+            "resource": "/reservations/export",
+            "httpMethod": "GET",
+            "requestContext": {"authorizer": {"claims": {"cognito:groups": groups}}}
+        }
+
+    def test_requires_admin_group(self):
+        response = self.HANDLER.handle_request(self.event("staff"), {})
+        self.assertEqual(response["statusCode"], 403)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.s3 = FakeS3()
+        for name, value in (('get_client', lambda *args, **kwargs: self.s3),
+                            ('EXPORT_BUCKET', 'exports-bucket')):
+            patcher = patch.object(LAMBDA_HANDLER, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @patch.object(LAMBDA_HANDLER, 'reservations_table_for_thread')
+    def test_streams_ndjson_to_s3(self, table_for_thread):
+        table_for_thread.return_value = SegmentedTable(20)
+        response = self.HANDLER.handle_request(self.event("[staff, admin]"), {})
+
+        self.assertEqual(response["statusCode"], 200)
+        body = json.loads(response["body"])
+        stored = self.s3.objects[("exports-bucket", body["key"])]
+        self.assertEqual(stored["ContentType"], "application/x-ndjson")
+        self.assertTrue(body["key"].startswith(LAMBDA_HANDLER.EXPORT_PREFIX))
+        lines = stored["body"].decode().splitlines()
+        self.assertEqual(sorted(json.loads(l)["id"] for l in lines), list(range(20)))
+        self.assertEqual(body["count"], 20)
+        self.assertEqual(body["bytes"], len(stored["body"]))
+        self.assertEqual(body["expiresIn"], LAMBDA_HANDLER.EXPORT_URL_TTL_SEC)
+        self.assertIn(body["key"], body["url"])
+
+    def test_requires_export_bucket(self):
+        with patch.object(LAMBDA_HANDLER, 'EXPORT_BUCKET', None):
+            response = self.HANDLER.handle_request(self.event("admin"), {})
+        self.assertEqual(response["statusCode"], 400)
+        self.assertEqual(self.s3.objects, {})
@@ -0,0 +1,36 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+from tests.test_api_handler import ApiHandlerLambdaTestCase
+from commons import json_helper
+
+
+class TestJsonHelper(ApiHandlerLambdaTestCase):
+
+    item = {"id": Decimal("12345678901234567890"), "minOrder": Decimal("12.5"),
+            "places": Decimal("4"), "isVip": True, "tags": {"a"}}
+    expected = {"id": 12345678901234567890, "minOrder": 12.5, "places": 4,
+                "isVip": True, "tags": ["a"]}
+
+    def test_dumps(self):
+        self.assertEqual(json.loads(json_helper.dumps(self.item)), self.expected)
+
+    def test_dumps_without_orjson(self):
+        with patch.object(json_helper, 'orjson', None):
+            self.assertEqual(json.loads(json_helper.dumps(self.item)),
+                             self.expected)
+
+    def test_dumps_38_digit_numbers(self):
+        item = {"id": Decimal("12345678901234567890123456789012345678"),
+                "price": Decimal("-99999999999999999999999999999999999999"),
+                "minOrder": Decimal("12.5")}
+        expected = {"id": 12345678901234567890123456789012345678,
+                    "price": -99999999999999999999999999999999999999, "minOrder": 12.5}
+        self.assertEqual(json.loads(json_helper.dumps(item)), expected)
+        with patch.object(json_helper, 'orjson', None):
+            self.assertEqual(json.loads(json_helper.dumps(item)), expected)
+
+    def test_unsupported_type(self):
+        with self.assertRaises(TypeError):
+            json_helper.dumps({"value": object()})
@@ -0,0 +1,43 @@
+import logging
+from unittest.mock import patch
+
+from tests.test_api_handler import ApiHandlerLambdaTestCase
+from commons import log_helper
+from commons.log_helper import SamplingFilter, get_logger, lazy, structured
+
+
+class Unrenderable:
+
+    def __repr__(self):
+        raise AssertionError('payload rendered for a dropped record')
+
+
+class TestLogHelper(ApiHandlerLambdaTestCase):
+
+    def test_dropped_records_are_not_rendered(self):
+        logger = get_logger('test-lazy', level=logging.INFO)
+        logger.debug('Request: %s', lazy(Unrenderable()))
+        logger.debug(structured('Request', event=Unrenderable()))
+
+    def test_payload_is_truncated(self):
+        self.assertEqual(str(lazy({'a': 'x' * 10}, limit=8)),
+                         '{"a":"xx...[10 chars truncated]')
+        self.assertEqual(str(lazy('short')), 'short')
+
+    def test_structured_message(self):
+        self.assertEqual(str(structured('Processed', key='k', item={'id': 1})),
+                         'Processed key=k item={"id":1}')
+
+    def test_sampling_keeps_warnings(self):
+        log_filter = SamplingFilter(0.0)
+        record = logging.LogRecord('x', logging.INFO, '', 0, 'msg', None, None)
+        self.assertFalse(log_filter.filter(record))
+        record.levelno = logging.WARNING
+        self.assertTrue(log_filter.filter(record))
+
+    def test_sample_rate_per_logger(self):
+        logger = get_logger('test-sampled', sample_rate=0.5)
+        self.assertEqual([f.rate for f in logger.filters], [0.5])
+        with patch.object(log_helper, 'log_sample_rate', 1.0):
+            logger = get_logger('test-sampled')
+        self.assertEqual(logger.filters, [])
@@ -0,0 +1,83 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+
+from tests.test_api_handler import ApiHandlerLambdaTestCase, LAMBDA_HANDLER
+from commons.pagination import (InvalidPageRequest, decode_token,
+                                encode_token, fetch_page, iter_items,
+                                parse_page_params, DEFAULT_PAGE_LIMIT)
+
+
+class TestPagination(ApiHandlerLambdaTestCase):
+
+    def test_token_round_trip(self):
+        key = {"id": Decimal("12345678901234567890"), "date": "2025-02-01"}
+        self.assertEqual(decode_token(encode_token(key)), key)
+
+    def test_parse_page_params(self):
+        self.assertEqual(parse_page_params(None), (DEFAULT_PAGE_LIMIT, None))
+        token = encode_token({"id": Decimal(3)})
+        self.assertEqual(parse_page_params({"limit": "5", "nextToken": token}),
+                         (5, {"id": Decimal(3)}))
+        for params in ({"limit": "0"}, {"limit": "abc"}, {"limit": "100000"},
+                       {"nextToken": "not-a-token"}):
+            with self.assertRaises(InvalidPageRequest):
+                parse_page_params(params)
+
+    def test_fetch_page_fills_short_pages(self):
+        scan = MagicMock(side_effect=[
+            {"Items": [1], "LastEvaluatedKey": {"id": Decimal(1)}},
+            {"Items": [2, 3], "LastEvaluatedKey": {"id": Decimal(3)}},
+        ])
+        items, next_token = fetch_page(scan, 3)
+
+        self.assertEqual(items, [1, 2, 3])
+        self.assertEqual(decode_token(next_token), {"id": Decimal(3)})
+        self.assertEqual(scan.call_args_list[1][1],
+                         {"Limit": 2, "ExclusiveStartKey": {"id": Decimal(1)}})
+
+    def test_iter_items_walks_every_page(self):
+        scan = MagicMock(side_effect=[
+            {"Items": [1, 2], "LastEvaluatedKey": {"id": 2}},
+            {"Items": [3]},
+        ])
+        self.assertEqual(list(iter_items(scan)), [1, 2, 3])
+
+
+class TestGetTables(ApiHandlerLambdaTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tables_table = MagicMock()
+        patcher = patch.object(LAMBDA_HANDLER, 'tables_table', self.tables_table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_returns_next_token(self):
+        self.tables_table.scan.return_value = {
+            "Items": [{"id": Decimal(1), "number": Decimal(1)}],
+            "LastEvaluatedKey": {"id": Decimal(1)}
+        }
+        response = self.HANDLER.handle_request({
+            "resource": "/tables",
+            "httpMethod": "GET",
+            "queryStringParameters": {"limit": "1"}
+        }, {})
+        body = json.loads(response["body"])
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(body["tables"], [{"id": 1, "number": 1}])
+        self.assertEqual(decode_token(body["nextToken"]), {"id": Decimal(1)})
+        self.tables_table.scan.assert_called_once_with(Limit=1)
+
+    def test_last_page_has_no_token(self):
+        self.tables_table.scan.return_value = {"Items": []}
+        response = self.HANDLER.get_tables({"nextToken": encode_token({"id": 1})})
+
+        self.assertEqual(json.loads(response["body"]), {"tables": []})
+
+    def test_invalid_limit(self):
+        response = self.HANDLER.get_tables({"limit": "-1"})
+
+        self.assertEqual(response["statusCode"], 400)
+        self.tables_table.scan.assert_not_called()
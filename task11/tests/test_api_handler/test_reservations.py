@@ -0,0 +1,114 @@
+import json
+from unittest.mock import patch, MagicMock
+
+from tests.test_api_handler import ApiHandlerLambdaTestCase, LAMBDA_HANDLER
+
+
+def _slot(start, end):
+    return {"slotTimeStart": start, "slotTimeEnd": end}
+
+
+class TestSlotIndex(ApiHandlerLambdaTestCase):
+
+    def test_no_reservations(self):
+        index = LAMBDA_HANDLER.SlotIndex([])
+        self.assertIsNone(index.find_overlap("10:00", "11:00"))
+
+    def test_adjacent_slots_do_not_overlap(self):
+        index = LAMBDA_HANDLER.SlotIndex(
+            [_slot("12:00", "13:00"), _slot("09:00", "10:00")])
+        self.assertIsNone(index.find_overlap("10:00", "12:00"))
+        self.assertIsNone(index.find_overlap("08:00", "09:00"))
+        self.assertIsNone(index.find_overlap("13:00", "14:00"))
+
+    def test_overlaps(self):
+        index = LAMBDA_HANDLER.SlotIndex(
+            [_slot("09:00", "10:00"), _slot("12:00", "13:00")])
+        self.assertEqual(index.find_overlap("09:30", "11:00"),
+                         _slot("09:00", "10:00"))
+        self.assertEqual(index.find_overlap("11:00", "12:30"),
+                         _slot("12:00", "13:00"))
+        self.assertIsNotNone(index.find_overlap("08:00", "14:00"))
+
+    def test_long_slot_hidden_behind_later_starts(self):
+        index = LAMBDA_HANDLER.SlotIndex(
+            [_slot("08:00", "18:00"), _slot("10:00", "11:00"),
+             _slot("12:00", "13:00")])
+        self.assertEqual(index.find_overlap("14:00", "15:00"),
+                         _slot("08:00", "18:00"))
+
+
+class TestCreateReservation(ApiHandlerLambdaTestCase):
+
+    body = {
+        "tableNumber": 1,
+        "clientName": "John Doe",
+        "phoneNumber": "123456789",
+        "date": "2025-02-01",
+        "slotTimeStart": "18:00",
+        "slotTimeEnd": "20:00"
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tables_table = MagicMock()
+        self.tables_table.query.return_value = {"Count": 1}
+        LAMBDA_HANDLER.known_table_numbers.clear()
+        self.reservations_table = MagicMock()
+        patcher_tables = patch.object(
+            LAMBDA_HANDLER, 'tables_table', self.tables_table)
+        patcher_reservations = patch.object(
+            LAMBDA_HANDLER, 'reservations_table', self.reservations_table)
+        patcher_tables.start()
+        patcher_reservations.start()
+        self.addCleanup(patch.stopall)
+
+    def test_overlap_is_rejected(self):
+        self.reservations_table.query.side_effect = [
+            {"Items": [_slot("10:00", "11:00")],
+             "LastEvaluatedKey": {"id": 1}},
+            {"Items": [_slot("19:00", "21:00")]},
+        ]
+        response = self.HANDLER.create_reservation(dict(self.body))
+
+        self.assertEqual(response["statusCode"], 400)
+        self.assertIn("Time overlap", json.loads(response["body"])["message"])
+        self.assertEqual(self.reservations_table.query.call_count, 2)
+        second_call = self.reservations_table.query.call_args_list[1][1]
+        self.assertEqual(second_call["ExclusiveStartKey"], {"id": 1})
+        self.assertEqual(second_call["IndexName"],
+                         LAMBDA_HANDLER.RESERVATIONS_BY_TABLE_DATE_INDEX)
+        self.reservations_table.scan.assert_not_called()
+        self.reservations_table.put_item.assert_not_called()
+
+    def test_free_slot_is_booked(self):
+        self.reservations_table.query.return_value = {
+            "Items": [_slot("16:00", "18:00")]}
+        response = self.HANDLER.create_reservation(dict(self.body))
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertIn("reservationId", json.loads(response["body"]))
+        self.reservations_table.put_item.assert_called_once()
+
+    def test_unknown_table_is_rejected(self):
+        self.tables_table.query.return_value = {"Count": 0}
+        response = self.HANDLER.create_reservation(dict(self.body))
+
+        self.assertEqual(response["statusCode"], 400)
+        self.assertIn("does not exist", json.loads(response["body"])["message"])
+        self.tables_table.scan.assert_not_called()
+
+    def test_known_table_number_is_cached(self):
+        self.assertTrue(LAMBDA_HANDLER.table_number_exists(1))
+        self.assertTrue(LAMBDA_HANDLER.table_number_exists("1"))
+        self.tables_table.query.assert_called_once()
+        self.assertEqual(self.tables_table.query.call_args[1]["IndexName"],
+                         LAMBDA_HANDLER.TABLES_BY_NUMBER_INDEX)
+
+    def test_create_table_invalidates_cache(self):
+        LAMBDA_HANDLER.known_table_numbers.add(7)
+        self.HANDLER.create_table(
+            {"id": 1, "number": 2, "places": 4, "isVip": False})
+
+        self.assertNotIn(7, LAMBDA_HANDLER.known_table_numbers)
+        self.assertIn(2, LAMBDA_HANDLER.known_table_numbers)
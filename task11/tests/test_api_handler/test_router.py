@@ -0,0 +1,100 @@
+import json
+import logging
+from unittest.mock import patch, MagicMock
+
+from tests.test_api_handler import ApiHandlerLambdaTestCase, LAMBDA_HANDLER
+from commons.exception import ApplicationException
+from commons.router import Route, Router
+
+
+def echo(target, request):
+    return request
+
+
+class TestRouter(ApiHandlerLambdaTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.router = Router([
+            Route('GET', '/tables', echo),
+            Route('GET', '/tables/{tableId}', echo),
+            Route('POST', '/tables', echo,
+                  [lambda request: {} if request.body.get('id') else
+                   {'id': 'required', 'number': 'required'}]),
+        ])
+
+    def test_rest_event_uses_resource_template(self):
+        request = self.router.dispatch({
+            'httpMethod': 'GET', 'resource': '/tables/{tableId}',
+            'path': '/tables/7', 'pathParameters': {'tableId': '7'}})
+        self.assertEqual(request.path_params, {'tableId': '7'})
+
+    def test_http_api_event_matches_parameters(self):
+        request = self.router.dispatch({
+            'rawPath': '/tables/7', 'requestContext': {'http': {'method': 'GET'}}})
+        self.assertEqual(request.path, '/tables/7')
+        self.assertEqual(request.path_params, {'tableId': '7'})
+
+    def test_unknown_route(self):
+        for event in ({'httpMethod': 'DELETE', 'resource': '/tables'},
+                      {'httpMethod': 'GET', 'rawPath': '/tables/7/seats'},
+                      {}):
+            with self.assertRaises(ApplicationException) as context:
+                self.router.dispatch(event)
+            self.assertEqual(context.exception.code, 400)
+
+    def test_validators(self):
+        event = {'httpMethod': 'POST', 'resource': '/tables', 'body': '{"id": 1}'}
+        self.assertEqual(self.router.dispatch(event).body, {'id': 1})
+        for body, content in (('{}', 'id: required; number: required'),
+                              ('{', 'Invalid JSON input.')):
+            with self.assertRaises(ApplicationException) as context:
+                self.router.dispatch(dict(event, body=body))
+            self.assertEqual(context.exception.content, content)
+
+    def test_body_is_parsed_lazily(self):
+        request = self.router.dispatch(
+            {'httpMethod': 'GET', 'resource': '/tables', 'body': '{'})
+        self.assertEqual(request.query_params, {})
+
+    @patch('commons.router.json.dumps')
+    def test_event_serialized_only_for_debug(self, dumps):
+        logger = logging.getLogger('commons.log_helper.router')
+        event = {'httpMethod': 'GET', 'resource': '/tables'}
+        self.router.dispatch(event)
+        dumps.assert_not_called()
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.DEBUG)
+        self.router.dispatch(event)
+        dumps.assert_called_once()
+
+
+class TestApiHandlerRoutes(ApiHandlerLambdaTestCase):
+
+    def test_invalid_json(self):
+        response = self.HANDLER.handle_request(
+            {'httpMethod': 'POST', 'resource': '/signup', 'body': '{'}, {})
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(json.loads(response['body']), {'message': 'Invalid JSON input.'})
+
+    def test_non_object_body(self):
+        response = self.HANDLER.handle_request(
+            {'httpMethod': 'POST', 'resource': '/signup', 'body': '[1]'}, {})
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(json.loads(response['body']),
+                         {'message': 'A JSON object is expected.'})
+
+    def test_unsupported_route(self):
+        response = self.HANDLER.handle_request(
+            {'httpMethod': 'DELETE', 'resource': '/tables'}, {})
+        self.assertEqual(json.loads(response['body']),
+                         {'message': 'Unsupported path /tables or method DELETE'})
+
+    @patch.object(LAMBDA_HANDLER, 'tables_table')
+    def test_path_parameters(self, tables_table):
+        tables_table.get_item.return_value = {'Item': {'id': 3}}
+        response = self.HANDLER.handle_request(
+            {'httpMethod': 'GET', 'resource': '/tables/{tableId}',
+             'pathParameters': {'tableId': '3'}}, {})
+        self.assertEqual(json.loads(response['body']), {'id': 3})
+        tables_table.get_item.assert_called_once_with(Key={'id': 3})
@@ -0,0 +1,222 @@
+import base64
+import hashlib
+import json
+import random
+import time
+from unittest.mock import patch
+
+from tests.test_api_handler import ApiHandlerLambdaTestCase, LAMBDA_HANDLER
+from commons.exception import ApplicationException
+from commons.token_verifier import TokenVerifier, get_bearer_token
+
+REGION = 'eu-central-1'
+POOL_ID = 'eu-central-1_test'
+CLIENT_ID = 'client'
+ISSUER = f'https://cognito-idp.{REGION}.amazonaws.com/{POOL_ID}'
+SHA256_DIGEST_INFO = bytes.fromhex('3031300d060960864801650304020105000420')
+
+
+def _is_probable_prime(n, rng, rounds=20):
+    if n % 2 == 0:
+        return n == 2
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d, r = d // 2, r + 1
+    for _ in range(rounds):
+        x = pow(rng.randrange(2, n - 1), d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _generate_prime(bits, rng):
+    while True:
+        candidate = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if _is_probable_prime(candidate, rng):
+            return candidate
+
+
+def generate_key_pair(bits=2048, e=65537, seed=None):
+    """Locally generated RSA key pair: (n, e, d)."""
+    rng = random.Random(seed)
+    while True:
+        p, q = _generate_prime(bits // 2, rng), _generate_prime(bits // 2, rng)
+        phi = (p - 1) * (q - 1)
+        if p != q and phi % e:
+            return p * q, e, pow(e, -1, phi)
+
+
+def b64url(data):
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def int_to_b64url(value):
+    return b64url(value.to_bytes((value.bit_length() + 7) // 8, 'big'))
+
+
+KEY = generate_key_pair(bits=1024, seed=11)
+JWKS = {'keys': [{'kid': 'key-1', 'kty': 'RSA', 'alg': 'RS256',
+                  'n': int_to_b64url(KEY[0]), 'e': int_to_b64url(KEY[1])}]}
+
+
+def sign(claims, kid='key-1', key=KEY, alg='RS256'):
+    n, _, d = key
+    header = b64url(json.dumps({'kid': kid, 'alg': alg}).encode())
+    payload = b64url(json.dumps(claims).encode())
+    k = (n.bit_length() + 7) // 8
+    t = SHA256_DIGEST_INFO + hashlib.sha256(f'{header}.{payload}'.encode()).digest()
+    encoded = b'\x00\x01' + b'\xff' * (k - len(t) - 3) + b'\x00' + t
+    signature = pow(int.from_bytes(encoded, 'big'), d, n).to_bytes(k, 'big')
+    return f'{header}.{payload}.{b64url(signature)}'
+
+
+def unavailable(url):
+    raise OSError('JWKS endpoint unreachable')
+
+
+def id_claims(**overrides):
+    claims = {'sub': 'user', 'iss': ISSUER, 'aud': CLIENT_ID, 'token_use': 'id',
+              'exp': int(time.time()) + 3600, 'cognito:groups': ['admin']}
+    claims.update(overrides)
+    return claims
+
+
+class TestTokenVerifier(ApiHandlerLambdaTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.fetches = 0
+
+        def fetch(url):
+            self.assertEqual(url, f'{ISSUER}/.well-known/jwks.json')
+            self.fetches += 1
+            return JWKS
+
+        self.verifier = TokenVerifier(REGION, POOL_ID, CLIENT_ID, fetch=fetch)
+
+    def assert_rejected(self, token, message):
+        with self.assertRaises(ApplicationException) as context:
+            self.verifier.verify(token)
+        self.assertEqual(context.exception.code, 401)
+        self.assertIn(message, context.exception.content)
+
+    def test_valid_token_is_memoized(self):
+        token = sign(id_claims())
+        self.assertEqual(self.verifier.verify(token)['sub'], 'user')
+        with patch('commons.token_verifier.verify_rs256') as verify_rs256:
+            self.assertEqual(self.verifier.verify(token)['sub'], 'user')
+            verify_rs256.assert_not_called()
+        self.assertEqual(self.fetches, 1)
+
+    def test_memo_is_bounded(self):
+        self.verifier.cache_size = 2
+        tokens = [sign(id_claims(sub=str(i))) for i in range(3)]
+        for token in tokens:
+            self.verifier.verify(token)
+        self.assertEqual(list(self.verifier._verified), tokens[1:])
+
+    def test_rejects_tampered_payload(self):
+        header, _, signature = sign(id_claims()).split('.')
+        payload = b64url(json.dumps(id_claims(sub='admin')).encode())
+        self.assert_rejected(f'{header}.{payload}.{signature}', 'signature')
+
+    def test_rejects_foreign_key(self):
+        other_key = generate_key_pair(bits=1024, seed=12)
+        self.assert_rejected(sign(id_claims(), key=other_key), 'signature')
+
+    def test_rejects_invalid_claims(self):
+        self.assert_rejected(sign(id_claims(exp=int(time.time()) - 1)), 'expired')
+        self.assert_rejected(sign(id_claims(iss='https://evil')), 'issuer')
+        self.assert_rejected(sign(id_claims(aud='other')), 'audience')
+        self.assert_rejected(sign(id_claims(token_use='access')), 'use')
+        self.assert_rejected(sign(id_claims(), alg='none'), 'algorithm')
+        self.assert_rejected(sign(id_claims(), kid='key-2'), 'signing key')
+        self.assert_rejected('not-a-token', 'Malformed')
+        self.assert_rejected('', 'Missing')
+
+    def test_rejects_non_object_header_and_payload(self):
+        header = b64url(json.dumps({'kid': 'key-1', 'alg': 'RS256'}).encode())
+        payload = b64url(json.dumps(id_claims()).encode())
+        self.assert_rejected('W10.W10.AA', 'Malformed')
+        self.assert_rejected(f'{header}.W10.AA', 'Malformed')
+        self.assert_rejected(f'{b64url(b"1")}.{payload}.AA', 'Malformed')
+
+    def test_jwks_failures(self):
+        token = sign(id_claims())
+        for failure in (OSError('timed out'), ValueError('not json'), {'keys': [{'kty': 'RSA'}]},
+                        ['not', 'a', 'dict']):
+            def fetch(url, failure=failure):
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+
+            verifier = TokenVerifier(REGION, POOL_ID, CLIENT_ID, fetch=fetch)
+            with self.assertRaises(ApplicationException) as context:
+                verifier.verify(token)
+            self.assertEqual(context.exception.code, 503)
+
+    def test_known_keys_survive_failed_refresh(self):
+        token = sign(id_claims())
+        self.verifier.verify(token)
+        self.verifier.jwks._fetch = unavailable
+        self.verifier.jwks._expires_at = 0
+        self.verifier._verified.clear()
+
+        self.assertEqual(self.verifier.verify(token)['sub'], 'user')
+        self.assertGreater(self.verifier.jwks._expires_at, time.monotonic())
+
+    def test_expired_memo_entry_is_dropped(self):
+        token = sign(id_claims(exp=int(time.time()) + 1))
+        self.verifier.verify(token)
+        with patch('commons.token_verifier.time.time', return_value=time.time() + 5):
+            self.assert_rejected(token, 'expired')
+
+    def test_get_bearer_token(self):
+        self.assertEqual(get_bearer_token({'headers': {'Authorization': 'Bearer abc'}}), 'abc')
+        self.assertEqual(get_bearer_token({'headers': {'authorization': 'abc'}}), 'abc')
+        self.assertEqual(get_bearer_token({'headers': None}), '')
+
+
+class TestHandlerVerification(ApiHandlerLambdaTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        verifier = TokenVerifier(REGION, POOL_ID, CLIENT_ID, fetch=lambda url: JWKS)
+        for patcher in (patch.object(LAMBDA_HANDLER, 'VERIFY_TOKENS', True),
+                        patch.object(LAMBDA_HANDLER, 'token_verifier', verifier)):
+            patcher.start()
+        self.addCleanup(patch.stopall)
+
+    def test_protected_route_requires_token(self):
+        response = self.HANDLER.handle_request(
+            {"resource": "/tables", "httpMethod": "GET", "headers": {}}, {})
+        self.assertEqual(response["statusCode"], 401)
+
+    def test_malformed_token_is_401(self):
+        response = self.HANDLER.handle_request(
+            {"resource": "/tables", "httpMethod": "GET",
+             "headers": {"Authorization": "Bearer W10.W10.AA"}}, {})
+        self.assertEqual(response["statusCode"], 401)
+
+    def test_unavailable_keys_are_503(self):
+        verifier = TokenVerifier(REGION, POOL_ID, CLIENT_ID,
+                                 fetch=unavailable)
+        with patch.object(LAMBDA_HANDLER, 'token_verifier', verifier):
+            response = self.HANDLER.handle_request(
+                {"resource": "/tables", "httpMethod": "GET",
+                 "headers": {"Authorization": sign(id_claims())}}, {})
+        self.assertEqual(response["statusCode"], 503)
+
+    def test_claims_are_passed_on(self):
+        event = {"resource": "/reservations/export", "httpMethod": "GET",
+                 "headers": {"Authorization": sign(id_claims(**{'cognito:groups': ['staff']}))}}
+        response = self.HANDLER.handle_request(event, {})
+
+        self.assertEqual(response["statusCode"], 403)
+        self.assertEqual(event["requestContext"]["authorizer"]["claims"]["sub"], 'user')